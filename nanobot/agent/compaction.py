@@ -24,6 +24,10 @@ Messages to summarize:
 Write a concise summary (max 500 words) that captures the essential context:"""
 
 
+# Prefix of the injected summary message; a compacted message list starts with it
+SUMMARY_PREFIX = "[Previous conversation summary]"
+
+
 class MessageCompactor:
     """
     Compacts conversation history by summarizing older messages.
@@ -72,11 +76,42 @@ class MessageCompactor:
         Returns:
             Tuple of (compacted messages, new rolling summary).
         """
+        compacted, summary, _ = await self.compact_incremental(
+            messages, target_tokens, previous_summary
+        )
+        return compacted, summary
+
+    async def compact_incremental(
+        self,
+        messages: list[dict[str, Any]],
+        target_tokens: int,
+        previous_summary: str | None = None,
+        summarized_upto: int = 0,
+    ) -> tuple[list[dict[str, Any]], str | None, int]:
+        """
+        Compact messages, summarizing only what the previous summary lacks.
+
+        ``summarized_upto`` is how many leading conversation messages (after the
+        system message) are already folded into ``previous_summary``. Only the
+        messages after that position are sent to the LLM; if there are none the
+        previous summary is reused without an LLM call.
+
+        Args:
+            messages: List of messages to compact.
+            target_tokens: Target token budget.
+            previous_summary: Optional summary from previous compaction.
+            summarized_upto: Number of leading conversation messages the
+                previous summary covers.
+
+        Returns:
+            Tuple of (compacted messages, new rolling summary, number of leading
+            conversation messages the new summary covers).
+        """
         current_tokens = count_messages_tokens(messages)
 
         if current_tokens <= target_tokens:
             # No compaction needed
-            return messages, previous_summary
+            return messages, previous_summary, summarized_upto
 
         logger.info(
             f"Compacting messages: {current_tokens} tokens -> target {target_tokens} tokens"
@@ -95,18 +130,36 @@ class MessageCompactor:
         if keep_count >= len(conversation):
             # Not enough messages to compact, just truncate
             logger.warning("Not enough messages to compact, truncating instead")
-            return self._truncate_messages(messages, target_tokens), previous_summary
+            return (
+                self._truncate_messages(messages, target_tokens),
+                previous_summary,
+                summarized_upto,
+            )
 
         # Split into messages to summarize and messages to keep
         to_summarize = conversation[:-keep_count] if keep_count > 0 else conversation
         to_keep = conversation[-keep_count:] if keep_count > 0 else []
 
+        # Skip the prefix already folded into the previous summary
+        start = min(summarized_upto, len(to_summarize)) if previous_summary else 0
+        new_messages = to_summarize[start:]
+        covered = len(to_summarize)
+
         # Generate summary of older messages
-        try:
-            summary = await self._generate_summary(to_summarize, previous_summary)
-        except Exception as e:
-            logger.error(f"Compaction failed: {e}, falling back to truncation")
-            return self._truncate_messages(messages, target_tokens), previous_summary
+        if not new_messages:
+            summary = previous_summary or ""
+        else:
+            if start:
+                logger.debug(f"Incremental compaction: {len(new_messages)} new messages")
+            try:
+                summary = await self._generate_summary(new_messages, previous_summary)
+            except Exception as e:
+                logger.error(f"Compaction failed: {e}, falling back to truncation")
+                return (
+                    self._truncate_messages(messages, target_tokens),
+                    previous_summary,
+                    summarized_upto,
+                )
 
         # Build compacted messages
         compacted = []
@@ -119,7 +172,7 @@ class MessageCompactor:
             compacted.append(
                 {
                     "role": "user",
-                    "content": f"[Previous conversation summary]\n{summary}",
+                    "content": f"{SUMMARY_PREFIX}\n{summary}",
                 }
             )
             compacted.append(
@@ -138,14 +191,14 @@ class MessageCompactor:
             logger.warning(
                 f"Compaction still over budget: {compacted_tokens} > {target_tokens}, truncating"
             )
-            return self._truncate_messages(compacted, target_tokens), summary
+            return self._truncate_messages(compacted, target_tokens), summary, covered
 
         logger.info(
             f"Compaction complete: {current_tokens} -> {compacted_tokens} tokens "
             f"({len(messages)} -> {len(compacted)} messages)"
         )
 
-        return compacted, summary
+        return compacted, summary, covered
 
     async def _generate_summary(
         self,
@@ -1,6 +1,7 @@
 """Context builder for assembling agent prompts."""
 
 import base64
+import hashlib
 import mimetypes
 import platform
 from pathlib import Path
@@ -96,6 +97,8 @@ class ContextBuilder:
         "IDENTITY.md",
         "COMPANY.md",
     ]
+    # Stands in for the clock while building, so the prompt digest ignores it
+    _CLOCK_PLACEHOLDER = "\x00now\x00"
 
     def __init__(
         self,
@@ -143,10 +146,31 @@ class ContextBuilder:
         Returns:
             Complete system prompt.
         """
+        return self.build_system_prompt_with_digest(skill_names, budget)[0]
+
+    def build_system_prompt_with_digest(
+        self,
+        skill_names: list[str] | None = None,
+        budget: int | None = None,
+    ) -> tuple[str, str]:
+        """
+        Build the system prompt along with a digest of its sources.
+
+        The digest covers everything in the prompt except the clock, so it only
+        changes when identity, bootstrap files, memory, or skills do.
+
+        Args:
+            skill_names: Optional list of skills to include.
+            budget: Max estimated token count (see ``build_system_prompt``).
+
+        Returns:
+            Tuple of (system prompt, hex digest).
+        """
         parts = []
 
-        # Core identity (never truncated)
-        parts.append(self._get_identity())
+        # Core identity (never truncated); the clock is filled in last
+        identity = self._get_identity(now=self._CLOCK_PLACEHOLDER)
+        parts.append(identity.replace(self._CLOCK_PLACEHOLDER, self._current_time()))
 
         # Bootstrap files
         bootstrap = self._load_bootstrap_files()
@@ -201,7 +225,8 @@ Skills with available="false" need dependencies installed first - you can try in
                 logger.debug(f"Dropped section ({len(removed)} chars) to meet budget")
             result = "\n\n---\n\n".join(parts)
 
-        return result
+        digest = hashlib.sha256("\n\n---\n\n".join([identity, *parts[1:]]).encode("utf-8"))
+        return result, digest.hexdigest()
 
     @staticmethod
     def _get_runtime_info() -> str:
@@ -210,15 +235,20 @@ Skills with available="false" need dependencies installed first - you can try in
         os_name = "macOS" if system == "Darwin" else system
         return f"{os_name} {platform.machine()}, Python {platform.python_version()}"
 
-    def _get_identity(self) -> str:
-        """Get the core identity section, loading from IDENTITY.md if available."""
+    def _current_time(self) -> str:
+        """Current time as shown in the identity section."""
         from datetime import datetime
         from zoneinfo import ZoneInfo
 
-        tz = ZoneInfo(self.timezone)
-        now = datetime.now(tz).strftime("%Y-%m-%d %H:%M (%A)")
+        now = datetime.now(ZoneInfo(self.timezone)).strftime("%Y-%m-%d %H:%M (%A)")
         if self.timezone != "UTC":
             now = f"{now} [{self.timezone}]"
+        return now
+
+    def _get_identity(self, now: str | None = None) -> str:
+        """Get the core identity section, loading from IDENTITY.md if available."""
+        if now is None:
+            now = self._current_time()
         workspace_path = str(self.workspace.expanduser().resolve())
 
         # Try to load identity from IDENTITY.md
@@ -570,6 +600,7 @@ When NOT to clarify:
         media: list[str] | None = None,
         channel_context: str = "",
         system_prompt_budget: int | None = None,
+        system_prompt: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
@@ -581,6 +612,7 @@ When NOT to clarify:
             media: Optional list of local file paths for images/media.
             channel_context: Optional recent channel messages for context.
             system_prompt_budget: Max estimated token count for system prompt.
+            system_prompt: Already-built system prompt to use instead of building one.
 
         Returns:
             List of messages including system prompt.
@@ -588,7 +620,8 @@ When NOT to clarify:
         messages = []
 
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names, budget=system_prompt_budget)
+        if system_prompt is None:
+            system_prompt = self.build_system_prompt(skill_names, budget=system_prompt_budget)
         messages.append({"role": "system", "content": system_prompt})
 
         # History
@@ -628,40 +661,33 @@ When NOT to clarify:
 
     def add_tool_result(
         self, messages: list[dict[str, Any]], tool_call_id: str, tool_name: str, result: str
-    ) -> list[dict[str, Any]]:
+    ) -> None:
         """
-        Add a tool result to the message list.
+        Append a tool result to the message list in place.
 
         Args:
-            messages: Current message list.
+            messages: Current message list (mutated).
             tool_call_id: ID of the tool call.
             tool_name: Name of the tool.
             result: Tool execution result.
-
-        Returns:
-            Updated message list.
         """
         messages.append(
             {"role": "tool", "tool_call_id": tool_call_id, "name": tool_name, "content": result}
         )
-        return messages
 
     def add_assistant_message(
         self,
         messages: list[dict[str, Any]],
         content: str | None,
         tool_calls: list[dict[str, Any]] | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> None:
         """
-        Add an assistant message to the message list.
+        Append an assistant message to the message list in place.
 
         Args:
-            messages: Current message list.
+            messages: Current message list (mutated).
             content: Message content.
             tool_calls: Optional tool calls.
-
-        Returns:
-            Updated message list.
         """
         msg: dict[str, Any] = {"role": "assistant", "content": content or ""}
 
@@ -669,4 +695,3 @@ When NOT to clarify:
             msg["tool_calls"] = tool_calls
 
         messages.append(msg)
-        return messages
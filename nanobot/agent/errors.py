@@ -1,5 +1,6 @@
 """Structured error logging and categorization for nanobot self-evaluation."""
 
+import heapq
 import json
 import time
 from dataclasses import asdict, dataclass
@@ -169,7 +170,7 @@ class ErrorLogger:
         """Write error record to JSONL log."""
         try:
             with open(self._error_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(record)) + "\n")
+                f.write(json.dumps({**asdict(record), "category": record.category.value}) + "\n")
         except Exception as e:
             # Fallback if we can't write to error log
             logger.error(f"Failed to write error record: {e}")
@@ -241,12 +242,21 @@ class ErrorLogger:
             for cat, count in sorted_categories
         ]
 
-    def get_recent_errors(self, minutes: int = 30) -> list[dict[str, Any]]:
+    def get_recent_errors(
+        self,
+        minutes: int = 30,
+        limit: int | None = None,
+        category: str | None = None,
+        severity: str | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Get recent errors from JSONL log.
 
         Args:
             minutes: How many minutes back to look
+            limit: Maximum number of records to return (newest first)
+            category: Only return records with this category value
+            severity: Only return records with this severity
 
         Returns:
             List of error records.
@@ -262,18 +272,49 @@ class ErrorLogger:
                 for line in f:
                     try:
                         record = json.loads(line.strip())
-                        if record.get("timestamp", 0) >= cutoff:
+                        if (
+                            record.get("timestamp", 0) >= cutoff
+                            and (category is None or record.get("category") == category)
+                            and (severity is None or record.get("severity") == severity)
+                        ):
                             records.append(record)
                     except (json.JSONDecodeError, KeyError):
                         continue
         except Exception as e:
             logger.warning(f"Failed to read error log: {e}")
 
-        # Sort by timestamp descending
+        # Sort by timestamp descending; with a limit only the newest are ranked
+        if limit is not None:
+            return heapq.nlargest(limit, records, key=lambda x: x.get("timestamp", 0))
         records.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
 
         return records
 
+    def get_report_bundle(
+        self, limit: int = 10, minutes: int = 30
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Get metrics, top errors and recent errors for a full health report.
+
+        Top errors are ranked from the metrics snapshot, so category counts
+        and recovery rates are computed once for both views.
+
+        Args:
+            limit: Maximum number of top categories and recent records
+            minutes: How many minutes back to look for recent errors
+
+        Returns:
+            Tuple of (metrics, top errors, recent errors).
+        """
+        metrics = self.get_metrics()
+        recovery_rates = metrics["recovery_rates"]
+        ranked = heapq.nlargest(limit, metrics["errors_by_category"].items(), key=lambda x: x[1])
+        top_errors = [
+            {"category": cat, "count": count, "recovery_rate": recovery_rates[cat]}
+            for cat, count in ranked
+        ]
+        return metrics, top_errors, self.get_recent_errors(minutes, limit)
+
     def reset_metrics(self) -> None:
         """Reset in-memory metrics (useful for testing)."""
         self._error_counts.clear()
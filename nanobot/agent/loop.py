@@ -4,16 +4,21 @@ import asyncio
 import json
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
+from nanobot.agent.compaction import SUMMARY_PREFIX, MessageCompactor, should_compact
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.guardrails import GuardrailEngine
 from nanobot.agent.intent import IntentClassifier, QueryIntent
+from nanobot.agent.plan_cache import PlanCache
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
@@ -26,16 +31,25 @@ from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.progress import ProgressEvent, ProgressKind
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.manager import ChannelManager
+from nanobot.cron.types import CronSchedule
+from nanobot.memory.extractor import FactExtractor
+from nanobot.memory.filters import sanitize_for_memory
 from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.restart import check_and_clear_restart_signal
 from nanobot.session.compaction import CompactionConfig as SessionCompactionConfig
 from nanobot.session.compaction import SessionCompactor
 from nanobot.session.manager import SessionManager
+from nanobot.utils import fastjson
+from nanobot.utils.tokens import count_messages_tokens, count_tokens, truncate_to_token_limit
 
 _TOOL_CALL_BLOCK_RE = re.compile(
     r"<tool_call>\s*\w+.*?</tool_call>",
     re.DOTALL | re.IGNORECASE,
 )
 
+# Identical tool-call batches in this many consecutive iterations abort the turn
+_TOOL_LOOP_REPEAT_LIMIT = 3
+
 
 def _parse_tool_calls_from_content(content: str | None) -> list[ToolCallRequest]:
     """Parse XML-style tool calls from response content when the model emits them as text.
@@ -86,6 +100,7 @@ def _strip_tool_call_blocks_from_content(content: str | None) -> str:
 
 
 if TYPE_CHECKING:
+    from nanobot.agent.semantic_cache import RecentResponseCache, SemanticResponseCache
     from nanobot.config.schema import (
         CompactionConfig,
         ContextConfig,
@@ -96,7 +111,9 @@ if TYPE_CHECKING:
         MCPConfig,
         MemoryConfig,
         MemoryExtractionConfig,
+        SemanticCacheConfig,
         StreamingConfig,
+        SubagentConfig,
         TracingConfig,
     )
     from nanobot.cron.service import CronService
@@ -201,6 +218,8 @@ class AgentLoop:
         streaming_config: "StreamingConfig | None" = None,
         tracing_config: "TracingConfig | None" = None,
         guardrail_config: "GuardrailConfig | None" = None,
+        semantic_cache_config: "SemanticCacheConfig | None" = None,
+        subagent_config: "SubagentConfig | None" = None,
         temperature: float = 0.7,
         tool_temperature: float = 0.0,
         timezone: str = "UTC",
@@ -214,7 +233,9 @@ class AgentLoop:
             IntentConfig,
             MCPConfig,
             MemoryConfig,
+            SemanticCacheConfig,
             StreamingConfig,
+            SubagentConfig,
             TracingConfig,
         )
 
@@ -253,6 +274,8 @@ class AgentLoop:
 
         # Vector store for semantic memory (initialized in run())
         self.vector_store: "VectorStore | None" = None
+        # Set once the vector store is known to hold entries; until then recall skips search
+        self._vector_store_warm = False
         # Core memory (initialized in _init_memory())
         self.core_memory = None
         # Entity store (initialized in _init_memory())
@@ -272,6 +295,10 @@ class AgentLoop:
         # Memory extraction and consolidation (lightweight vector store)
         self._extractor = None
         self._consolidator = None
+        # Dedicated pool for blocking store work (embedding calls + SQLite), kept
+        # apart from the default executor used by channels. A single worker keeps
+        # the store's shared connection and the embedding cache single-threaded.
+        self._memory_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nanobot-mem")
         self._session_compactor = SessionCompactor(
             config=SessionCompactionConfig(),
         )
@@ -297,7 +324,9 @@ class AgentLoop:
             exec_config=self.exec_config,
             registry=self._registry,
             evolve_manager=self._evolve_manager,
-            progress_callback=bus.publish_progress,
+            progress_batch_callback=bus.publish_progress_batch,
+            max_concurrent=(subagent_config or SubagentConfig()).max_concurrent,
+            max_context_tokens=self.context_config.max_context_tokens,
         )
 
         # MCP manager (initialized in run())
@@ -317,6 +346,17 @@ class AgentLoop:
         self._streaming_config = streaming_config or StreamingConfig()
         self._tracing_config = tracing_config or TracingConfig()
         self._guardrail_config = guardrail_config or GuardrailConfig()
+        self._semantic_cache_config = semantic_cache_config or SemanticCacheConfig()
+        if self._semantic_cache_config.plan_cache:
+            self.subagents.plan_cache = PlanCache(
+                workspace / ".nanobot" / "plan_cache",
+                ttl_s=self._semantic_cache_config.plan_cache_ttl_s,
+                max_bytes=self._semantic_cache_config.plan_cache_max_bytes,
+            )
+
+        # Semantic response cache (initialized in run() once embeddings are available)
+        self._response_cache: "SemanticResponseCache | None" = None
+        self._announce_cache: "RecentResponseCache | None" = None
 
         # Observability: tracing, usage tracking, guardrails
         self._tracer = Tracer(enabled=self._tracing_config.enabled)
@@ -327,8 +367,10 @@ class AgentLoop:
         )
 
         self._running = False
-        # Names of tools that support set_context(channel, chat_id)
-        self._context_tools = ("message", "spawn", "cron", "install_mcp_server", "follow_up")
+        # Pending bus.consume_inbound() in run(); cancelled by stop()
+        self._consume_task: asyncio.Task | None = None
+        # Tools that support set_context(channel, chat_id); filled on registration
+        self._context_tools: list[Tool] = []
         # Background tasks for fire-and-forget memory operations
         self._background_tasks: set[asyncio.Task] = set()
         self._register_default_tools()
@@ -354,10 +396,8 @@ class AgentLoop:
 
     def _update_tool_contexts(self, channel: str, chat_id: str) -> None:
         """Update channel/chat context on all tools that support it."""
-        for name in self._context_tools:
-            tool = self.tools.get(name)
-            if tool and hasattr(tool, "set_context"):
-                tool.set_context(channel, chat_id)
+        for tool in self._context_tools:
+            tool.set_context(channel, chat_id)
 
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
@@ -386,10 +426,12 @@ class AgentLoop:
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
         self.tools.register(message_tool)
+        self._context_tools.append(message_tool)
 
         # Spawn tool (for subagents)
         spawn_tool = SpawnTool(manager=self.subagents, registry=self._registry)
         self.tools.register(spawn_tool)
+        self._context_tools.append(spawn_tool)
 
         # Tmux tool (persistent shell sessions)
         from nanobot.agent.tools.tmux import TmuxTool
@@ -398,11 +440,9 @@ class AgentLoop:
 
         # Cron tool (for self-scheduling)
         if self.cron_service:
-            from nanobot.agent.tools.cron import CronTool
-
-            self.tools.register(
-                CronTool(cron_service=self.cron_service, default_timezone=self.timezone)
-            )
+            cron_tool = CronTool(cron_service=self.cron_service, default_timezone=self.timezone)
+            self.tools.register(cron_tool)
+            self._context_tools.append(cron_tool)
 
         # Discord config tool (if Discord channel is enabled)
         if self.channel_manager and "discord" in self.channel_manager.channels:
@@ -416,14 +456,16 @@ class AgentLoop:
         # MCP install tool (always available for self-installation)
         from nanobot.agent.tools.mcp_install import InstallMCPServerTool
 
-        self.tools.register(InstallMCPServerTool(workspace=self.workspace))
+        install_tool = InstallMCPServerTool(workspace=self.workspace)
+        self.tools.register(install_tool)
+        self._context_tools.append(install_tool)
 
         # Follow-up tracking tool
         from nanobot.agent.tools.followup import FollowUpTool
 
-        self.tools.register(
-            FollowUpTool(db_path=Path.home() / ".nanobot" / "data" / "followups.db")
-        )
+        followup_tool = FollowUpTool(db_path=Path.home() / ".nanobot" / "data" / "followups.db")
+        self.tools.register(followup_tool)
+        self._context_tools.append(followup_tool)
 
         # Marketing tools (registered when marketing config is available)
         self._register_marketing_tools()
@@ -598,10 +640,75 @@ class AgentLoop:
         logger.debug(f"Created subsystem provider for '{provider_name}'")
         return new_provider
 
+    async def _chat_with_early_dispatch(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        temperature: float,
+        tool_choice: str | None,
+    ) -> tuple[LLMResponse, list[asyncio.Task]]:
+        """
+        Stream a completion, starting read-only tool calls as soon as they parse.
+
+        Only the leading run of parallel-safe calls that validate and need no
+        guardrail approval is started early; anything after the first other
+        call waits for the normal execution path so ordering is preserved.
+
+        Returns:
+            The assembled response and the early-started tasks, which line up
+            with the first ``len(tasks)`` entries of ``response.tool_calls``.
+        """
+        content: list[str] = []
+        tool_calls: list[ToolCallRequest] = []
+        early: list[asyncio.Task] = []
+        finish_reason: str | None = None
+        usage: dict[str, int] = {}
+        dispatching = True
+
+        try:
+            async for chunk in self.provider.stream(
+                messages=messages,
+                tools=tools,
+                model=self.model,
+                temperature=temperature,
+                tool_choice=tool_choice,
+            ):
+                if chunk.content:
+                    content.append(chunk.content)
+                for call in chunk.tool_calls:
+                    tool_calls.append(call)
+                    if dispatching:
+                        tool = self.tools.get(call.name)
+                        dispatching = (
+                            tool is not None
+                            and tool.parallel_safe
+                            and not tool.validate_params(call.arguments)
+                            and self._guardrails.check(call.name, call.arguments) is None
+                        )
+                    if dispatching:
+                        logger.debug(f"Early dispatch of tool: {call.name}")
+                        early.append(
+                            asyncio.create_task(self.tools.execute(call.name, call.arguments))
+                        )
+                if chunk.finish_reason:
+                    finish_reason = chunk.finish_reason
+                if chunk.usage:
+                    usage = chunk.usage
+        except BaseException:
+            for task in early:
+                task.cancel()
+            raise
+
+        response = LLMResponse(
+            content="".join(content) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason or "stop",
+            usage=usage,
+        )
+        return response, early
+
     def _truncate_tool_result(self, result: str) -> str:
         """Truncate tool result to fit within budget."""
-        from nanobot.utils.tokens import count_tokens, truncate_to_token_limit
-
         max_tokens = self.context_config.tool_result_budget
         current_tokens = count_tokens(result)
 
@@ -619,14 +726,12 @@ class AgentLoop:
         count: int,
     ) -> None:
         """Record a tool failure lesson to TOOLS.md for daemon review."""
-        import time as _time
-
         lesson = (
             f"\n\n## [LESSON] {tool_name} - "
             f"Repeated failure ({count} times)\n"
             f"Arguments pattern: {json.dumps(arguments)[:200]}\n"
             f"Error: {error[:300]}\n"
-            f"Recorded: {_time.strftime('%Y-%m-%d %H:%M')}\n"
+            f"Recorded: {time.strftime('%Y-%m-%d %H:%M')}\n"
         )
         tools_md = self.workspace / "TOOLS.md"
         try:
@@ -655,8 +760,6 @@ class AgentLoop:
             return  # Safely under budget, skip expensive tokenization
 
         # Near budget — do precise count
-        from nanobot.utils.tokens import count_messages_tokens
-
         total_tokens = count_messages_tokens(messages)
         threshold = max_tokens * 0.9
 
@@ -914,8 +1017,6 @@ class AgentLoop:
         session: "Session",
     ) -> list[dict]:
         """Run compaction if context is near capacity and compaction is enabled."""
-        from nanobot.agent.compaction import MessageCompactor, should_compact
-
         if not self.compaction_config.enabled:
             return messages
 
@@ -935,20 +1036,9 @@ class AgentLoop:
             keep_recent=self.compaction_config.keep_recent,
         )
 
-        # Get previous rolling summary
-        previous_summary = session.get_rolling_summary()
-
-        # Run compaction
+        # Run compaction (only messages newer than the summary are re-summarized)
         target_tokens = int(max_tokens * 0.6)  # Compact to 60% capacity
-        compacted, new_summary = await compactor.compact_messages(
-            messages, target_tokens, previous_summary
-        )
-
-        # Store new rolling summary
-        if new_summary != previous_summary:
-            session.set_rolling_summary(new_summary)
-
-        return compacted
+        return await self._compact_with_summary(compactor, messages, session, target_tokens)
 
     async def _urgent_compact(
         self,
@@ -959,8 +1049,6 @@ class AgentLoop:
         if not self.compaction_config.enabled:
             return messages
 
-        from nanobot.utils.tokens import count_messages_tokens
-
         total = count_messages_tokens(messages)
         limit = self.context_config.max_context_tokens
         if total < limit * 0.95:
@@ -968,8 +1056,6 @@ class AgentLoop:
 
         logger.warning(f"Urgent compaction: {total}/{limit} tokens ({total / limit * 100:.0f}%)")
 
-        from nanobot.agent.compaction import MessageCompactor
-
         compaction_provider = self._resolve_subsystem_provider(
             self.compaction_config.provider,
         )
@@ -978,15 +1064,57 @@ class AgentLoop:
             model=self.compaction_config.model or self.model,
             keep_recent=self.compaction_config.keep_recent,
         )
-        previous_summary = session.get_rolling_summary()
         target = int(limit * 0.5)
-        compacted, new_summary = await compactor.compact_messages(
-            messages,
-            target,
-            previous_summary,
+        return await self._compact_with_summary(compactor, messages, session, target)
+
+    def _compaction_base(self, messages: list[dict], session: "Session") -> int | None:
+        """
+        Session index of the first conversation message in ``messages``.
+
+        A freshly built list is the system prompt followed by the session's
+        history window; a list compacted earlier in the turn starts with the
+        summary pair, which stands just before the stored summary position.
+        Returns None when the list cannot be mapped onto the session.
+        """
+        conversation = (
+            messages[1:] if messages and messages[0].get("role") == "system" else messages
+        )
+        first = conversation[0].get("content") if conversation else None
+        if isinstance(first, str) and first.startswith(SUMMARY_PREFIX):
+            upto = session.get_rolling_summary_upto()
+            return None if upto is None else upto - 2
+        history = session.get_history(max_tokens=self.context_config.history_budget)
+        if conversation[: len(history)] != history:
+            return None
+        return len(session.messages) - len(history)
+
+    async def _compact_with_summary(
+        self,
+        compactor: MessageCompactor,
+        messages: list[dict],
+        session: "Session",
+        target_tokens: int,
+    ) -> list[dict]:
+        """Compact against the session's rolling summary and record how far it reaches."""
+        previous_summary = session.get_rolling_summary()
+        previous_upto = session.get_rolling_summary_upto()
+        base = self._compaction_base(messages, session)
+
+        # Positions are session message indexes; the compactor works relative to the list
+        skip = 0
+        if base is not None and previous_upto is not None:
+            if previous_upto <= len(session.messages):
+                skip = max(0, previous_upto - base)
+        compacted, new_summary, covered = await compactor.compact_incremental(
+            messages, target_tokens, previous_summary, skip
         )
-        if new_summary != previous_summary:
-            session.set_rolling_summary(new_summary)
+        if compacted is messages:
+            return compacted
+
+        # Messages of the current turn are not in the session yet, so never count past it
+        new_upto = None if base is None else base + min(covered, len(session.messages) - base)
+        if new_summary != previous_summary or new_upto != previous_upto:
+            session.set_rolling_summary(new_summary, new_upto)
         return compacted
 
     async def run(self) -> None:
@@ -999,10 +1127,11 @@ class AgentLoop:
         # Initialize memory if enabled
         self._init_memory()
 
+        # Initialize semantic response cache (reuses the memory embedding service)
+        self._init_response_cache()
+
         # Wire vector store into cron tool for cleanup on job removal
         if self.cron_service and self.vector_store:
-            from nanobot.agent.tools.cron import CronTool
-
             cron_tool = self.tools.get("cron")
             if isinstance(cron_tool, CronTool):
                 cron_tool._vector_store = self.vector_store
@@ -1024,32 +1153,42 @@ class AgentLoop:
         logger.info("Agent loop started")
 
         while self._running:
+            # Block until the next message; stop() cancels the pending consume
+            self._consume_task = asyncio.create_task(self.bus.consume_inbound())
             try:
-                # Wait for next message
-                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+                msg = await self._consume_task
+            except asyncio.CancelledError:
+                if self._running:
+                    raise
+                break
+            finally:
+                self._consume_task = None
 
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response (include metadata for reaction/typing cleanup)
-                    await self.bus.publish_outbound(
-                        OutboundMessage(
-                            channel=msg.channel,
-                            chat_id=msg.chat_id,
-                            content=f"Sorry, I encountered an error: {str(e)}",
-                            metadata=msg.metadata,
-                        )
+            # Process it
+            try:
+                response = await self._process_message(msg)
+                if response:
+                    await self.bus.publish_outbound(response)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                # Send error response (include metadata for reaction/typing cleanup)
+                await self.bus.publish_outbound(
+                    OutboundMessage(
+                        channel=msg.channel,
+                        chat_id=msg.chat_id,
+                        content=f"Sorry, I encountered an error: {str(e)}",
+                        metadata=msg.metadata,
                     )
-            except asyncio.TimeoutError:
-                continue
+                )
 
     async def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        if self._consume_task:
+            self._consume_task.cancel()
+
+        # Cancel running subagents so they stop calling the provider
+        await self.subagents.stop()
 
         # Wait for in-flight background tasks (memory indexing, etc.)
         if self._background_tasks:
@@ -1061,6 +1200,15 @@ class AgentLoop:
         if self.mcp_manager:
             await self.mcp_manager.stop()
 
+        if self._response_cache:
+            self._response_cache.close()
+
+        # Release the entity store's pooled connection (checkpoints the WAL)
+        if self.entity_store:
+            self.entity_store.close()
+
+        self._memory_pool.shutdown(wait=False, cancel_futures=True)
+
         # Close extraction vector store
         if self._consolidator and hasattr(self._consolidator, "store"):
             try:
@@ -1137,62 +1285,89 @@ class AgentLoop:
         intent = await intent_task
         logger.debug(f"Query intent: {intent.value}")
 
-        # Get recall result (already computed in parallel)
-        memory_context = await recall_task
-        if intent == QueryIntent.FACTUAL:
-            memory_context = None  # discard for factual queries
-        if memory_context:
-            if channel_context:
-                channel_context = f"{memory_context}\n\n{channel_context}"
-            else:
-                channel_context = memory_context
-
-        # For FACTUAL/ACTION queries, inject a tool-use directive into the message
-        user_content = msg.content
-        if intent == QueryIntent.FACTUAL:
-            user_content = (
-                "[SYSTEM: This query requires verifiable facts. "
-                "You MUST use a tool to verify your answer.]\n\n" + user_content
+        # Semantic response cache: a near-duplicate turn skips the LLM loop entirely,
+        # so look it up before paying for memory recall and message assembly
+        cacheable = self._is_response_cacheable(msg, intent)
+        cached_content: str | None = None
+        prompt_embedding: list[float] | None = None
+        cache_context = ""
+        system_prompt: str | None = None
+        if cacheable:
+            # Replies depend on the system prompt too; key on its sources, not the clock.
+            # On a miss the same prompt goes into build_messages below.
+            system_prompt, cache_context = self.context.build_system_prompt_with_digest(
+                budget=self.context_config.system_prompt_budget
             )
-        elif intent == QueryIntent.ACTION:
-            user_content = (
-                "[SYSTEM: This is an action request. You MUST call the "
-                "appropriate tools to execute it. Do NOT describe actions "
-                "in text without calling tools. After calling a tool, check "
-                "its result before reporting success.]\n\n" + user_content
+            cached_content, prompt_embedding = await self._response_cache.lookup(
+                msg.session_key, msg.content, cache_context
             )
 
-        # Subagent visibility: inject running subagent count into context
-        running_count = self.subagents.get_running_count()
-        if running_count > 0:
-            subagent_note = f"[{running_count} background subagent(s) currently running]"
-            channel_context = (
-                f"{subagent_note}\n\n{channel_context}" if channel_context else subagent_note
-            )
+        messages: list[dict[str, Any]] = []
+        if cached_content is not None:
+            recall_task.cancel()
+        else:
+            # Get recall result (already computed in parallel)
+            memory_context = await recall_task
+            if intent == QueryIntent.FACTUAL:
+                memory_context = None  # discard for factual queries
+            if memory_context:
+                if channel_context:
+                    channel_context = f"{memory_context}\n\n{channel_context}"
+                else:
+                    channel_context = memory_context
+
+            # For FACTUAL/ACTION queries, inject a tool-use directive into the message
+            user_content = msg.content
+            if intent == QueryIntent.FACTUAL:
+                user_content = (
+                    "[SYSTEM: This query requires verifiable facts. "
+                    "You MUST use a tool to verify your answer.]\n\n" + user_content
+                )
+            elif intent == QueryIntent.ACTION:
+                user_content = (
+                    "[SYSTEM: This is an action request. You MUST call the "
+                    "appropriate tools to execute it. Do NOT describe actions "
+                    "in text without calling tools. After calling a tool, check "
+                    "its result before reporting success.]\n\n" + user_content
+                )
 
-        # Build initial messages (use token-aware history)
-        messages = self.context.build_messages(
-            history=session.get_history(max_tokens=self.context_config.history_budget),
-            current_message=user_content,
-            media=msg.media if msg.media else None,
-            channel_context=channel_context,
-            system_prompt_budget=self.context_config.system_prompt_budget,
-        )
+            # Subagent visibility: inject running subagent count into context
+            running_count = self.subagents.get_running_count()
+            if running_count > 0:
+                subagent_note = f"[{running_count} background subagent(s) currently running]"
+                channel_context = (
+                    f"{subagent_note}\n\n{channel_context}" if channel_context else subagent_note
+                )
+
+            # Build initial messages (use token-aware history)
+            messages = self.context.build_messages(
+                history=session.get_history(max_tokens=self.context_config.history_budget),
+                current_message=user_content,
+                media=msg.media if msg.media else None,
+                channel_context=channel_context,
+                system_prompt_budget=self.context_config.system_prompt_budget,
+                system_prompt=system_prompt,
+            )
 
-        # Run compaction if needed
-        messages = await self._maybe_compact(messages, session)
+            # Run compaction if needed
+            messages = await self._maybe_compact(messages, session)
 
         # Determine tool_choice based on intent
         forced_tool_choice: str | None = None
         if intent in (QueryIntent.FACTUAL, QueryIntent.ACTION):
             forced_tool_choice = "required"
 
+        # Tool set is fixed for the duration of a turn; fetch definitions once
+        tool_defs = self.tools.get_definitions()
+
         # Agent loop
         iteration = 0
         tools_called = 0
-        final_content = None
+        final_content = cached_content
+        last_tool_sig: int | None = None
+        tool_sig_repeats = 0
 
-        while iteration < self.max_iterations:
+        while final_content is None and iteration < self.max_iterations:
             iteration += 1
 
             # Check context budget before LLM call
@@ -1200,7 +1375,6 @@ class AgentLoop:
             messages = await self._urgent_compact(messages, session)
 
             # Call LLM -- use low temperature for tool-calling determinism
-            tool_defs = self.tools.get_definitions()
             current_temp = self.tool_temperature if tool_defs else self.temperature
             # Emit thinking progress
             await self._emit_progress(
@@ -1219,13 +1393,22 @@ class AgentLoop:
                 "llm_call",
                 attributes={"model": self.model, "iteration": iteration},
             ):
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tool_defs,
-                    model=self.model,
-                    temperature=current_temp,
-                    tool_choice=tc,
-                )
+                if self._streaming_config.early_tool_dispatch and tool_defs:
+                    response, early_tasks = await self._chat_with_early_dispatch(
+                        messages=messages,
+                        tools=tool_defs,
+                        temperature=current_temp,
+                        tool_choice=tc,
+                    )
+                else:
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=tool_defs,
+                        model=self.model,
+                        temperature=current_temp,
+                        tool_choice=tc,
+                    )
+                    early_tasks = []
 
             # Record token usage
             self._record_usage(response.usage, msg.session_key)
@@ -1251,6 +1434,28 @@ class AgentLoop:
             # Handle tool calls
             if response.has_tool_calls:
                 tools_called += len(response.tool_calls)
+                # Serialize arguments once; reused for the assistant message and logging.
+                # Call ids may be empty or repeated, so per-call data is keyed by position.
+                args_json = [fastjson.dumps(tc.arguments) for tc in response.tool_calls]
+                position = {id(tc): i for i, tc in enumerate(response.tool_calls)}
+
+                # Bail out if the model keeps requesting the exact same calls
+                tool_sig = hash(
+                    tuple((tc.name, args) for tc, args in zip(response.tool_calls, args_json))
+                )
+                tool_sig_repeats = tool_sig_repeats + 1 if tool_sig == last_tool_sig else 1
+                last_tool_sig = tool_sig
+                if tool_sig_repeats >= _TOOL_LOOP_REPEAT_LIMIT:
+                    logger.warning(
+                        f"Tool-call loop detected at iteration {iteration}: "
+                        f"{[tc.name for tc in response.tool_calls]} repeated "
+                        f"{tool_sig_repeats} times"
+                    )
+                    for task in early_tasks:
+                        task.cancel()
+                    final_content = "Detected tool-call loop; aborting."
+                    break
+
                 # Add assistant message with tool calls
                 tool_call_dicts = [
                     {
@@ -1258,14 +1463,12 @@ class AgentLoop:
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments),  # Must be JSON string
+                            "arguments": args,  # Must be JSON string
                         },
                     }
-                    for tc in response.tool_calls
+                    for tc, args in zip(response.tool_calls, args_json)
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
 
                 # Execute tools — parallelize independent tool calls
                 tool_results: list[tuple[Any, str]] = []  # (tool_call, result)
@@ -1313,56 +1516,10 @@ class AgentLoop:
 
                     executable.append(tool_call)
 
-                # Phase 2: Execute validated tools in parallel
-                if len(executable) > 1:
-                    # Parallel execution for multiple independent tool calls
-                    async def _exec_one(tc):
-                        args_str = json.dumps(tc.arguments)
-                        logger.debug(f"Executing tool: {tc.name} with arguments: {args_str}")
-                        await self._emit_progress(
-                            msg.channel,
-                            msg.chat_id,
-                            ProgressKind.TOOL_START,
-                            tool_name=tc.name,
-                            detail=f"Executing {tc.name}",
-                            iteration=iteration,
-                            total_iterations=self.max_iterations,
-                            metadata=msg.metadata,
-                        )
-                        async with self._tracer.span(
-                            "tool_exec",
-                            attributes={"tool": tc.name},
-                        ):
-                            res = await self.tools.execute(tc.name, tc.arguments)
-                        tool_status = (
-                            "error" if isinstance(res, str) and res.startswith("Error") else "ok"
-                        )
-                        await self._emit_progress(
-                            msg.channel,
-                            msg.chat_id,
-                            ProgressKind.TOOL_COMPLETE,
-                            tool_name=tc.name,
-                            detail=f"{tc.name}: {tool_status}",
-                            iteration=iteration,
-                            total_iterations=self.max_iterations,
-                            metadata=msg.metadata,
-                        )
-                        return res
-
-                    results = await asyncio.gather(
-                        *[_exec_one(tc) for tc in executable],
-                        return_exceptions=True,
-                    )
-                    for tc, res in zip(executable, results):
-                        if isinstance(res, Exception):
-                            tool_results.append((tc, f"Error executing {tc.name}: {res}"))
-                        else:
-                            tool_results.append((tc, res))
-                elif len(executable) == 1:
-                    # Single tool — no gather overhead
-                    tc = executable[0]
-                    args_str = json.dumps(tc.arguments)
-                    logger.debug(f"Executing tool: {tc.name} with arguments: {args_str}")
+                # Phase 2: Execute validated tools (read-only runs overlap)
+                async def _exec_one(tc):
+                    i = position[id(tc)]
+                    logger.debug(f"Executing tool: {tc.name} with arguments: {args_json[i]}")
                     await self._emit_progress(
                         msg.channel,
                         msg.chat_id,
@@ -1377,9 +1534,12 @@ class AgentLoop:
                         "tool_exec",
                         attributes={"tool": tc.name},
                     ):
-                        result = await self.tools.execute(tc.name, tc.arguments)
+                        if i < len(early_tasks):
+                            res = await early_tasks[i]
+                        else:
+                            res = await self.tools.execute(tc.name, tc.arguments)
                     tool_status = (
-                        "error" if isinstance(result, str) and result.startswith("Error") else "ok"
+                        "error" if isinstance(res, str) and res.startswith("Error") else "ok"
                     )
                     await self._emit_progress(
                         msg.channel,
@@ -1391,7 +1551,14 @@ class AgentLoop:
                         total_iterations=self.max_iterations,
                         metadata=msg.metadata,
                     )
-                    tool_results.append((tc, result))
+                    return res
+
+                results = await self.tools.run_calls(executable, _exec_one)
+                for tc, res in zip(executable, results):
+                    if isinstance(res, Exception):
+                        tool_results.append((tc, f"Error executing {tc.name}: {res}"))
+                    else:
+                        tool_results.append((tc, res))
 
                 # Phase 3: Post-process results (reflexion, hints, truncation)
                 for tool_call, result in tool_results:
@@ -1419,9 +1586,7 @@ class AgentLoop:
                         result = f"{result}\n{hint}"
 
                     result = self._truncate_tool_result(result)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                    self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
 
                 # Post-iteration compaction check (once per iteration, not per tool)
                 messages = await self._maybe_compact(messages, session)
@@ -1450,7 +1615,7 @@ class AgentLoop:
                         )
                     )
                     # Add to conversation history and inject self-prompt
-                    messages = self.context.add_assistant_message(messages, response.content)
+                    self.context.add_assistant_message(messages, response.content)
                     messages.append(
                         {
                             "role": "user",
@@ -1482,6 +1647,14 @@ class AgentLoop:
                     final_content = response.content
                 break
 
+        logger.debug(f"Agent loop finished after {iteration}/{self.max_iterations} iterations")
+
+        # Cache tool-free replies; anything that touched tools reflects mutable state
+        if cacheable and cached_content is None and final_content and tools_called == 0:
+            await self._response_cache.store(
+                msg.session_key, msg.content, final_content, prompt_embedding, cache_context
+            )
+
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
 
@@ -1498,7 +1671,7 @@ class AgentLoop:
                 "Action response claimed actions without tool calls -- "
                 "re-entering loop with correction"
             )
-            messages = self.context.add_assistant_message(messages, final_content)
+            self.context.add_assistant_message(messages, final_content)
             messages.append(
                 {
                     "role": "user",
@@ -1514,7 +1687,7 @@ class AgentLoop:
             # Single retry pass with forced tool use
             response = await self.provider.chat(
                 messages=messages,
-                tools=self.tools.get_definitions(),
+                tools=tool_defs,
                 model=self.model,
                 temperature=self.tool_temperature,
                 tool_choice="required",
@@ -1528,25 +1701,21 @@ class AgentLoop:
                         "type": "function",
                         "function": {
                             "name": tc.name,
-                            "arguments": json.dumps(tc.arguments),
+                            "arguments": fastjson.dumps(tc.arguments),
                         },
                     }
                     for tc in response.tool_calls
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
                 for tool_call in response.tool_calls:
                     result = await self.tools.execute(tool_call.name, tool_call.arguments)
                     result = self._truncate_tool_result(result)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                    self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
 
                 # Get final response after tool execution
                 final_response = await self.provider.chat(
                     messages=messages,
-                    tools=self.tools.get_definitions(),
+                    tools=tool_defs,
                     model=self.model,
                     temperature=self.temperature,
                 )
@@ -1584,12 +1753,10 @@ class AgentLoop:
         )
 
         # Periodic extraction and consolidation of facts and lessons
-        self._spawn_background(
-            self._maybe_extract_and_consolidate(
-                session,
-                msg.session_key,
+        if self._extraction_due(session):
+            self._spawn_background(
+                self._extract_and_consolidate(session.get_history()[-20:], msg.session_key)
             )
-        )
 
         return OutboundMessage(
             channel=msg.channel,
@@ -1625,56 +1792,73 @@ class AgentLoop:
         # Update tool contexts
         self._update_tool_contexts(origin_channel, origin_chat_id)
 
-        # Build messages with the announce content (token-aware history)
-        messages = self.context.build_messages(
-            history=session.get_history(max_tokens=self.context_config.history_budget),
-            current_message=msg.content,
-            system_prompt_budget=self.context_config.system_prompt_budget,
-        )
+        # Repeated announces (e.g. periodic progress pings) reuse the recent reply
+        final_content: str | None = None
+        announce_embedding: list[float] | None = None
+        if self._announce_cache:
+            final_content, announce_embedding = await self._announce_cache.lookup(
+                session_key, msg.content
+            )
+        cached = final_content is not None
+
+        messages: list[dict[str, Any]] = []
+        if not cached:
+            # Build messages with the announce content (token-aware history)
+            messages = self.context.build_messages(
+                history=session.get_history(max_tokens=self.context_config.history_budget),
+                current_message=msg.content,
+                system_prompt_budget=self.context_config.system_prompt_budget,
+            )
 
-        # Run compaction if needed
-        messages = await self._maybe_compact(messages, session)
+            # Run compaction if needed
+            messages = await self._maybe_compact(messages, session)
 
         # Agent loop (limited for announce handling)
+        tool_defs = self.tools.get_definitions()
         iteration = 0
-        final_content = None
 
-        while iteration < self.max_iterations:
+        while final_content is None and iteration < self.max_iterations:
             iteration += 1
 
             # Check context budget before LLM call
             self._check_context_budget(messages)
 
             response = await self.provider.chat(
-                messages=messages, tools=self.tools.get_definitions(), model=self.model
+                messages=messages, tools=tool_defs, model=self.model
             )
 
             if response.has_tool_calls:
+                args_json = [fastjson.dumps(tc.arguments) for tc in response.tool_calls]
+                position = {id(tc): i for i, tc in enumerate(response.tool_calls)}
                 tool_call_dicts = [
                     {
                         "id": tc.id,
                         "type": "function",
-                        "function": {"name": tc.name, "arguments": json.dumps(tc.arguments)},
+                        "function": {"name": tc.name, "arguments": args},
                     }
-                    for tc in response.tool_calls
+                    for tc, args in zip(response.tool_calls, args_json)
                 ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
+                self.context.add_assistant_message(messages, response.content, tool_call_dicts)
 
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                async def _exec_one(tc):
+                    args = args_json[position[id(tc)]]
+                    logger.debug(f"Executing tool: {tc.name} with arguments: {args}")
+                    return await self.tools.execute(tc.name, tc.arguments)
+
+                results = await self.tools.run_calls(response.tool_calls, _exec_one)
+                for tool_call, result in zip(response.tool_calls, results):
+                    if isinstance(result, Exception):
+                        result = f"Error executing {tool_call.name}: {result}"
                     # Truncate large tool results to fit within budget
                     result = self._truncate_tool_result(result)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
+                    self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
             else:
                 final_content = response.content
                 break
 
+        if self._announce_cache and announce_embedding and final_content and not cached:
+            self._announce_cache.remember(session_key, announce_embedding, final_content)
+
         if final_content is None:
             final_content = "Background task completed."
 
@@ -1683,12 +1867,10 @@ class AgentLoop:
         session.add_message("assistant", final_content)
         self.sessions.save(session)
 
-        self._spawn_background(
-            self._maybe_extract_and_consolidate(
-                session,
-                session_key,
+        if self._extraction_due(session):
+            self._spawn_background(
+                self._extract_and_consolidate(session.get_history()[-20:], session_key)
             )
-        )
 
         return OutboundMessage(
             channel=origin_channel, chat_id=origin_chat_id, content=final_content
@@ -1779,8 +1961,14 @@ class AgentLoop:
         try:
             memory_context: list[str] = []
 
+            # A store with no entries cannot match; skip the query embedding round-trip
+            if not self._vector_store_warm:
+                self._vector_store_warm = self.vector_store.count() > 0
+
             # Deterministic recall: pure similarity, no time decay or type bias
-            if self.memory_config.deterministic_recall:
+            if not self._vector_store_warm:
+                results = []
+            elif self.memory_config.deterministic_recall:
                 results = await self.vector_store.search(
                     query=user_message,
                     top_k=self.memory_config.search_top_k,
@@ -1843,14 +2031,12 @@ class AgentLoop:
 
     def _annotate_mutable_state(self, entry: str) -> str:
         """Add verification hints to memory entries about mutable state."""
-        import re as _re
-
         text_lower = entry.lower()
-        if _re.search(r"\b(reminder|cron|schedule|job|recurring)\b", text_lower):
+        if re.search(r"\b(reminder|cron|schedule|job|recurring)\b", text_lower):
             return entry + "\n    -> VERIFY: use `cron` tool to check"
-        if _re.search(r"\b(file|exists|created)\b", text_lower):
+        if re.search(r"\b(file|exists|created)\b", text_lower):
             return entry + "\n    -> VERIFY: use `read_file` or `exec`"
-        if _re.search(r"\b(running|process|service|active)\b", text_lower):
+        if re.search(r"\b(running|process|service|active)\b", text_lower):
             return entry + "\n    -> VERIFY: use `exec` to check"
         return entry
 
@@ -1879,8 +2065,6 @@ class AgentLoop:
             turn_text = f"User: {user_message}\nAssistant: {assistant_message}"
 
             # Sanitize before indexing
-            from nanobot.memory.filters import sanitize_for_memory
-
             sanitized = sanitize_for_memory(turn_text)
             if sanitized is None:
                 logger.debug("Conversation turn filtered by sanitization")
@@ -1911,8 +2095,6 @@ class AgentLoop:
             # Record interaction pattern for proactive learning
             if self.proactive_memory:
                 try:
-                    from datetime import datetime
-
                     self.proactive_memory.record_interaction_pattern(
                         session_key=session_key,
                         topic=user_message[:100],
@@ -1932,8 +2114,6 @@ class AgentLoop:
     ) -> None:
         """Extract and index key facts from a conversation turn."""
         try:
-            from nanobot.memory.extractor import FactExtractor
-
             # Use extraction model or fall back to compaction model or main model
             extraction_model = (
                 self.memory_config.extraction_model or self.compaction_config.model or self.model
@@ -2021,19 +2201,25 @@ class AgentLoop:
             if not isinstance(entities, list):
                 return
 
+            entity_rows: list[tuple[str, str, dict[str, Any] | None]] = []
+            relation_rows: list[tuple[str, str, str]] = []
             for entity in entities:
                 name = entity.get("name", "").strip()
                 etype = entity.get("type", "other").strip()
                 if not name:
                     continue
 
-                self.entity_store.upsert_entity(name, etype)
+                entity_rows.append((name, etype, None))
 
                 for rel in entity.get("relations", []):
                     relation = rel.get("relation", "").strip()
                     target = rel.get("target", "").strip()
                     if relation and target:
-                        self.entity_store.add_relation(name, relation, target)
+                        relation_rows.append((name, relation, target))
+
+            # One transaction each instead of one per entity and relation
+            self.entity_store.upsert_entities(entity_rows)
+            self.entity_store.add_relations(relation_rows)
 
             if entities:
                 logger.debug(f"Extracted {len(entities)} entities from conversation")
@@ -2063,10 +2249,12 @@ class AgentLoop:
                 embed_key = self.provider.api_key
 
             # Create embedding service
+            cache_path = self.memory_config.embedding_cache_path
             embedding_service = EmbeddingService(
                 model=self.memory_config.embedding_model,
                 api_key=embed_key,
                 api_base=embed_base,
+                cache_path=Path(cache_path).expanduser() if cache_path else None,
             )
 
             # Create vector store
@@ -2141,6 +2329,44 @@ class AgentLoop:
             logger.error(f"Failed to initialize memory: {e}")
             self.vector_store = None
 
+    def _init_response_cache(self) -> None:
+        """Initialize the semantic response cache on top of the memory embeddings."""
+        cfg = self._semantic_cache_config
+        if not cfg.enabled or not self.vector_store:
+            return
+
+        try:
+            from nanobot.agent.semantic_cache import RecentResponseCache, SemanticResponseCache
+
+            self._response_cache = SemanticResponseCache(
+                db_path=Path(cfg.db_path).expanduser(),
+                embedding_service=self.vector_store.embedding_service,
+                threshold=cfg.threshold,
+                ttl_s=cfg.ttl_s,
+                max_entries=cfg.max_entries,
+            )
+            self._announce_cache = RecentResponseCache(
+                embedding_service=self.vector_store.embedding_service,
+                threshold=cfg.announce_threshold,
+                window=cfg.announce_window,
+            )
+            logger.info(f"Semantic response cache initialized: threshold={cfg.threshold}")
+        except Exception as e:
+            logger.warning(f"Failed to initialize semantic response cache: {e}")
+            self._response_cache = None
+
+    def _is_response_cacheable(self, msg: InboundMessage, intent: QueryIntent) -> bool:
+        """Whether a reply to this message may be served from or stored in the cache.
+
+        Only plain conversational turns qualify: factual, state and action
+        queries must hit tools, and media or ``no_cache`` requests bypass it.
+        """
+        if not self._response_cache or msg.media:
+            return False
+        if msg.metadata and msg.metadata.get("no_cache"):
+            return False
+        return intent == QueryIntent.CONVERSATIONAL
+
     def _init_extraction(self) -> None:
         """Initialize the memory extraction/consolidation pipeline."""
         if not self._extraction_config.enabled:
@@ -2172,10 +2398,12 @@ class AgentLoop:
             else:
                 embed_key = self.provider.api_key
 
+            cache_path = self.memory_config.embedding_cache_path
             embedding_service = EmbeddingService(
                 model=cfg.embedding_model,
                 api_key=embed_key,
                 api_base=embed_base,
+                cache_path=Path(cache_path).expanduser() if cache_path else None,
             )
             extraction_store = VectorMemoryStore(
                 db_path=vector_db_path,
@@ -2196,6 +2424,7 @@ class AgentLoop:
                 model=cfg.extraction_model,
                 candidate_threshold=cfg.candidate_threshold,
                 provider=(extraction_provider if extraction_provider != self.provider else None),
+                executor=self._memory_pool,
             )
 
             # Pass extractor to session compactor
@@ -2219,34 +2448,26 @@ class AgentLoop:
         namespace: str,
     ) -> None:
         """Run silent memory extraction before compaction."""
-        if not self._consolidator or not self._extractor or len(history) < 10:
+        if self._consolidator is None or self._extractor is None or len(history) < 10:
             return
         try:
             extracted = await self._extractor.extract_for_pre_compaction(history)
             if extracted:
                 await self._consolidator.consolidate(extracted, namespace)
-                logger.debug(
-                    "Pre-compaction flush: consolidated %d facts",
-                    len(extracted),
-                )
+                logger.debug(f"Pre-compaction flush: consolidated {len(extracted)} facts")
         except Exception as e:
-            logger.warning("Pre-compaction memory flush failed: %s", e)
+            logger.warning(f"Pre-compaction memory flush failed: {e}")
 
-    async def _maybe_extract_and_consolidate(
-        self,
-        session: "Session",
-        namespace: str,
-    ) -> None:
-        """Trigger extraction/consolidation when conditions are met."""
-        if not self._consolidator or not self._extractor:
-            return
-
-        user_count = sum(1 for m in session.messages if m.get("role") == "user")
-        if user_count <= 0 or user_count % self._extraction_interval != 0:
-            return
+    def _extraction_due(self, session: "Session") -> bool:
+        """Whether this turn should trigger periodic extraction/consolidation.
 
-        history = session.get_history()[-20:]
-        await self._extract_and_consolidate(history, namespace)
+        Checked before scheduling so the common no-op path neither slices
+        history nor creates a background task.
+        """
+        if self._consolidator is None or self._extractor is None:
+            return False
+        user_count = session.user_count
+        return user_count > 0 and user_count % self._extraction_interval == 0
 
     async def _extract_and_consolidate(
         self,
@@ -2258,29 +2479,33 @@ class AgentLoop:
             return
 
         try:
-            # Facts
-            extracted = await self._extractor.extract(messages)
-            if extracted:
-                await self._consolidator.consolidate(extracted, namespace)
-                logger.debug("Extracted and consolidated %d facts", len(extracted))
-
-            # Lessons (stored in dedicated namespace)
-            lessons = await self._extractor.extract_lessons(messages)
-            if lessons:
-                await self._consolidator.consolidate(lessons, namespace)
-                logger.debug("Extracted and consolidated %d lessons", len(lessons))
-
-            # Tool-specific lessons
-            if self._enable_tool_lessons:
-                tool_lessons = self._extractor.extract_tool_lessons(messages)
-                if tool_lessons:
-                    await self._consolidator.consolidate(tool_lessons, namespace)
-                    logger.debug(
-                        "Extracted and consolidated %d tool lessons",
-                        len(tool_lessons),
-                    )
+            # Facts and lessons share one LLM round-trip; tool lessons are heuristic
+            extracted = await self._extractor.extract_all(
+                messages,
+                include_tool_lessons=self._enable_tool_lessons,
+            )
+
+            # Consolidate the three groups concurrently; their LLM decisions overlap
+            async def _consolidate(label: str, items: list) -> None:
+                await self._consolidator.consolidate(items, namespace)
+                logger.debug(f"Extracted and consolidated {len(items)} {label}")
+
+            groups = [
+                (label, extracted.get(label)) for label in ("facts", "lessons", "tool_lessons")
+            ]
+            # One embedding request for all three groups; each consolidate then hits the cache
+            await self._consolidator.prefetch_embeddings(
+                [item for _, items in groups if items for item in items]
+            )
+            results = await asyncio.gather(
+                *(_consolidate(label, items) for label, items in groups if items),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Memory consolidation failed: {result}")
         except Exception as e:
-            logger.warning("Memory extraction/consolidation failed: %s", e)
+            logger.warning(f"Memory extraction/consolidation failed: {e}")
 
     async def _init_mcp(self) -> None:
         """Initialize MCP manager and register MCP tools."""
@@ -2306,8 +2531,6 @@ class AgentLoop:
 
     async def _check_restart_signal(self) -> None:
         """Check for restart signal and schedule verification job if needed."""
-        from nanobot.restart import check_and_clear_restart_signal
-
         signal = check_and_clear_restart_signal(self.workspace)
         if not signal:
             return
@@ -2317,10 +2540,6 @@ class AgentLoop:
         # Schedule verification job if present
         verify_job = signal.get("verify_job")
         if verify_job and self.cron_service:
-            from datetime import datetime
-
-            from nanobot.cron.types import CronSchedule
-
             at_time = verify_job.get("at_time")
             if at_time:
                 try:
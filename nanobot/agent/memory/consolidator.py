@@ -1,7 +1,10 @@
 """Memory consolidator for managing memory updates with Mem0-style operations."""
 
+import asyncio
+import functools
 import json
 import math
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Literal
@@ -80,12 +83,42 @@ class MemoryConsolidator:
         model: str = "gpt-4o-mini",
         candidate_threshold: float = 0.5,
         provider: Any | None = None,
+        executor: Executor | None = None,
     ):
         self.store = store
         self.model = model
         self.candidate_threshold = candidate_threshold
         self._provider = provider
+        self._executor = executor
         self._last_metrics = ConsolidationMetrics()
+        # Search-decide-write must not interleave within a namespace, or two
+        # concurrent runs can both miss a duplicate and both add it
+        self._namespace_locks: dict[str, asyncio.Lock] = {}
+
+    async def _run_blocking(self, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking store call (embedding + SQLite) off the event loop.
+
+        The executor must be single-threaded so store calls never overlap.
+        Without an executor the call runs inline, as before.
+        """
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def prefetch_embeddings(self, facts: list[ExtractedFact]) -> None:
+        """Embed all fact contents in one batched request to warm the store's cache.
+
+        Later per-fact searches and inserts then hit the cache instead of
+        issuing one embedding request each. Failures are non-fatal.
+        """
+        texts = [f.content.strip() for f in facts if f.content and len(f.content.strip()) >= 5]
+        if not texts:
+            return
+        try:
+            await self._run_blocking(self.store.embedding_service.embed_batch, texts)
+        except Exception as e:
+            logger.debug(f"Embedding prefetch failed, embedding per fact: {e}")
 
     def _sanitize_content(self, text: str) -> str:
         """Sanitize content before embedding in prompts."""
@@ -118,24 +151,22 @@ class MemoryConsolidator:
         facts: list[ExtractedFact],
         namespace: str = "default",
     ) -> list[ConsolidationResult]:
-        """Consolidate extracted facts into the memory store."""
-        self._last_metrics = ConsolidationMetrics()
+        """Consolidate extracted facts into the memory store.
+
+        Safe to run concurrently on the event loop. Metrics are accumulated
+        per call, and each fact is decided and written under a per-namespace
+        lock, so concurrent runs cannot both miss the same duplicate. Store
+        access runs on the executor, which must have a single worker: the
+        store shares one SQLite connection and the embedding cache is not
+        locked. Without an executor it runs inline.
+        """
+        metrics = ConsolidationMetrics()
         results: list[ConsolidationResult] = []
+        await self.prefetch_embeddings(facts)
         for fact in facts:
             if not fact.content or len(fact.content.strip()) < 5:
                 continue
             target_ns = self._namespace_for_fact(fact, namespace)
-            result, valid_ids = await self._consolidate_single(fact.content.strip(), target_ns)
-            results.append(result)
-
-            if result.operation == Operation.ADD:
-                self._last_metrics.added += 1
-            elif result.operation == Operation.UPDATE:
-                self._last_metrics.updated += 1
-            elif result.operation == Operation.DELETE:
-                self._last_metrics.deleted += 1
-            elif result.operation == Operation.NOOP:
-                self._last_metrics.skipped += 1
 
             if isinstance(fact.importance, (int, float)):
                 imp = float(fact.importance)
@@ -146,18 +177,34 @@ class MemoryConsolidator:
             else:
                 importance = 0.5
 
-            self._execute_operation(
-                result,
-                target_ns,
-                importance,
-                valid_ids,
-                fact_type=fact.fact_type,
-            )
+            lock = self._namespace_locks.setdefault(target_ns, asyncio.Lock())
+            async with lock:
+                result, valid_ids = await self._consolidate_single(fact.content.strip(), target_ns)
+                results.append(result)
+
+                if result.operation == Operation.ADD:
+                    metrics.added += 1
+                elif result.operation == Operation.UPDATE:
+                    metrics.updated += 1
+                elif result.operation == Operation.DELETE:
+                    metrics.deleted += 1
+                elif result.operation == Operation.NOOP:
+                    metrics.skipped += 1
+
+                await self._run_blocking(
+                    self._execute_operation,
+                    result,
+                    target_ns,
+                    importance,
+                    valid_ids,
+                    fact_type=fact.fact_type,
+                )
+        self._last_metrics = metrics
         logger.info(
-            f"consolidation_complete added={self._last_metrics.added} "
-            f"updated={self._last_metrics.updated} "
-            f"deleted={self._last_metrics.deleted} "
-            f"skipped={self._last_metrics.skipped}"
+            f"consolidation_complete added={metrics.added} "
+            f"updated={metrics.updated} "
+            f"deleted={metrics.deleted} "
+            f"skipped={metrics.skipped}"
         )
         return results
 
@@ -167,7 +214,8 @@ class MemoryConsolidator:
         namespace: str = "default",
     ) -> tuple[ConsolidationResult, set[str]]:
         """Determine the appropriate operation for a single fact using LLM."""
-        similar = self.store.search(
+        similar = await self._run_blocking(
+            self.store.search,
             fact,
             top_k=3,
             threshold=self.candidate_threshold,
@@ -136,6 +136,58 @@ Example: [{{"fact": "User prefers Python for scripts", "importance": "high"}}]
 Facts:"""
 
 
+COMBINED_EXTRACTION_PROMPT = """Analyze the conversation and extract key facts and lessons.
+
+<conversation>
+{conversation}
+</conversation>
+
+<corrections>
+{corrections}
+</corrections>
+
+Facts - extract by type:
+- user: Personal info (name, job, location, preferences)
+- project: Decisions, requirements, relationships, project context
+- technical: Technical preferences (tools, languages, configurations)
+- preference: Communication style, response preferences
+- tool: Tool usage patterns, configurations, preferences
+Facts only, no opinions or temporary context. Self-contained statements.
+Skip greetings and small talk.
+
+Lessons - for each numbered user correction listed above, one generalized lesson
+that is timeless, third-person ("When doing X, prefer Y instead of Z"), focused on
+the principle rather than the instance, and actionable. Set "correction" to the
+number of the correction the lesson generalizes. No corrections means no lessons.
+
+Return a JSON object:
+{{"facts": [{{"type": "user", "fact": "...", "importance": "high"}}],
+"lessons": [{{"correction": 1, "lesson": "...", "category": "reasoning|tool_usage|communication|other", "importance": "high|medium|low"}}]}}"""
+
+# Phrases marking a user turn as a correction of the previous answer
+CORRECTION_PATTERNS = (
+    "that was wrong",
+    "you were wrong",
+    "no, that's wrong",
+    "no that's wrong",
+    "this is incorrect",
+    "actually,",
+    "actually ",
+    "so next time",
+    "in the future",
+    "don't do that",
+    "that's not right",
+    "i meant",
+    "you misunderstood",
+)
+
+IMPORTANCE_MAP: dict[str, float] = {
+    "high": 0.9,
+    "medium": 0.7,
+    "low": 0.3,
+}
+
+
 class LessonExtractionSchema(BaseModel):
     """Validated lesson from LLM."""
 
@@ -240,21 +292,8 @@ class MemoryExtractor:
     ) -> list[ExtractedFact]:
         """Extract facts from a conversation using LLM with heuristic fallback."""
         self._last_metrics = ExtractionMetrics()
-        if not messages:
-            return []
-
-        user_messages = [m for m in messages if m.get("role") == "user"]
-        if len(user_messages) < 3:
-            return []
-
-        if user_messages:
-            last_msg = user_messages[-1].get("content", "").strip()
-            if not last_msg or any(p.match(last_msg) for p in self._trivial_patterns):
-                logger.debug(f"Skipping trivial message: {last_msg[:50]}")
-                return []
-
-        conversation = self._format_conversation(messages)
-        if len(conversation) < 50:
+        conversation = self._fact_conversation(messages)
+        if conversation is None:
             return []
 
         try:
@@ -288,95 +327,92 @@ class MemoryExtractor:
         max_facts: int = 5,
     ) -> list[ExtractedFact]:
         """Extract lesson-style facts from user corrections (LLM generalization)."""
-        if not messages:
-            return []
-
-        correction_patterns = [
-            "that was wrong",
-            "you were wrong",
-            "no, that's wrong",
-            "no that's wrong",
-            "this is incorrect",
-            "actually,",
-            "actually ",
-            "so next time",
-            "in the future",
-            "don't do that",
-            "that's not right",
-            "i meant",
-            "you misunderstood",
-        ]
-
         lessons: list[ExtractedFact] = []
         seen: set[str] = set()
-        window = messages[-10:]
-
-        for i, msg in enumerate(window):
-            if msg.get("role") != "user":
-                continue
-            content = msg.get("content", "")
-            lowered = content.lower().strip()
-            if not content or len(lowered) < 10:
-                continue
-            if not any(pat in lowered for pat in correction_patterns):
-                continue
-
-            previous_answer = ""
-            for j in range(i - 1, -1, -1):
-                if window[j].get("role") == "assistant":
-                    prev = window[j].get("content", "")
-                    if isinstance(prev, str) and prev.strip():
-                        previous_answer = prev.strip()[:1500]
-                    break
-
-            lesson_content: str | None = None
-            importance = 0.9
-            source = "lesson"
-            meta: dict[str, Any] = {}
 
+        for previous_answer, correction in self._find_corrections(messages):
+            generalized: LessonExtractionSchema | None = None
             try:
                 generalized = await self._llm_extract_lesson(
                     previous_answer=previous_answer or "(no prior answer)",
-                    user_correction=content.strip()[:1000],
+                    user_correction=correction[:1000],
                 )
-                if generalized:
-                    lesson_content = self._normalize_lesson(generalized.lesson)
-                    importance = {
-                        "high": 0.9,
-                        "medium": 0.7,
-                        "low": 0.3,
-                    }.get(generalized.importance, 0.7)
-                    source = "llm_lesson"
-                    meta = {"category": generalized.category}
             except Exception as e:
                 logger.debug(f"LLM lesson extraction failed: {e}")
 
-            if not lesson_content:
-                lesson_content = self._normalize_lesson(content.strip()[:500])
-
-            # Sanitize and validate lesson content
-            if lesson_content:
-                lesson_content = sanitize_for_memory(lesson_content)
-            if not lesson_content or not is_valid_memory(lesson_content):
-                continue
-
-            if lesson_content not in seen:
-                seen.add(lesson_content)
-                lessons.append(
-                    ExtractedFact(
-                        content=lesson_content[:500],
-                        importance=importance,
-                        source=source,
-                        fact_type="lesson",
-                        metadata=meta,
-                    )
-                )
+            lesson = self._build_lesson(generalized, correction)
+            if lesson and lesson.content not in seen:
+                seen.add(lesson.content)
+                lessons.append(lesson)
                 if len(lessons) >= max_facts:
                     break
 
         self._last_metrics.lessons_extracted = len(lessons)
         return lessons
 
+    async def extract_all(
+        self,
+        messages: list[dict[str, Any]],
+        include_tool_lessons: bool = True,
+        max_facts: int = 5,
+        max_lessons: int = 5,
+    ) -> dict[str, list[ExtractedFact]]:
+        """Extract facts, lessons and tool lessons with at most one LLM call.
+
+        Fact extraction and correction generalization share a single prompt
+        that returns a JSON object; tool lessons are heuristic. On LLM failure,
+        facts fall back to heuristics and lessons to the raw corrections.
+
+        Returns:
+            Dict with "facts", "lessons" and "tool_lessons" lists.
+        """
+        self._last_metrics = ExtractionMetrics()
+        conversation = self._fact_conversation(messages)
+        corrections = self._find_corrections(messages)
+
+        facts: list[ExtractedFact] = []
+        generalized: dict[int, LessonExtractionSchema] = {}
+        if conversation is not None or corrections:
+            try:
+                facts, generalized = await self._llm_extract_combined(
+                    conversation or self._format_conversation(messages),
+                    corrections,
+                )
+                self._last_metrics.llm_calls += 1
+                if conversation is None:
+                    facts = []
+            except Exception as e:
+                self._last_metrics.llm_failures += 1
+                logger.warning(f"Combined LLM extraction failed: {e}")
+                if conversation is not None:
+                    self._last_metrics.heuristic_fallbacks += 1
+                    facts = self._heuristic_extract(messages)
+
+        facts = facts[:max_facts]
+        self._last_metrics.facts_extracted = len(facts)
+        for f in facts:
+            t = f.fact_type
+            self._last_metrics.facts_by_type[t] = self._last_metrics.facts_by_type.get(t, 0) + 1
+
+        lessons: list[ExtractedFact] = []
+        seen: set[str] = set()
+        for i, (_, correction) in enumerate(corrections):
+            lesson = self._build_lesson(generalized.get(i), correction)
+            if lesson and lesson.content not in seen:
+                seen.add(lesson.content)
+                lessons.append(lesson)
+                if len(lessons) >= max_lessons:
+                    break
+        self._last_metrics.lessons_extracted = len(lessons)
+
+        tool_lessons = self.extract_tool_lessons(messages) if include_tool_lessons else []
+
+        logger.info(
+            f"extraction_complete facts={len(facts)} lessons={len(lessons)} "
+            f"tool_lessons={len(tool_lessons)}"
+        )
+        return {"facts": facts, "lessons": lessons, "tool_lessons": tool_lessons}
+
     async def extract_for_pre_compaction(
         self,
         messages: list[dict[str, Any]],
@@ -529,6 +565,89 @@ class MemoryExtractor:
 
         return facts
 
+    def _fact_conversation(self, messages: list[dict[str, Any]]) -> str | None:
+        """Return the formatted conversation if it warrants fact extraction, else None."""
+        if not messages:
+            return None
+
+        user_messages = [m for m in messages if m.get("role") == "user"]
+        if len(user_messages) < 3:
+            return None
+
+        last_msg = user_messages[-1].get("content", "").strip()
+        if not last_msg or any(p.match(last_msg) for p in self._trivial_patterns):
+            logger.debug(f"Skipping trivial message: {last_msg[:50]}")
+            return None
+
+        conversation = self._format_conversation(messages)
+        if len(conversation) < 50:
+            return None
+        return conversation
+
+    def _find_corrections(self, messages: list[dict[str, Any]]) -> list[tuple[str, str]]:
+        """Find user corrections in the recent window.
+
+        Returns:
+            List of (previous assistant answer, user correction) pairs.
+        """
+        corrections: list[tuple[str, str]] = []
+        window = messages[-10:]
+
+        for i, msg in enumerate(window):
+            if msg.get("role") != "user":
+                continue
+            content = msg.get("content", "")
+            lowered = content.lower().strip()
+            if not content or len(lowered) < 10:
+                continue
+            if not any(pat in lowered for pat in CORRECTION_PATTERNS):
+                continue
+
+            previous_answer = ""
+            for j in range(i - 1, -1, -1):
+                if window[j].get("role") == "assistant":
+                    prev = window[j].get("content", "")
+                    if isinstance(prev, str) and prev.strip():
+                        previous_answer = prev.strip()[:1500]
+                    break
+
+            corrections.append((previous_answer, content.strip()))
+        return corrections
+
+    def _build_lesson(
+        self,
+        generalized: LessonExtractionSchema | None,
+        correction: str,
+    ) -> ExtractedFact | None:
+        """Turn an LLM-generalized lesson (or the raw correction) into a validated fact."""
+        lesson_content: str | None = None
+        importance = 0.9
+        source = "lesson"
+        meta: dict[str, Any] = {}
+
+        if generalized:
+            lesson_content = self._normalize_lesson(generalized.lesson)
+            importance = IMPORTANCE_MAP.get(generalized.importance, 0.7)
+            source = "llm_lesson"
+            meta = {"category": generalized.category}
+
+        if not lesson_content:
+            lesson_content = self._normalize_lesson(correction[:500])
+
+        # Sanitize and validate lesson content
+        if lesson_content:
+            lesson_content = sanitize_for_memory(lesson_content)
+        if not lesson_content or not is_valid_memory(lesson_content):
+            return None
+
+        return ExtractedFact(
+            content=lesson_content[:500],
+            importance=importance,
+            source=source,
+            fact_type="lesson",
+            metadata=meta,
+        )
+
     def _sanitize_for_prompt(self, text: str) -> str:
         """Sanitize user content before embedding in prompts."""
         if not text:
@@ -636,62 +755,7 @@ class MemoryExtractor:
             raw_data = json.loads(content)
             if not isinstance(raw_data, list):
                 raise ValueError("Expected JSON array")
-
-            extracted: list[ExtractedFact] = []
-            importance_map: dict[str, float] = {
-                "high": 0.9,
-                "medium": 0.7,
-                "low": 0.3,
-            }
-
-            for item in raw_data[: self.max_facts]:
-                try:
-                    if not isinstance(item, dict):
-                        validated = ExtractedFactSchema(fact=str(item))
-                        fact_type = "generic"
-                        meta: dict[str, Any] = {}
-                    else:
-                        fact_type = item.get("type", "generic")
-                        if fact_type not in TYPED_SCHEMAS:
-                            fact_type = "generic"
-                        if fact_type in TYPED_SCHEMAS:
-                            validated = TYPED_SCHEMAS[fact_type](**item)
-                        else:
-                            validated = ExtractedFactSchema(**item)
-
-                        meta = {}
-                        if hasattr(validated, "project_name"):
-                            pn = getattr(validated, "project_name")
-                            if pn:
-                                meta["project_name"] = pn
-                        if hasattr(validated, "tool_name"):
-                            tn = getattr(validated, "tool_name")
-                            if tn:
-                                meta["tool_name"] = tn
-
-                    fact_text = sanitize_for_memory(validated.fact)
-                    if not is_valid_memory(fact_text):
-                        continue
-                    extracted.append(
-                        ExtractedFact(
-                            content=fact_text,
-                            importance=importance_map.get(
-                                getattr(
-                                    validated,
-                                    "importance",
-                                    "medium",
-                                ),
-                                0.5,
-                            ),
-                            source="llm",
-                            fact_type=fact_type,
-                            metadata=meta,
-                        )
-                    )
-                except ValidationError as ve:
-                    logger.debug(f"Fact validation skipped: {ve}")
-                    continue
-            return extracted
+            return self._parse_fact_items(raw_data)
         except json.JSONDecodeError as e:
             logger.warning(f"LLM extraction JSON decode failed: {e}")
             return []
@@ -699,6 +763,127 @@ class MemoryExtractor:
             logger.warning(f"LLM extraction validation failed: {e}")
             return []
 
+    async def _llm_extract_combined(
+        self,
+        conversation: str,
+        corrections: list[tuple[str, str]],
+    ) -> tuple[list[ExtractedFact], dict[int, LessonExtractionSchema]]:
+        """Extract facts and generalize corrections in one JSON-object completion.
+
+        Returns:
+            Tuple of (facts, lessons keyed by index into ``corrections``). Lessons
+            without a valid correction number are dropped, so a skipped or merged
+            item never shifts the others onto the wrong correction.
+        """
+        import litellm
+
+        corrections_text = (
+            "\n\n".join(
+                f"{i}. PREVIOUS ANSWER: "
+                f"{self._sanitize_for_prompt(prev or '(no prior answer)')}\n"
+                f"   USER CORRECTION: {self._sanitize_for_prompt(corr[:1000])}"
+                for i, (prev, corr) in enumerate(corrections, 1)
+            )
+            or "(none)"
+        )
+        response = await litellm.acompletion(
+            model=self.model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": COMBINED_EXTRACTION_PROMPT.format(
+                        conversation=conversation,
+                        corrections=corrections_text,
+                    ),
+                }
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=600,
+            temperature=0.1,
+        )
+
+        content = response.choices[0].message.content.strip()
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.startswith("json"):
+                content = content[4:]
+            content = content.strip()
+
+        data = json.loads(content)
+        # Tolerate models that answer with a bare fact array
+        if isinstance(data, list):
+            data = {"facts": data}
+        if not isinstance(data, dict):
+            raise ValueError("Expected JSON object")
+
+        raw_facts = data.get("facts") or []
+        facts = self._parse_fact_items(raw_facts) if isinstance(raw_facts, list) else []
+
+        lessons: dict[int, LessonExtractionSchema] = {}
+        raw_lessons = data.get("lessons") or []
+        for item in raw_lessons if isinstance(raw_lessons, list) else []:
+            number = item.get("correction") if isinstance(item, dict) else None
+            if type(number) is not int or not 1 <= number <= len(corrections):
+                logger.debug(f"Lesson without a valid correction number skipped: {item}")
+                continue
+            try:
+                lessons.setdefault(number - 1, LessonExtractionSchema(**item))
+            except (TypeError, ValidationError) as ve:
+                logger.debug(f"Lesson validation skipped: {ve}")
+        return facts, lessons
+
+    def _parse_fact_items(self, raw_data: list[Any]) -> list[ExtractedFact]:
+        """Validate raw LLM fact items into typed ExtractedFacts."""
+        extracted: list[ExtractedFact] = []
+        for item in raw_data[: self.max_facts]:
+            try:
+                if not isinstance(item, dict):
+                    validated = ExtractedFactSchema(fact=str(item))
+                    fact_type = "generic"
+                    meta: dict[str, Any] = {}
+                else:
+                    fact_type = item.get("type", "generic")
+                    if fact_type not in TYPED_SCHEMAS:
+                        fact_type = "generic"
+                    if fact_type in TYPED_SCHEMAS:
+                        validated = TYPED_SCHEMAS[fact_type](**item)
+                    else:
+                        validated = ExtractedFactSchema(**item)
+
+                    meta = {}
+                    if hasattr(validated, "project_name"):
+                        pn = getattr(validated, "project_name")
+                        if pn:
+                            meta["project_name"] = pn
+                    if hasattr(validated, "tool_name"):
+                        tn = getattr(validated, "tool_name")
+                        if tn:
+                            meta["tool_name"] = tn
+
+                fact_text = sanitize_for_memory(validated.fact)
+                if not is_valid_memory(fact_text):
+                    continue
+                extracted.append(
+                    ExtractedFact(
+                        content=fact_text,
+                        importance=IMPORTANCE_MAP.get(
+                            getattr(
+                                validated,
+                                "importance",
+                                "medium",
+                            ),
+                            0.5,
+                        ),
+                        source="llm",
+                        fact_type=fact_type,
+                        metadata=meta,
+                    )
+                )
+            except ValidationError as ve:
+                logger.debug(f"Fact validation skipped: {ve}")
+                continue
+        return extracted
+
     def _heuristic_extract(self, messages: list[dict[str, Any]]) -> list[ExtractedFact]:
         """Extract facts using simple heuristics (fallback)."""
         facts: list[ExtractedFact] = []
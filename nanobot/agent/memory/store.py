@@ -4,14 +4,16 @@ import json
 import re
 import sqlite3
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
+from nanobot.llm.embedding_cache import EmbeddingCache
+
 try:
     import numpy as np
 
@@ -46,36 +48,68 @@ class MemoryItem:
 
 
 class EmbeddingService:
-    """Embedding service with LRU cache."""
+    """Embedding service with LRU cache and an optional on-disk cache."""
 
     EMBEDDING_DIMENSIONS = {
         "text-embedding-3-small": 1536,
         "text-embedding-3-large": 3072,
     }
+    CACHE_SIZE = 200
 
     def __init__(
         self,
         model: str = "text-embedding-3-small",
         api_key: str | None = None,
         api_base: str | None = None,
+        cache_path: Path | None = None,
     ):
         self.model = model
         self.api_key = api_key
         self.api_base = api_base
         self._dimension: int | None = self.EMBEDDING_DIMENSIONS.get(model)
+        self._cache: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+        self._disk = EmbeddingCache(cache_path) if cache_path else None
 
-    @lru_cache(maxsize=200)
-    def _embed_cached(self, text: str) -> tuple[float, ...]:
-        """Cached embedding call. Returns tuple for hashability."""
+    def _embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in a single request, bypassing the cache."""
         import litellm
 
-        kwargs: dict[str, Any] = {"model": self.model, "input": [text]}
+        kwargs: dict[str, Any] = {"model": self.model, "input": texts}
         if self.api_key:
             kwargs["api_key"] = self.api_key
         if self.api_base:
             kwargs["api_base"] = self.api_base
         response = litellm.embedding(**kwargs)
-        return tuple(response.data[0]["embedding"])
+        return [item["embedding"] for item in response.data]
+
+    def _fetch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, serving any already in the disk cache without a request."""
+        if self._disk is None:
+            return self._embed_many(texts)
+        keys = [EmbeddingCache.key(self.model, t) for t in texts]
+        found = self._disk.get_many(keys)
+        misses = [i for i, k in enumerate(keys) if k not in found]
+        if misses:
+            fresh = self._embed_many([texts[i] for i in misses])
+            self._disk.put_many([(keys[i], vec) for i, vec in zip(misses, fresh)])
+            found.update((keys[i], vec) for i, vec in zip(misses, fresh))
+        return [found[k] for k in keys]
+
+    def _remember(self, text: str, embedding: list[float]) -> tuple[float, ...]:
+        cached = tuple(embedding)
+        self._cache[text] = cached
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return cached
+
+    def _embed_cached(self, text: str) -> tuple[float, ...]:
+        """Cached embedding call. Returns tuple for hashability."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+        return self._remember(text, self._fetch([text])[0])
 
     def embed(self, text: str) -> list[float]:
         """Get embedding for text, using cache when available."""
@@ -85,6 +119,19 @@ class EmbeddingService:
             logger.error(f"Embedding failed: {e}")
             raise
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Get embeddings for many texts, sending all cache misses in one request."""
+        misses = list(dict.fromkeys(t for t in texts if t not in self._cache))
+        if misses:
+            try:
+                vectors = self._fetch(misses)
+            except Exception as e:
+                logger.error(f"Batch embedding failed: {e}")
+                raise
+            for text, vector in zip(misses, vectors):
+                self._remember(text, vector)
+        return [self.embed(t) for t in texts]
+
     @property
     def dimension(self) -> int:
         if self._dimension is None:
@@ -123,7 +170,8 @@ class VectorMemoryStore:
         self.max_memories = max_memories
         self.namespace = self._validate_namespace(namespace)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(self.db_path)
+        # Consolidation may run store calls on a worker thread
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._init_db()
 
     def close(self) -> None:
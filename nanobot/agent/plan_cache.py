@@ -0,0 +1,114 @@
+"""Plan cache: reuse subagent results for identical tasks on an unchanged workspace."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.atomic import atomic_write_json
+
+
+def workspace_digest(workspace: Path, max_entries: int = 5000) -> str | None:
+    """
+    Fingerprint a workspace by the paths, sizes and mtimes of its files.
+
+    Hidden files and directories (``.git``, ``.nanobot``, ...) are skipped.
+
+    Returns:
+        Hex digest, or None if the workspace is missing or has more than
+        ``max_entries`` files (too large to fingerprint cheaply).
+    """
+    if not workspace.is_dir():
+        return None
+    entries: list[str] = []
+    for root, dirs, files in os.walk(workspace):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(path, workspace)}:{st.st_size}:{st.st_mtime_ns}")
+            if len(entries) > max_entries:
+                return None
+    entries.sort()
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    File-backed cache of final subagent results.
+
+    Each entry is a JSON file named by ``sha256(task, model, workspace digest)``,
+    written atomically. Entries expire after ``ttl_s``; when the directory
+    grows beyond ``max_bytes`` the least recently used entries are evicted
+    (hits refresh the file mtime).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_s: int = 7 * 24 * 3600,
+        max_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(task: str, model: str, digest: str) -> str:
+        """Build the cache key for a task run by ``model`` on a workspace state."""
+        return hashlib.sha256(f"{task}\0{model}\0{digest}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        """Return the cached result for a key, or None on miss or expiry."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - data.get("created_at", 0) > self.ttl_s:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data.get("result")
+
+    def put(self, key: str, result: str) -> None:
+        """Store a result and evict expired or least recently used entries."""
+        try:
+            atomic_write_json(self._path(key), {"result": result, "created_at": time.time()})
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Plan cache write failed: {e}")
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,247 @@
+"""Semantic response cache: reuse final replies for near-duplicate user turns."""
+
+import hashlib
+import sqlite3
+import struct
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.llm.embeddings import EmbeddingService
+from nanobot.memory.vectors import _cosine_similarity_fast
+
+
+class SemanticResponseCache:
+    """SQLite-backed cache of final responses keyed by prompt embedding.
+
+    Entries are scoped to a namespace (the session key) and a context string
+    (whatever besides the prompt shapes the reply, e.g. a digest of the system
+    prompt), and expire after ``ttl_s`` seconds. A lookup
+    embeds the prompt once and returns the best cached response whose cosine
+    similarity is at least ``threshold``; the embedding is handed back so a
+    subsequent ``store`` does not re-embed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        embedding_service: EmbeddingService,
+        threshold: float = 0.9,
+        ttl_s: int = 3600,
+        max_entries: int = 200,
+    ):
+        self.embedding_service = embedding_service
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                context_hash TEXT NOT NULL DEFAULT '',
+                UNIQUE(namespace, prompt_hash)
+            )
+        """)
+        # Migrate schema: databases created before context scoping lack the column
+        try:
+            self._db.execute(
+                "ALTER TABLE responses ADD COLUMN context_hash TEXT NOT NULL DEFAULT ''"
+            )
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_ns ON responses(namespace, expires_at)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+    async def lookup(
+        self,
+        namespace: str,
+        prompt: str,
+        context: str = "",
+    ) -> tuple[str | None, list[float] | None]:
+        """Find a cached response for a semantically similar prompt.
+
+        Args:
+            namespace: Cache scope (typically the session key).
+            prompt: The user turn to match.
+            context: Other reply inputs; only entries stored with the same context match.
+
+        Returns:
+            Tuple of (cached response or None, prompt embedding or None).
+        """
+        now = time.time()
+        context_hash = self._hash(context)
+        row = self._db.execute(
+            "SELECT response FROM responses"
+            " WHERE namespace = ? AND prompt_hash = ? AND context_hash = ? AND expires_at > ?",
+            (namespace, self._hash(prompt), context_hash, now),
+        ).fetchone()
+        if row:
+            return row[0], None
+
+        try:
+            embedding = await self.embedding_service.embed_single(prompt)
+        except Exception as e:
+            logger.debug(f"Response cache embedding failed: {e}")
+            return None, None
+        if not embedding:
+            return None, None
+
+        rows = self._db.execute(
+            "SELECT embedding, response FROM responses"
+            " WHERE namespace = ? AND context_hash = ? AND expires_at > ?",
+            (namespace, context_hash, now),
+        ).fetchall()
+
+        best_sim = 0.0
+        best: str | None = None
+        for blob, response in rows:
+            cached = list(struct.unpack(f"{len(blob) // 4}f", blob))
+            if len(cached) != len(embedding):
+                continue
+            sim = _cosine_similarity_fast(embedding, cached)
+            if sim > best_sim:
+                best_sim, best = sim, response
+
+        if best is not None and best_sim >= self.threshold:
+            logger.debug(f"Response cache hit in {namespace} (sim={best_sim:.3f})")
+            return best, embedding
+        return None, embedding
+
+    async def store(
+        self,
+        namespace: str,
+        prompt: str,
+        response: str,
+        embedding: list[float] | None = None,
+        context: str = "",
+    ) -> None:
+        """Cache a final response for a prompt.
+
+        Args:
+            namespace: Cache scope (typically the session key).
+            prompt: The user turn the response answers.
+            response: The final response content.
+            embedding: Prompt embedding from ``lookup``; computed if omitted.
+            context: Other reply inputs the response depends on (see ``lookup``).
+        """
+        if embedding is None:
+            try:
+                embedding = await self.embedding_service.embed_single(prompt)
+            except Exception as e:
+                logger.debug(f"Response cache embedding failed: {e}")
+                return
+        if not embedding:
+            return
+
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses"
+            " (namespace, prompt_hash, embedding, response, expires_at, context_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                namespace,
+                self._hash(prompt),
+                struct.pack(f"{len(embedding)}f", *embedding),
+                response,
+                now + self.ttl_s,
+                self._hash(context),
+            ),
+        )
+        # Drop expired rows and keep each namespace bounded
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM responses WHERE namespace = ? AND id NOT IN"
+            " (SELECT id FROM responses WHERE namespace = ? ORDER BY id DESC LIMIT ?)",
+            (namespace, namespace, self.max_entries),
+        )
+        self._db.commit()
+
+    def invalidate(self, namespace: str) -> None:
+        """Drop all cached responses for a namespace."""
+        self._db.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+        self._db.commit()
+
+    def close(self) -> None:
+        """Close database connection."""
+        self._db.close()
+
+
+class RecentResponseCache:
+    """In-memory window of recent (embedding, response) pairs per namespace.
+
+    Meant for repetitive, short-lived streams such as subagent announces,
+    where only the last few items matter and persistence is not wanted.
+    Namespaces are evicted least-recently-used beyond ``max_namespaces``.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        threshold: float = 0.95,
+        window: int = 16,
+        max_namespaces: int = 64,
+    ):
+        self.embedding_service = embedding_service
+        self.threshold = threshold
+        self.window = window
+        self.max_namespaces = max_namespaces
+        self._entries: OrderedDict[str, deque[tuple[list[float], str]]] = OrderedDict()
+
+    async def lookup(
+        self,
+        namespace: str,
+        text: str,
+    ) -> tuple[str | None, list[float] | None]:
+        """Find a recent response for semantically similar text.
+
+        Returns:
+            Tuple of (cached response or None, text embedding or None).
+        """
+        try:
+            embedding = await self.embedding_service.embed_single(text)
+        except Exception as e:
+            logger.debug(f"Recent response cache embedding failed: {e}")
+            return None, None
+        if not embedding:
+            return None, None
+
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None, embedding
+        self._entries.move_to_end(namespace)
+
+        for cached, response in reversed(entries):
+            if len(cached) != len(embedding):
+                continue
+            sim = _cosine_similarity_fast(embedding, cached)
+            if sim >= self.threshold:
+                logger.debug(f"Recent response cache hit in {namespace} (sim={sim:.3f})")
+                return response, embedding
+        return None, embedding
+
+    def remember(self, namespace: str, embedding: list[float], response: str) -> None:
+        """Record a response in the namespace's window."""
+        entries = self._entries.get(namespace)
+        if entries is None:
+            entries = deque(maxlen=self.window)
+            self._entries[namespace] = entries
+        self._entries.move_to_end(namespace)
+        entries.append((embedding, response))
+        while len(self._entries) > self.max_namespaces:
+            self._entries.popitem(last=False)
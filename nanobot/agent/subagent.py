@@ -1,21 +1,27 @@
 """Subagent manager for background task execution."""
 
 import asyncio
-import json
 import uuid
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, Any
+from weakref import WeakValueDictionary
 
 from loguru import logger
 
+from nanobot.agent.plan_cache import PlanCache, workspace_digest
 from nanobot.agent.tools.filesystem import ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
 from nanobot.bus.events import InboundMessage
-from nanobot.bus.progress import ProgressCallback, ProgressEvent, ProgressKind
+from nanobot.bus.progress import ProgressBatchCallback, ProgressEvent, ProgressKind
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, ToolCallRequest
+from nanobot.utils import fastjson
 
 if TYPE_CHECKING:
     from nanobot.config.schema import ExecToolConfig
@@ -23,6 +29,199 @@ if TYPE_CHECKING:
     from nanobot.registry.store import AgentRegistry
 
 
+# System prompt for subagents; only the task and workspace vary per spawn
+_BASE_PROMPT_TMPL = """# Subagent
+
+You are a subagent spawned by the main agent to complete a specific task.
+
+## Your Task
+{task}
+
+## Rules
+1. Stay focused - complete only the assigned task, nothing else
+2. Your final response will be reported back to the main agent
+3. Do not initiate conversations or take on side tasks
+4. Be concise but informative in your findings
+
+## What You Can Do
+- Read and write files in the workspace
+- Execute shell commands
+- Search the web and fetch web pages
+- Complete the task thoroughly
+
+## What You Cannot Do
+- Send messages directly to users (no message tool available)
+- Spawn other subagents
+- Access the main agent's conversation history
+
+## Workspace
+Your workspace is at: {workspace}
+
+When you have completed the task, provide a clear summary of your findings or actions."""
+
+_PROOF_APPENDIX = """
+
+## Proof of Work
+After completing your task, you MUST submit proof using the submit_proof tool.
+Choose the appropriate proof type:
+- git: For code changes (branch, commit hash)
+- file: For file creation/modification (path, sha256 hash)
+- command: For shell commands (command, exit code)
+- test: For test results (passed/failed counts)
+- pr: For pull requests (PR URL, number, branch)
+
+## Self-Evolution (if available)
+If you have access to self_evolve, follow this workflow:
+1. setup_repo - Clone/pull the nanobot repo
+2. create_branch - Create a feature branch
+3. (Make changes using read_file/write_file on the repo)
+4. run_tests - Verify changes
+5. run_lint - Check code style
+6. commit_push - Commit and push changes
+7. create_pr - Create a pull request
+8. submit_proof with type=pr"""
+
+# Tools whose results depend only on the workspace; runs using any other tool (shell,
+# web, MCP) touch external state and are not plan-cached
+_PLAN_CACHEABLE_TOOLS = frozenset({"read_file", "list_dir", "write_file"})
+
+# Share of the context window a subagent history may fill before old turns are dropped
+_HISTORY_BUDGET = 0.7
+
+
+def _estimate_tokens(message: dict[str, Any]) -> int:
+    """Approximate a message's size at ~4 chars per token."""
+    chars = len(message.get("content") or "")
+    for tc in message.get("tool_calls") or ():
+        chars += len(tc["function"]["arguments"])
+    return chars // 4
+
+
+def _trim_history(messages: list[dict[str, Any]], max_tokens: int) -> int:
+    """
+    Drop the oldest tool turns until the history fits in ``max_tokens``.
+
+    The system prompt, the task and the most recent turn (assistant tool
+    calls plus their results) are always kept.
+
+    Returns:
+        Number of messages dropped.
+    """
+    total = sum(_estimate_tokens(m) for m in messages)
+    dropped = 0
+    while total > max_tokens:
+        # Turn boundaries are assistant messages after the system + task pair
+        starts = [i for i in range(2, len(messages)) if messages[i]["role"] == "assistant"]
+        if len(starts) < 2:
+            break
+        turn = messages[starts[0] : starts[1]]
+        total -= sum(_estimate_tokens(m) for m in turn)
+        dropped += len(turn)
+        del messages[starts[0] : starts[1]]
+    return dropped
+
+
+class ToolRunCache:
+    """
+    Per-run memo of read-only tool results, keyed by tool name and arguments.
+
+    A ``write_file`` drops cached reads and listings of the written path and
+    its parent directories; any other side-effecting call (e.g. ``exec``)
+    drops all cached filesystem results. Web results are kept for the run.
+    """
+
+    PURE_TOOLS = frozenset({"read_file", "list_dir", "web_fetch", "web_search"})
+    _FS_TOOLS = frozenset({"read_file", "list_dir"})
+
+    def __init__(self) -> None:
+        self._results: dict[tuple[str, str], tuple[Path | None, str]] = {}
+
+    @staticmethod
+    def _key(name: str, arguments: dict[str, Any]) -> tuple[str, str]:
+        return name, fastjson.dumps(arguments, sort_keys=True)
+
+    @staticmethod
+    def _path(arguments: dict[str, Any]) -> Path | None:
+        path = arguments.get("path")
+        return Path(path).expanduser().resolve() if isinstance(path, str) else None
+
+    def get(self, name: str, arguments: dict[str, Any]) -> str | None:
+        """Return a cached result for a pure tool call, if any."""
+        if name not in self.PURE_TOOLS:
+            return None
+        entry = self._results.get(self._key(name, arguments))
+        return entry[1] if entry else None
+
+    def record(self, name: str, arguments: dict[str, Any], result: str) -> None:
+        """Cache a pure result, or invalidate entries a side-effecting call may affect."""
+        if name in self.PURE_TOOLS:
+            if not result.startswith("Error"):
+                path = self._path(arguments) if name in self._FS_TOOLS else None
+                self._results[self._key(name, arguments)] = (path, result)
+            return
+
+        written = self._path(arguments) if name == "write_file" else None
+        for key, (path, _) in list(self._results.items()):
+            if key[0] not in self._FS_TOOLS:
+                continue
+            if written is None or path is None or path == written or path in written.parents:
+                del self._results[key]
+
+
+class _ProgressBatcher:
+    """
+    Coalesces progress events before handing them to a batch callback.
+
+    ``emit`` only queues; a background task delivers the queue as one batch
+    after ``interval_ms`` or as soon as ``max_events`` are pending. Delivery
+    runs under a single lock so batches never interleave. Call ``flush`` at
+    boundaries where the tail must not be delayed.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressBatchCallback,
+        max_events: int = 16,
+        interval_ms: int = 50,
+    ):
+        self._callback = callback
+        self.max_events = max_events
+        self.interval_ms = interval_ms
+        self._pending: deque[ProgressEvent] = deque()
+        self._lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    def emit(self, event: ProgressEvent) -> None:
+        """Queue an event for delivery (non-blocking)."""
+        self._pending.append(event)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+        if len(self._pending) >= self.max_events:
+            self._full.set()
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.wait_for(self._full.wait(), self.interval_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        self._flusher = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Deliver every pending event now."""
+        async with self._lock:
+            if not self._pending:
+                return
+            batch = list(self._pending)
+            self._pending.clear()
+            try:
+                await self._callback(batch)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
+
 class SubagentManager:
     """
     Manages background subagent execution.
@@ -32,6 +231,9 @@ class SubagentManager:
     isolated context and a focused system prompt.
     """
 
+    # Registry symbols, imported on first registry-backed run
+    _registry_symbols: SimpleNamespace | None = None
+
     def __init__(
         self,
         provider: LLMProvider,
@@ -42,20 +244,75 @@ class SubagentManager:
         exec_config: "ExecToolConfig | None" = None,
         registry: "AgentRegistry | None" = None,
         evolve_manager: "SelfEvolveManager | None" = None,
-        progress_callback: ProgressCallback | None = None,
+        progress_batch_callback: ProgressBatchCallback | None = None,
+        plan_cache: PlanCache | None = None,
+        max_concurrent: int | None = None,
+        max_context_tokens: int = 100_000,
     ):
         from nanobot.config.schema import ExecToolConfig
 
         self.provider = provider
         self.workspace = workspace
+        self._workspace_str = str(workspace)
         self.bus = bus
         self.model = model or provider.get_default_model()
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self._registry = registry
         self._evolve_manager = evolve_manager
-        self._progress_callback = progress_callback
-        self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        self._progress = (
+            _ProgressBatcher(progress_batch_callback) if progress_batch_callback else None
+        )
+        self.plan_cache = plan_cache
+        self.max_context_tokens = max_context_tokens
+        # Live concurrency limit (None = unlimited); resizable via set_concurrency()
+        self._max_concurrent = max_concurrent
+        self._active = 0
+        self._cond = asyncio.Condition()
+        # Lookup by task id; the set holds the strong refs until each task is done
+        self._running_tasks: WeakValueDictionary[str, asyncio.Task[None]] = WeakValueDictionary()
+        self._strong_refs: set[asyncio.Task[None]] = set()
+        # Registry agents pulsed together by one manager-level loop
+        self._active_pulse_ids: set[str] = set()
+        self._pulse_task: asyncio.Task[None] | None = None
+        # Tools shared by every subagent; per-task tools are layered on a copy
+        self._base_tools = self._build_base_tools()
+
+    @classmethod
+    def _load_registry_symbols(cls) -> SimpleNamespace:
+        """Import the registry, handshake and proof/evolve tool symbols once per process."""
+        if cls._registry_symbols is None:
+            from nanobot.agent.tools.evolve import SelfEvolveTool
+            from nanobot.agent.tools.proof import SubmitProofTool
+            from nanobot.registry.handshake import AgentHandshake, HandshakeError
+            from nanobot.registry.store import AgentState, TaskState
+
+            cls._registry_symbols = SimpleNamespace(
+                AgentHandshake=AgentHandshake,
+                HandshakeError=HandshakeError,
+                AgentState=AgentState,
+                TaskState=TaskState,
+                SubmitProofTool=SubmitProofTool,
+                SelfEvolveTool=SelfEvolveTool,
+            )
+        return cls._registry_symbols
+
+    def _build_base_tools(self) -> ToolRegistry:
+        """Build the tool set common to all subagents (no message tool, no spawn tool)."""
+        tools = ToolRegistry()
+        tools.register(ReadFileTool())
+        tools.register(WriteFileTool())
+        tools.register(ListDirTool())
+        tools.register(
+            ExecTool(
+                working_dir=self._workspace_str,
+                timeout=self.exec_config.timeout,
+                restrict_to_workspace=self.exec_config.restrict_to_workspace,
+            )
+        )
+        tools.register(WebSearchTool(api_key=self.brave_api_key))
+        tools.register(WebFetchTool())
+        return tools
 
     async def spawn(
         self,
@@ -81,7 +338,7 @@ class SubagentManager:
             Status message indicating the subagent was started.
         """
         task_id = str(uuid.uuid4())[:8]
-        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
+        display_label = label or (task[:27] + "..." if len(task) > 30 else task)
 
         origin = {
             "channel": origin_channel,
@@ -90,15 +347,48 @@ class SubagentManager:
 
         # Create background task
         bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin, registry_task_id, silent)
+            self._run_subagent(task_id, task, display_label, origin, registry_task_id, silent),
+            name=task_id,
         )
         self._running_tasks[task_id] = bg_task
-
-        # Cleanup when done
-        bg_task.add_done_callback(lambda _: self._running_tasks.pop(task_id, None))
+        self._strong_refs.add(bg_task)
+        bg_task.add_done_callback(self._strong_refs.discard)
 
         logger.info(f"Spawned subagent [{task_id}]: {display_label}")
-        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+        status = f"Subagent [{display_label}] started (id: {task_id})."
+        # Tasks not yet holding a slot are queued; this one is already counted
+        limit = self._max_concurrent
+        if limit is not None and len(self._strong_refs) > limit:
+            status += f" It is queued until one of {limit} running subagents finishes."
+        return status + " I'll notify you when it completes."
+
+    async def set_concurrency(self, max_concurrent: int | None) -> None:
+        """
+        Change how many subagents may execute at once.
+
+        Raising the limit wakes waiting subagents immediately; lowering it
+        lets running ones finish and holds new ones until below the limit.
+        """
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        async with self._cond:
+            self._max_concurrent = max_concurrent
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``max_concurrent`` execution slots."""
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self._max_concurrent is None or self._active < self._max_concurrent
+            )
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._active -= 1
+                self._cond.notify(1)
 
     async def _run_subagent(
         self,
@@ -108,36 +398,35 @@ class SubagentManager:
         origin: dict[str, str],
         registry_task_id: str | None = None,
         silent: bool = False,
+    ) -> None:
+        """Wait for an execution slot, then run the subagent task."""
+        async with self._slot():
+            await self._execute_subagent(task_id, task, label, origin, registry_task_id, silent)
+
+    async def _execute_subagent(
+        self,
+        task_id: str,
+        task: str,
+        label: str,
+        origin: dict[str, str],
+        registry_task_id: str | None = None,
+        silent: bool = False,
     ) -> None:
         """Execute the subagent task and announce the result."""
         logger.info(f"Subagent [{task_id}] starting task: {label}")
 
         agent_id = f"subagent-{task_id}"
-        pulse_task: asyncio.Task | None = None
+        sym = self._load_registry_symbols() if self._registry else None
 
         try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            tools.register(ReadFileTool())
-            tools.register(WriteFileTool())
-            tools.register(ListDirTool())
-            tools.register(
-                ExecTool(
-                    working_dir=str(self.workspace),
-                    timeout=self.exec_config.timeout,
-                    restrict_to_workspace=self.exec_config.restrict_to_workspace,
-                )
-            )
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools = self._base_tools
 
             # Registry integration: handshake + proof tool + evolve tool
             if self._registry and registry_task_id:
-                from nanobot.registry.handshake import AgentHandshake, HandshakeError
-                from nanobot.registry.store import AgentState, TaskState
+                tools = tools.copy()
 
                 # Perform handshake
-                handshake = AgentHandshake(self._registry, self.workspace)
+                handshake = sym.AgentHandshake(self._registry, self.workspace)
                 try:
                     await handshake.perform(
                         agent_id=agent_id,
@@ -145,7 +434,7 @@ class SubagentManager:
                         capabilities=["read_file", "write_file", "exec"],
                         available_tool_names=list(tools.tool_names),
                     )
-                except HandshakeError as e:
+                except sym.HandshakeError as e:
                     logger.error(f"Subagent [{task_id}] handshake failed: {e}")
                     if not silent:
                         await self._announce_result(
@@ -155,22 +444,22 @@ class SubagentManager:
 
                 # Transition task to IN_PROGRESS
                 await self._registry.update_task_state(
-                    registry_task_id, TaskState.IN_PROGRESS, reason="subagent started"
+                    registry_task_id, sym.TaskState.IN_PROGRESS, reason="subagent started"
                 )
 
                 # Register proof tool
-                from nanobot.agent.tools.proof import SubmitProofTool
-
-                tools.register(SubmitProofTool(registry=self._registry, task_id=registry_task_id))
+                tools.register(
+                    sym.SubmitProofTool(registry=self._registry, task_id=registry_task_id)
+                )
 
                 # Register evolve tool if available
                 if self._evolve_manager:
-                    from nanobot.agent.tools.evolve import SelfEvolveTool
-
-                    tools.register(SelfEvolveTool(self._evolve_manager))
+                    tools.register(sym.SelfEvolveTool(self._evolve_manager))
 
-                # Start pulse loop
-                pulse_task = asyncio.create_task(self._pulse_loop(agent_id, interval=60))
+                # Join the shared pulse loop
+                self._active_pulse_ids.add(agent_id)
+                if self._pulse_task is None:
+                    self._pulse_task = asyncio.create_task(self._pulse_loop_all(interval=60))
 
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(
@@ -181,17 +470,35 @@ class SubagentManager:
                 {"role": "user", "content": task},
             ]
 
+            # Plan cache: an identical task on an unchanged workspace reuses its result
+            plan_key: str | None = None
+            final_result: str | None = None
+            if self.plan_cache and not registry_task_id:
+                digest = await asyncio.to_thread(workspace_digest, self.workspace)
+                if digest:
+                    plan_key = self.plan_cache.make_key(task, self.model, digest)
+                    final_result = await asyncio.to_thread(self.plan_cache.get, plan_key)
+                    if final_result is not None:
+                        logger.info(f"Subagent [{task_id}] reused cached result")
+                        plan_key = None
+
             # Run agent loop (limited iterations)
             max_iterations = 15
             iteration = 0
-            final_result: str | None = None
+            tool_defs = tools.get_definitions()
+            run_cache = ToolRunCache()
+            history_budget = int(self.max_context_tokens * _HISTORY_BUDGET)
 
-            while iteration < max_iterations:
+            while final_result is None and iteration < max_iterations:
                 iteration += 1
 
+                dropped = _trim_history(messages, history_budget)
+                if dropped:
+                    logger.debug(f"Subagent [{task_id}] dropped {dropped} old messages")
+
                 response = await self.provider.chat(
                     messages=messages,
-                    tools=tools.get_definitions(),
+                    tools=tool_defs,
                     model=self.model,
                 )
 
@@ -203,7 +510,7 @@ class SubagentManager:
                             "type": "function",
                             "function": {
                                 "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
+                                "arguments": fastjson.dumps(tc.arguments),
                             },
                         }
                         for tc in response.tool_calls
@@ -216,11 +523,11 @@ class SubagentManager:
                         }
                     )
 
-                    # Execute tools
-                    for tool_call in response.tool_calls:
+                    # Execute tools; adjacent read-only calls run concurrently
+                    async def _exec_one(tool_call: ToolCallRequest) -> str:
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name}")
-                        if self._progress_callback and not silent:
-                            await self._progress_callback(
+                        if self._progress and not silent:
+                            self._progress.emit(
                                 ProgressEvent(
                                     channel=origin["channel"],
                                     chat_id=origin["chat_id"],
@@ -230,14 +537,14 @@ class SubagentManager:
                                     iteration=iteration,
                                 )
                             )
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
-                        if self._progress_callback and not silent:
-                            status = (
-                                "error"
-                                if isinstance(result, str) and result.startswith("Error")
-                                else "ok"
-                            )
-                            await self._progress_callback(
+                        result = run_cache.get(tool_call.name, tool_call.arguments)
+                        if result is None:
+                            result = await tools.execute(tool_call.name, tool_call.arguments)
+                            run_cache.record(tool_call.name, tool_call.arguments, result)
+                        if self._progress and not silent:
+                            # Tools report failures as strings prefixed with "Error"
+                            status = "error" if result.startswith("Error") else "ok"
+                            self._progress.emit(
                                 ProgressEvent(
                                     channel=origin["channel"],
                                     chat_id=origin["chat_id"],
@@ -247,6 +554,20 @@ class SubagentManager:
                                     iteration=iteration,
                                 )
                             )
+                        return result
+
+                    results = await tools.run_calls(response.tool_calls, _exec_one)
+                    if self._progress:
+                        await self._progress.flush()
+                    for tool_call, result in zip(response.tool_calls, results):
+                        if isinstance(result, BaseException):
+                            result = f"Error executing {tool_call.name}: {result}"
+                        # Errors and external state make the run unsafe to replay
+                        if (
+                            result.startswith("Error")
+                            or tool_call.name not in _PLAN_CACHEABLE_TOOLS
+                        ):
+                            plan_key = None
                         messages.append(
                             {
                                 "role": "tool",
@@ -261,14 +582,14 @@ class SubagentManager:
 
             if final_result is None:
                 final_result = "Task completed but no final response was generated."
+            elif plan_key and self.plan_cache:
+                await asyncio.to_thread(self.plan_cache.put, plan_key, final_result)
 
             # Update registry state on completion
             if self._registry and registry_task_id:
-                from nanobot.registry.store import AgentState
-
                 try:
                     await self._registry.update_agent_state(
-                        agent_id, AgentState.COMPLETED, reason="task finished"
+                        agent_id, sym.AgentState.COMPLETED, reason="task finished"
                     )
                 except Exception:
                     pass  # May already be in a terminal state or DB error
@@ -277,23 +598,25 @@ class SubagentManager:
             if not silent:
                 await self._announce_result(task_id, label, task, final_result, origin, "ok")
 
+        except asyncio.CancelledError:
+            logger.warning(f"Subagent [{task_id}] cancelled")
+            raise
+
         except Exception as e:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
 
             # Update registry state on failure
             if self._registry and registry_task_id:
-                from nanobot.registry.store import AgentState, TaskState
-
                 try:
                     await self._registry.update_agent_state(
-                        agent_id, AgentState.FAILED, reason=str(e)
+                        agent_id, sym.AgentState.FAILED, reason=str(e)
                     )
                 except Exception:
                     pass
                 try:
                     await self._registry.update_task_state(
-                        registry_task_id, TaskState.FAILED, reason=str(e)
+                        registry_task_id, sym.TaskState.FAILED, reason=str(e)
                     )
                 except Exception:
                     pass
@@ -302,35 +625,33 @@ class SubagentManager:
                 await self._announce_result(task_id, label, task, error_msg, origin, "error")
 
         finally:
-            if pulse_task:
-                pulse_task.cancel()
-                try:
-                    await pulse_task
-                except asyncio.CancelledError:
-                    pass
+            if self._progress:
+                await self._progress.flush()
+            self._active_pulse_ids.discard(agent_id)
 
             # Transition agent back to IDLE for reuse
             if self._registry:
                 try:
                     agent = await self._registry.get_agent(agent_id)
                     if agent and agent["state"] in ("completed", "failed"):
-                        from nanobot.registry.store import AgentState
-
                         await self._registry.update_agent_state(
-                            agent_id, AgentState.IDLE, reason="cleanup"
+                            agent_id, sym.AgentState.IDLE, reason="cleanup"
                         )
                 except Exception:
                     pass
 
-    async def _pulse_loop(self, agent_id: str, interval: int = 60) -> None:
-        """Periodically record heartbeat pulses for the agent."""
-        while True:
-            await asyncio.sleep(interval)
-            if self._registry:
-                try:
-                    await self._registry.record_pulse(agent_id)
-                except Exception as e:
-                    logger.debug(f"Pulse failed for {agent_id}: {e}")
+    async def _pulse_loop_all(self, interval: int = 60) -> None:
+        """Periodically record heartbeat pulses for all registry-backed subagents."""
+        try:
+            while self._active_pulse_ids:
+                await asyncio.sleep(interval)
+                if self._registry and self._active_pulse_ids:
+                    try:
+                        await self._registry.record_pulse_many(self._active_pulse_ids.copy())
+                    except Exception as e:
+                        logger.debug(f"Pulse failed for {len(self._active_pulse_ids)} agents: {e}")
+        finally:
+            self._pulse_task = None
 
     async def _announce_result(
         self,
@@ -368,60 +689,29 @@ Summarize this naturally for the user. Keep it brief (1-2 sentences). Do not men
 
     def _build_subagent_prompt(self, task: str, has_registry: bool = False) -> str:
         """Build a focused system prompt for the subagent."""
-        base = f"""# Subagent
-
-You are a subagent spawned by the main agent to complete a specific task.
-
-## Your Task
-{task}
-
-## Rules
-1. Stay focused - complete only the assigned task, nothing else
-2. Your final response will be reported back to the main agent
-3. Do not initiate conversations or take on side tasks
-4. Be concise but informative in your findings
-
-## What You Can Do
-- Read and write files in the workspace
-- Execute shell commands
-- Search the web and fetch web pages
-- Complete the task thoroughly
-
-## What You Cannot Do
-- Send messages directly to users (no message tool available)
-- Spawn other subagents
-- Access the main agent's conversation history
-
-## Workspace
-Your workspace is at: {self.workspace}
-
-When you have completed the task, provide a clear summary of your findings or actions."""
-
-        if has_registry:
-            base += """
-
-## Proof of Work
-After completing your task, you MUST submit proof using the submit_proof tool.
-Choose the appropriate proof type:
-- git: For code changes (branch, commit hash)
-- file: For file creation/modification (path, sha256 hash)
-- command: For shell commands (command, exit code)
-- test: For test results (passed/failed counts)
-- pr: For pull requests (PR URL, number, branch)
+        prompt = _BASE_PROMPT_TMPL.format(task=task, workspace=self._workspace_str)
+        return prompt + _PROOF_APPENDIX if has_registry else prompt
 
-## Self-Evolution (if available)
-If you have access to self_evolve, follow this workflow:
-1. setup_repo - Clone/pull the nanobot repo
-2. create_branch - Create a feature branch
-3. (Make changes using read_file/write_file on the repo)
-4. run_tests - Verify changes
-5. run_lint - Check code style
-6. commit_push - Commit and push changes
-7. create_pr - Create a pull request
-8. submit_proof with type=pr"""
+    async def stop(self, timeout_s: float = 5.0) -> None:
+        """
+        Cancel running subagents and wait for them to unwind.
 
-        return base
+        Cancelling the tasks interrupts in-flight LLM and tool calls, so
+        their work and concurrency slots are released rather than left
+        running after shutdown.
+        """
+        if self._pulse_task:
+            self._pulse_task.cancel()
+        tasks = list(self._strong_refs)
+        if not tasks:
+            return
+        for t in tasks:
+            t.cancel()
+        _, pending = await asyncio.wait(tasks, timeout=timeout_s)
+        if pending:
+            logger.warning(f"{len(pending)} subagent(s) did not stop within {timeout_s}s")
+        logger.info(f"Cancelled {len(tasks)} running subagent(s)")
 
     def get_running_count(self) -> int:
         """Return the number of currently running subagents."""
-        return len(self._running_tasks)
+        return len(self._strong_refs)
@@ -15,6 +15,9 @@ class Tool(ABC):
 
     _progress: Callable[[str], Awaitable[None]] | None = None
 
+    # Read-only tools with no side effects may run concurrently with each other
+    parallel_safe: bool = False
+
     async def report_progress(self, detail: str) -> None:
         """Report progress to the client (typing indicator) if a callback is set."""
         if self._progress:
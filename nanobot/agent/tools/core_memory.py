@@ -14,6 +14,25 @@ class CoreMemoryReadTool(Tool):
     the agent's context. This tool retrieves its contents.
     """
 
+    name = "core_memory_read"
+    parallel_safe = True
+    description = (
+        "Read the agent's core memory (persistent scratchpad). "
+        "Returns all sections or a specific section. Core memory is "
+        "always visible in your context - use this to review what "
+        "you've stored about the user, preferences, and projects."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "section": {
+                "type": "string",
+                "description": "Name of the section to read. Omit to read all sections.",
+            },
+        },
+        "required": [],
+    }
+
     def __init__(self, core_memory: CoreMemory):
         """
         Initialize the core memory read tool.
@@ -23,32 +42,6 @@ class CoreMemoryReadTool(Tool):
         """
         self._core_memory = core_memory
 
-    @property
-    def name(self) -> str:
-        return "core_memory_read"
-
-    @property
-    def description(self) -> str:
-        return (
-            "Read the agent's core memory (persistent scratchpad). "
-            "Returns all sections or a specific section. Core memory is "
-            "always visible in your context - use this to review what "
-            "you've stored about the user, preferences, and projects."
-        )
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "section": {
-                    "type": "string",
-                    "description": ("Name of the section to read. Omit to read all sections."),
-                },
-            },
-            "required": [],
-        }
-
     async def execute(self, **kwargs: Any) -> str:
         """Execute the core memory read."""
         section = kwargs.get("section")
@@ -70,6 +63,35 @@ class CoreMemoryUpdateTool(Tool):
     current projects, and important preferences.
     """
 
+    name = "core_memory_update"
+    description = (
+        "Update a section of core memory. Core memory is always "
+        "visible in your context - use it for key user info, current "
+        "projects, and important preferences. Creates the section if "
+        "it does not exist."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "section": {
+                "type": "string",
+                "description": (
+                    "Name of the section to update "
+                    "(e.g. 'user', 'preferences', 'current_projects')."
+                ),
+            },
+            "content": {
+                "type": "string",
+                "description": (
+                    "New content for the section. Replaces existing "
+                    "content entirely. Keep concise - total core memory "
+                    "is limited to 2000 characters."
+                ),
+            },
+        },
+        "required": ["section", "content"],
+    }
+
     def __init__(self, core_memory: CoreMemory):
         """
         Initialize the core memory update tool.
@@ -79,43 +101,6 @@ class CoreMemoryUpdateTool(Tool):
         """
         self._core_memory = core_memory
 
-    @property
-    def name(self) -> str:
-        return "core_memory_update"
-
-    @property
-    def description(self) -> str:
-        return (
-            "Update a section of core memory. Core memory is always "
-            "visible in your context - use it for key user info, current "
-            "projects, and important preferences. Creates the section if "
-            "it does not exist."
-        )
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "section": {
-                    "type": "string",
-                    "description": (
-                        "Name of the section to update "
-                        "(e.g. 'user', 'preferences', 'current_projects')."
-                    ),
-                },
-                "content": {
-                    "type": "string",
-                    "description": (
-                        "New content for the section. Replaces existing "
-                        "content entirely. Keep concise - total core memory "
-                        "is limited to 2000 characters."
-                    ),
-                },
-            },
-            "required": ["section", "content"],
-        }
-
     async def execute(self, **kwargs: Any) -> str:
         """Execute the core memory update."""
         section = kwargs.get("section", "")
@@ -23,6 +23,8 @@ def _check_allowed_dir(file_path: Path, allowed_dir: Path | None) -> str | None:
 class ReadFileTool(Tool):
     """Tool to read file contents."""
 
+    parallel_safe = True
+
     def __init__(self, allowed_dir: Path | None = None):
         self.allowed_dir = allowed_dir
 
@@ -177,6 +179,8 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
 
+    parallel_safe = True
+
     def __init__(self, allowed_dir: Path | None = None):
         self.allowed_dir = allowed_dir
 
@@ -1,9 +1,43 @@
 """Health check tool for nanobot error metrics and system status."""
 
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
-from nanobot.agent.errors import ErrorLogger, get_error_logger
+from nanobot.agent.errors import get_error_logger
+
+# (errors-per-hour upper bound, status, detail); the first tier the rate is below wins
+_STATUS_TIERS = (
+    (1, "✅ Healthy", "No errors in last hour"),
+    (5, "✅ Good", "Less than 5 errors in last hour"),
+    (20, "⚠️ Warning", "5-20 errors in last hour"),
+    (float("inf"), "❌ Critical", "20+ errors in last hour"),
+)
+
+# (recovery % lower bound, tag); rates at or below the last bound are tagged ❌
+_RECOVERY_TAGS = ((80, "✅"), (50, "⚠️"))
+
+
+def _status_tier(errors_last_hour: int) -> tuple[str, str]:
+    """Return the (status, detail) tier for an hourly error count."""
+    return next((s, d) for limit, s, d in _STATUS_TIERS if errors_last_hour < limit)
+
+
+def _recovery_tag(recovery: float) -> str:
+    """Return the status tag for a recovery percentage."""
+    return next((tag for bound, tag in _RECOVERY_TAGS if recovery > bound), "❌")
+
+
+_RECOVERY_LEGEND = (
+    "",
+    "Recovery rate indicates how often the system automatically recovers from this error type.",
+    "- ✅ >80%: Good automatic recovery",
+    "- ⚠️ 50-80%: Partial recovery, some manual intervention needed",
+    "- ❌ <50%: Poor recovery, needs investigation",
+)
 
 
 class HealthCheckTool:
@@ -74,36 +108,32 @@ class HealthCheckTool:
         elif scope == "errors":
             return self._format_top_errors(logger.get_top_errors(limit), limit)
         elif scope == "recent":
-            return self._format_recent_errors(logger.get_recent_errors(minutes), minutes, limit)
+            return self._format_recent_errors(
+                logger.get_recent_errors(minutes, limit), minutes, limit
+            )
         elif scope == "all":
-            return self._format_full_report(logger, limit, minutes)
+            metrics, top_errors, recent_errors = logger.get_report_bundle(limit, minutes)
+            return self._format_full_report(metrics, top_errors, recent_errors, minutes, limit)
 
         return "Unknown scope."
 
     def _format_summary(self, metrics: dict[str, Any]) -> str:
         """Format health summary."""
+        return "\n".join(self._summary_lines(metrics))
+
+    def _summary_lines(self, metrics: dict[str, Any]) -> list[str]:
         total_errors = metrics.get("total_errors", 0)
         errors_last_hour = metrics.get("errors_last_hour", 0)
 
-        # Health status
-        if errors_last_hour == 0:
-            status = "✅ Healthy - No errors in last hour"
-        elif errors_last_hour < 5:
-            status = "✅ Good - Less than 5 errors in last hour"
-        elif errors_last_hour < 20:
-            status = "⚠️ Warning - 5-20 errors in last hour"
-        else:
-            status = "❌ Critical - 20+ errors in last hour"
+        status = " - ".join(_status_tier(errors_last_hour))
 
         recovery_rates = metrics.get("recovery_rates", {})
 
         # Find worst recovery rate
-        worst_recovery = None
-        worst_value = 1.0
-        for category, rate in recovery_rates.items():
-            if rate < worst_value:
-                worst_value = rate
-                worst_recovery = category
+        if recovery_rates:
+            worst_recovery, worst_value = min(recovery_rates.items(), key=itemgetter(1))
+        else:
+            worst_recovery, worst_value = None, 1.0
 
         # Build report
         report = [
@@ -129,66 +159,59 @@ class HealthCheckTool:
 
         if errors_last_hour > 0:
             report.append("## Error Categories (Last Hour)")
-            for category, count in metrics.get("errors_by_category", {}).items():
-                if count > 0:
-                    report.append(f"- {category}: {count} errors")
+            report.extend(
+                f"- {category}: {count} errors"
+                for category, count in metrics.get("errors_by_category", {}).items()
+                if count > 0
+            )
 
-        return "\n".join(report)
+        return report
 
     def _format_top_errors(self, top_errors: list[dict[str, Any]], limit: int) -> str:
         """Format top error categories."""
+        return "\n".join(self._top_error_lines(top_errors))
+
+    def _top_error_lines(self, top_errors: list[dict[str, Any]]) -> list[str]:
+        if not top_errors:
+            return ["# 📊 Top Error Categories", "", "No errors recorded."]
+
         report = [
             "# 📊 Top Error Categories",
             "",
+            f"Showing top {len(top_errors)} error categories:",
+            "",
         ]
 
-        if not top_errors:
-            report.append("No errors recorded.")
-            return "\n".join(report)
-
-        report.append(f"Showing top {len(top_errors)} error categories:")
-        report.append("")
-
         for i, err in enumerate(top_errors, 1):
             category = err.get("category", "unknown")
             count = err.get("count", 0)
             recovery = err.get("recovery_rate", 0.0) * 100
 
-            recovery_status = "✅" if recovery > 80 else "⚠️" if recovery > 50 else "❌"
+            recovery_status = _recovery_tag(recovery)
 
             report.append(
                 f"{i}. **{category}** ({count} errors, {recovery:.0f}% recovery) {recovery_status}"
             )
 
-        report.append("")
-        report.append(
-            "Recovery rate indicates how often the system automatically recovers from this error type."
-        )
-        report.append("- ✅ >80%: Good automatic recovery")
-        report.append("- ⚠️ 50-80%: Partial recovery, some manual intervention needed")
-        report.append("- ❌ <50%: Poor recovery, needs investigation")
-
-        return "\n".join(report)
+        report.extend(_RECOVERY_LEGEND)
+        return report
 
     def _format_recent_errors(
         self, recent_errors: list[dict[str, Any]], minutes: int, limit: int
     ) -> str:
         """Format recent errors."""
-        report = [
-            f"# 🕐 Recent Errors (Last {minutes} minutes)",
-            "",
-        ]
+        return "\n".join(self._recent_error_lines(recent_errors, minutes, limit))
 
+    def _recent_error_lines(
+        self, recent_errors: list[dict[str, Any]], minutes: int, limit: int
+    ) -> list[str]:
+        header = f"# 🕐 Recent Errors (Last {minutes} minutes)"
         if not recent_errors:
-            report.append("No errors recorded in this time window.")
-            return "\n".join(report)
-
-        report.append(f"Showing last {min(len(recent_errors), limit)} errors:")
-        report.append("")
+            return [header, "", "No errors recorded in this time window."]
 
-        from datetime import datetime
+        report = [header, "", f"Showing last {min(len(recent_errors), limit)} errors:", ""]
 
-        for i, err in enumerate(recent_errors[:limit], 1):
+        for i, err in enumerate(islice(recent_errors, limit), 1):
             timestamp = err.get("timestamp", 0)
             if timestamp:
                 ts = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
@@ -209,40 +232,35 @@ class HealthCheckTool:
             report.append(f"{i}. {severity_emoji} [{ts}] {category}{tool_info}")
             report.append(f"   {message}")
 
-        return "\n".join(report)
-
-    def _format_full_report(self, logger: ErrorLogger, limit: int, minutes: int) -> str:
-        """Format full health report."""
-        sections = []
-
-        # Summary
-        sections.append(self._format_summary(logger.get_metrics()))
+        return report
 
-        # Top errors
-        sections.append("")
-        sections.append(self._format_top_errors(logger.get_top_errors(limit), limit))
-
-        # Recent errors
-        sections.append("")
-        sections.append(
-            self._format_recent_errors(logger.get_recent_errors(minutes), minutes, limit)
+    def _format_full_report(
+        self,
+        metrics: dict[str, Any],
+        top_errors: list[dict[str, Any]],
+        recent_errors: list[dict[str, Any]],
+        minutes: int,
+        limit: int,
+    ) -> str:
+        """Format full health report (summary, top errors, recent errors) in one join."""
+        return "\n".join(
+            [
+                *self._summary_lines(metrics),
+                "",
+                *self._top_error_lines(top_errors),
+                "",
+                *self._recent_error_lines(recent_errors, minutes, limit),
+            ]
         )
 
-        return "\n".join(sections)
-
 
 def format_health_summary(metrics: dict[str, Any]) -> str:
     """Convenience function to format health metrics."""
-    total_errors = metrics.get("total_errors", 0)
-    errors_last_hour = metrics.get("errors_last_hour", 0)
-
-    if errors_last_hour == 0:
-        status = "✅ Healthy"
-    elif errors_last_hour < 5:
-        status = "✅ Good"
-    elif errors_last_hour < 20:
-        status = "⚠️ Warning"
-    else:
-        status = "❌ Critical"
+    return _fmt_health(metrics.get("total_errors", 0), metrics.get("errors_last_hour", 0))
+
 
+@lru_cache(maxsize=256)
+def _fmt_health(total_errors: int, errors_last_hour: int) -> str:
+    """Format the one-line summary; cached since scrapers repeat unchanged counters."""
+    status, _ = _status_tier(errors_last_hour)
     return f"{status} | {errors_last_hour} errors/hour | {total_errors} total"
@@ -1,11 +1,30 @@
 """Memory search tool for querying past conversations."""
 
 import re
-from datetime import datetime, timedelta
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
 
+_LAST_N_DAYS_RE = re.compile(r"last_(\d+)_days?")
+
+# Literal time ranges mapped to the first day of the period
+_PERIOD_STARTS: dict[str, Callable[[date], date]] = {
+    "today": lambda d: d,
+    "this_week": lambda d: d - timedelta(days=d.weekday()),
+    "this_month": lambda d: d.replace(day=1),
+}
+
+
+@lru_cache(maxsize=8)
+def _anchor(kind: str, bucket: int) -> str:
+    """Start of today/this week/this month as ISO; ``bucket`` is the current minute."""
+    start = _PERIOD_STARTS[kind](date.today())
+    return datetime.combine(start, datetime.min.time()).isoformat()
+
 
 def _parse_time_range(time_range: str) -> tuple[str | None, str | None]:
     """Parse a time_range string into (after, before) ISO date strings.
@@ -15,31 +34,35 @@ def _parse_time_range(time_range: str) -> tuple[str | None, str | None]:
     Returns:
         Tuple of (after_iso, before_iso). before is always None (up to now).
     """
-    now = datetime.now()
     lower = time_range.strip().lower()
 
-    if lower == "today":
-        after = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        return after.isoformat(), None
-
-    if lower == "this_week":
-        start = now - timedelta(days=now.weekday())
-        after = start.replace(hour=0, minute=0, second=0, microsecond=0)
-        return after.isoformat(), None
+    if lower in _PERIOD_STARTS:
+        return _anchor(lower, int(time.time()) // 60), None
 
-    if lower == "this_month":
-        after = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        return after.isoformat(), None
-
-    match = re.match(r"last_(\d+)_days?", lower)
+    match = _LAST_N_DAYS_RE.match(lower)
     if match:
-        days = int(match.group(1))
-        after = now - timedelta(days=days)
+        after = datetime.now() - timedelta(days=int(match.group(1)))
         return after.isoformat(), None
 
     return None, None
 
 
+def _format_result(index: int, result: dict[str, Any]) -> str:
+    """Format one search hit as a text block (ending in a newline)."""
+    text = result.get("text", "")
+    metadata = result.get("metadata", {})
+    created_at = result.get("created_at", "")
+    date = f"Date: {created_at[:10]}\n" if created_at else ""
+    content = text if len(text) <= 500 else f"{text[:500]}..."
+    return (
+        f"--- Memory {index} (similarity: {result.get('similarity', 0):.2f}) ---\n"
+        f"Type: {metadata.get('type', 'conversation')}\n"
+        f"Session: {metadata.get('session_key', 'unknown')}\n"
+        f"{date}"
+        f"Content: {content}\n"
+    )
+
+
 class MemorySearchTool(Tool):
     """
     Search semantic memory from past conversations.
@@ -48,6 +71,8 @@ class MemorySearchTool(Tool):
     including facts, decisions, and conversation context.
     """
 
+    parallel_safe = True
+
     def __init__(self, vector_store: Any):
         """
         Initialize the memory search tool.
@@ -128,20 +153,18 @@ class MemorySearchTool(Tool):
             if time_range:
                 after, before = _parse_time_range(time_range)
 
+            # The type filter runs in the store, so top_k counts only matching entries
+            metadata_filter = (
+                {"type": type_filter} if type_filter and type_filter != "all" else None
+            )
             results = await self._vector_store.search(
                 query=query,
                 top_k=limit,
                 after=after,
                 before=before,
+                metadata_filter=metadata_filter,
             )
 
-            if not results:
-                return f"No memories found matching: {query}"
-
-            # Apply type filter on results if specified
-            if type_filter and type_filter != "all":
-                results = [r for r in results if r.get("metadata", {}).get("type") == type_filter]
-
             if not results:
                 filters = []
                 if time_range:
@@ -151,28 +174,8 @@ class MemorySearchTool(Tool):
                 filter_str = f" (filters: {', '.join(filters)})" if filters else ""
                 return f"No memories found matching: {query}{filter_str}"
 
-            # Format results
-            output = [f"Found {len(results)} relevant memories:\n"]
-
-            for i, result in enumerate(results, 1):
-                similarity = result.get("similarity", 0)
-                text = result.get("text", "")
-                metadata = result.get("metadata", {})
-                created_at = result.get("created_at", "")
-
-                # Format metadata
-                session_key = metadata.get("session_key", "unknown")
-                entry_type = metadata.get("type", "conversation")
-
-                output.append(f"--- Memory {i} (similarity: {similarity:.2f}) ---")
-                output.append(f"Type: {entry_type}")
-                output.append(f"Session: {session_key}")
-                if created_at:
-                    output.append(f"Date: {created_at[:10]}")
-                output.append(f"Content: {text[:500]}{'...' if len(text) > 500 else ''}")
-                output.append("")
-
-            return "\n".join(output)
+            body = "\n".join(_format_result(i, r) for i, r in enumerate(results, 1))
+            return f"Found {len(results)} relevant memories:\n\n{body}"
 
         except Exception as e:
             return f"Error searching memory: {e}"
@@ -1,9 +1,14 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
 
 from nanobot.agent.tools.base import Tool
 
+if TYPE_CHECKING:
+    from nanobot.providers.base import ToolCallRequest
+
 
 class ToolRegistry:
     """
@@ -18,14 +23,30 @@ class ToolRegistry:
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
+        replacing = tool.name in self._tools
         self._tools[tool.name] = tool
-        self._definitions_cache = None  # Invalidate cache
+        if self._definitions_cache is None or replacing:
+            self._definitions_cache = None  # Invalidate cache
+        else:
+            # New tools go last, matching dict order; build a new list since copies share it
+            self._definitions_cache = [*self._definitions_cache, tool.to_schema()]
 
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
         self._definitions_cache = None  # Invalidate cache
 
+    def copy(self) -> "ToolRegistry":
+        """
+        Shallow copy that shares tool instances and cached definitions.
+
+        Tools registered on the copy do not affect the original.
+        """
+        clone = ToolRegistry()
+        clone._tools = dict(self._tools)
+        clone._definitions_cache = self._definitions_cache
+        return clone
+
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
         return self._tools.get(name)
@@ -68,6 +89,48 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
 
+    async def run_calls(
+        self,
+        calls: list["ToolCallRequest"],
+        run_one: Callable[["ToolCallRequest"], Awaitable[str]],
+    ) -> list[str | BaseException]:
+        """
+        Execute tool calls, overlapping consecutive parallel-safe ones.
+
+        Adjacent calls to read-only tools (``Tool.parallel_safe``) are gathered
+        concurrently; every other call runs on its own, in order, so side
+        effects happen in the sequence the model requested.
+
+        Args:
+            calls: Tool calls in the order the model emitted them.
+            run_one: Coroutine function executing a single call.
+
+        Returns:
+            Results aligned with ``calls``; failures are returned as exceptions.
+        """
+        results: list[str | BaseException] = []
+        batch: list["ToolCallRequest"] = []
+
+        async def _flush() -> None:
+            if batch:
+                results.extend(
+                    await asyncio.gather(*[run_one(tc) for tc in batch], return_exceptions=True)
+                )
+                batch.clear()
+
+        for call in calls:
+            tool = self._tools.get(call.name)
+            if tool is not None and tool.parallel_safe:
+                batch.append(call)
+                continue
+            await _flush()
+            try:
+                results.append(await run_one(call))
+            except Exception as e:
+                results.append(e)
+        await _flush()
+        return results
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -8,6 +8,33 @@ from typing import Any
 
 from nanobot.agent.tools.base import Tool
 
+# Absolute paths in a command, checked when restricted to the workspace
+_WIN_PATH_RE = re.compile(r"[A-Za-z]:\\[^\\\"']+")
+_POSIX_PATH_RE = re.compile(r"/[^\s\"']+")
+
+
+# Output kept per stream and in the final result; the rest is drained and counted
+_MAX_OUTPUT = 10000
+
+
+async def _drain(stream: asyncio.StreamReader, limit: int) -> tuple[bytes, int]:
+    """Read a stream to EOF, keeping at most ``limit`` bytes; returns (kept, dropped)."""
+    buf = bytearray()
+    dropped = 0
+    while chunk := await stream.read(65536):
+        room = limit - len(buf)
+        if room > 0:
+            buf += chunk[:room]
+        dropped += max(len(chunk) - max(room, 0), 0)
+    return bytes(buf), dropped
+
+
+def _combine(patterns: list[str]) -> re.Pattern[str] | None:
+    """Fuse patterns into one case-insensitive alternation so a command is scanned once."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
 
 class ExecTool(Tool):
     """Tool to execute shell commands."""
@@ -34,6 +61,11 @@ class ExecTool(Tool):
         ]
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
+        # Compiled once; the guard runs on every command
+        self._deny_re = _combine(self.deny_patterns)
+        self._allow_re = _combine(self.allow_patterns)
+        # Resolved working directories; commands usually share one cwd
+        self._resolved_cwds: dict[str, Path] = {}
 
     @property
     def name(self) -> str:
@@ -71,8 +103,18 @@ class ExecTool(Tool):
                 cwd=cwd,
             )
 
+            async def _collect() -> tuple[tuple[bytes, int], tuple[bytes, int]]:
+                # Keep draining past the cap so the child never blocks on a full pipe
+                out, err = await asyncio.gather(
+                    _drain(process.stdout, _MAX_OUTPUT), _drain(process.stderr, _MAX_OUTPUT)
+                )
+                await process.wait()
+                return out, err
+
             try:
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+                (stdout, out_dropped), (stderr, err_dropped) = await asyncio.wait_for(
+                    _collect(), timeout=self.timeout
+                )
             except asyncio.TimeoutError:
                 process.kill()
                 return f"Error: Command timed out after {self.timeout} seconds"
@@ -93,9 +135,10 @@ class ExecTool(Tool):
             result = "\n".join(output_parts) if output_parts else "(no output)"
 
             # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
+            dropped = out_dropped + err_dropped
+            if len(result) > _MAX_OUTPUT or dropped:
+                more = max(len(result) - _MAX_OUTPUT, 0) + dropped
+                result = result[:_MAX_OUTPUT] + f"\n... (truncated, {more} more chars)"
 
             return result
 
@@ -105,24 +148,27 @@ class ExecTool(Tool):
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
-        lower = cmd.lower()
 
-        for pattern in self.deny_patterns:
-            if re.search(pattern, lower):
-                return "Error: Command blocked by safety guard (dangerous pattern detected)"
+        if self._deny_re and self._deny_re.search(cmd):
+            return "Error: Command blocked by safety guard (dangerous pattern detected)"
 
-        if self.allow_patterns:
-            if not any(re.search(p, lower) for p in self.allow_patterns):
-                return "Error: Command blocked by safety guard (not in allowlist)"
+        if self._allow_re and not self._allow_re.search(cmd):
+            return "Error: Command blocked by safety guard (not in allowlist)"
 
         if self.restrict_to_workspace:
+            # Traversal and absolute paths all need a separator; most commands have none
+            if "/" not in cmd and "\\" not in cmd:
+                return None
+
             if "..\\" in cmd or "../" in cmd:
                 return "Error: Command blocked by safety guard (path traversal detected)"
 
-            cwd_path = Path(cwd).resolve()
+            cwd_path = self._resolved_cwds.get(cwd)
+            if cwd_path is None:
+                cwd_path = self._resolved_cwds[cwd] = Path(cwd).resolve()
 
-            win_paths = re.findall(r"[A-Za-z]:\\[^\\\"']+", cmd)
-            posix_paths = re.findall(r"/[^\s\"']+", cmd)
+            win_paths = _WIN_PATH_RE.findall(cmd)
+            posix_paths = _POSIX_PATH_RE.findall(cmd)
 
             for raw in win_paths + posix_paths:
                 try:
@@ -25,13 +25,12 @@ class SpawnTool(Tool):
     ):
         self._manager = manager
         self._registry = registry
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
+        # (channel, chat_id) that subagent results are announced to
+        self._origin: tuple[str, str] = ("cli", "direct")
 
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
+        self._origin = (channel, chat_id)
 
     @property
     def name(self) -> str:
@@ -68,8 +67,8 @@ class SpawnTool(Tool):
 
         # If registry is enabled, create a task before spawning
         if self._registry:
+            registry_task_id = uuid.uuid4().hex[:8]
             try:
-                registry_task_id = str(uuid.uuid4())[:8]
                 await self._registry.create_task(
                     task_id=registry_task_id,
                     description=task[:500],
@@ -79,10 +78,11 @@ class SpawnTool(Tool):
             except Exception:
                 registry_task_id = None  # Fall back to non-registry spawn
 
+        origin_channel, origin_chat_id = self._origin
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=origin_channel,
+            origin_chat_id=origin_chat_id,
             registry_task_id=registry_task_id,
         )
@@ -33,3 +33,4 @@ class ProgressEvent:
 
 
 ProgressCallback = Callable[[ProgressEvent], Awaitable[None]]
+ProgressBatchCallback = Callable[[list[ProgressEvent]], Awaitable[None]]
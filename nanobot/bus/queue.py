@@ -32,6 +32,12 @@ class MessageBus:
         """Publish a message from a channel to the agent."""
         await self.inbound.put(msg)
 
+    async def publish_inbound_batch(self, msgs: list[InboundMessage]) -> None:
+        """Publish several messages in order with a single await."""
+        # The inbound queue is unbounded, so put_nowait never blocks
+        for msg in msgs:
+            self.inbound.put_nowait(msg)
+
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
@@ -67,6 +73,11 @@ class MessageBus:
             except Exception as e:
                 logger.error(f"Error in progress subscriber: {e}")
 
+    async def publish_progress_batch(self, events: list["ProgressEvent"]) -> None:
+        """Publish several progress events in order with a single await."""
+        for event in events:
+            await self.publish_progress(event)
+
     async def dispatch_outbound(self) -> None:
         """
         Dispatch outbound messages to subscribed channels.
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
+from nanobot.bus.progress import ProgressKind
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.utils import fastjson
 
 if TYPE_CHECKING:
     from starlette.websockets import WebSocket
@@ -18,6 +21,9 @@ if TYPE_CHECKING:
 
 _TOOL_MARKUP_RE = re.compile(r"<\|tool_calls_section_begin\|>.*", re.DOTALL)
 
+# Upper bound on queued frames coalesced into one WebSocket write
+_MAX_FRAMES_PER_WRITE = 256
+
 
 def _strip_tool_markup(text: str | None) -> str | None:
     """Remove tool-call markup from assistant text."""
@@ -35,6 +41,8 @@ class WebChannel(BaseChannel):
     def __init__(self, config: Any, bus: MessageBus):
         super().__init__(config, bus)
         self._connections: dict[str, Any] = {}
+        self._outboxes: dict[str, asyncio.Queue[dict[str, Any]]] = {}
+        self._writers: dict[str, asyncio.Task] = {}
 
     async def start(self) -> None:
         """Start the web channel (managed by FastAPI lifecycle)."""
@@ -44,30 +52,63 @@ class WebChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the web channel."""
         self._running = False
-        self._connections.clear()
+        for session_id in list(self._connections):
+            self.unregister(session_id)
         logger.info("Web channel stopped")
 
     def register(self, session_id: str, ws: "WebSocket") -> None:
-        """Register a WebSocket connection for a session."""
+        """Register a WebSocket connection for a session and start its writer."""
+        self.unregister(session_id)
+        outbox: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
         self._connections[session_id] = ws
+        self._outboxes[session_id] = outbox
+        self._writers[session_id] = asyncio.create_task(self._write_loop(session_id, ws, outbox))
 
     def unregister(self, session_id: str) -> None:
-        """Remove a WebSocket connection."""
+        """Remove a WebSocket connection and stop its writer."""
         self._connections.pop(session_id, None)
+        self._outboxes.pop(session_id, None)
+        writer = self._writers.pop(session_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    def _enqueue(self, session_id: str, frame: dict[str, Any]) -> bool:
+        outbox = self._outboxes.get(session_id)
+        if outbox is None:
+            return False
+        outbox.put_nowait(frame)
+        return True
+
+    async def _write_loop(
+        self, session_id: str, ws: "WebSocket", outbox: asyncio.Queue[dict[str, Any]]
+    ) -> None:
+        """
+        Deliver queued frames for one connection.
+
+        Frames that pile up while a write is in flight go out together as one
+        JSON array; a streaming update is dropped when a later one in the same
+        write supersedes it (each carries the full text so far).
+        """
+        while True:
+            frames = [await outbox.get()]
+            while not outbox.empty() and len(frames) < _MAX_FRAMES_PER_WRITE:
+                frames.append(outbox.get_nowait())
+            if len(frames) > 1:
+                frames = _drop_superseded(frames)
+            try:
+                await ws.send_text(fastjson.dumps(frames[0] if len(frames) == 1 else frames))
+            except Exception as e:
+                logger.debug(f"WebSocket send failed for {session_id}: {e}")
+                if self._connections.get(session_id) is ws:
+                    self.unregister(session_id)
+                return
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message to a web client via WebSocket."""
         content = _strip_tool_markup(msg.content)
         if not content:
             return
-        ws = self._connections.get(msg.chat_id)
-        if ws:
-            try:
-                await ws.send_json({"type": "message", "content": content})
-            except Exception as e:
-                logger.debug(f"WebSocket send failed for {msg.chat_id}: {e}")
-                self.unregister(msg.chat_id)
-        else:
+        if not self._enqueue(msg.chat_id, {"type": "message", "content": content}):
             logger.debug(f"Web message to {msg.chat_id}: no active connection")
 
     async def on_progress(self, event: "ProgressEvent") -> None:
@@ -76,16 +117,25 @@ class WebChannel(BaseChannel):
         if detail is None and event.detail:
             # Markup stripping emptied the content — skip this event
             return
-        ws = self._connections.get(event.chat_id)
-        if ws:
-            try:
-                await ws.send_json(
-                    {
-                        "type": "progress",
-                        "kind": event.kind,
-                        "detail": detail,
-                        "tool_name": event.tool_name,
-                    }
-                )
-            except Exception:
-                pass
+        self._enqueue(
+            event.chat_id,
+            {
+                "type": "progress",
+                "kind": event.kind.value,
+                "detail": detail,
+                "tool_name": event.tool_name,
+            },
+        )
+
+
+def _is_streaming(frame: dict[str, Any]) -> bool:
+    return frame.get("type") == "progress" and frame.get("kind") == ProgressKind.STREAMING.value
+
+
+def _drop_superseded(frames: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Keep only the last of each run of consecutive streaming updates."""
+    return [
+        frame
+        for i, frame in enumerate(frames)
+        if not (_is_streaming(frame) and i + 1 < len(frames) and _is_streaming(frames[i + 1]))
+    ]
@@ -34,6 +34,16 @@ def main(
     pass
 
 
+def _use_uvloop() -> None:
+    """Run asyncio on uvloop when it is installed (``pip install nanobot-ai[speedups]``)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+
+
 # ============================================================================
 # Onboard / Setup
 # ============================================================================
@@ -248,6 +258,8 @@ def gateway(
         streaming_config=config.agents.defaults.streaming,
         tracing_config=config.agents.defaults.tracing,
         guardrail_config=config.agents.defaults.guardrails,
+        semantic_cache_config=config.agents.defaults.semantic_cache,
+        subagent_config=config.agents.defaults.subagents,
         temperature=config.agents.defaults.temperature,
         tool_temperature=config.agents.defaults.tool_temperature,
         timezone=config.agents.defaults.timezone,
@@ -473,6 +485,7 @@ def gateway(
             agent.stop()
             await channels.stop_all()
 
+    _use_uvloop()
     asyncio.run(run())
 
 
@@ -588,6 +601,7 @@ def agent(
         streaming_config=config.agents.defaults.streaming,
         tracing_config=config.agents.defaults.tracing,
         guardrail_config=config.agents.defaults.guardrails,
+        subagent_config=config.agents.defaults.subagents,
     )
 
     if message:
@@ -916,10 +930,12 @@ def _get_memory_components() -> (
     resolver = ProviderResolver(config.providers, config.agents.defaults.provider)
     embed_key, embed_base = resolver.resolve(mem.embedding_provider)
 
+    cache_path = Path(mem.embedding_cache_path).expanduser() if mem.embedding_cache_path else None
     embedding_service = EmbeddingService(
         model=mem.embedding_model,
         api_key=embed_key,
         api_base=embed_base,
+        cache_path=cache_path,
     )
     vector_store = VectorStore(
         db_path=mem.db_path,
@@ -148,6 +148,10 @@ class MemoryConfig(BaseModel):
     enable_proactive: bool = Field(default=False, alias="enableProactive")
     deterministic_recall: bool = Field(default=True, alias="deterministicRecall")
     entities_db_path: str = Field(default="~/.nanobot/memory/entities.db", alias="entitiesDbPath")
+    # Empty string disables the on-disk embedding cache
+    embedding_cache_path: str = Field(
+        default="~/.nanobot/embed_cache.db", alias="embeddingCachePath"
+    )
 
 
 class MemoryExtractionConfig(BaseModel):
@@ -168,6 +172,34 @@ class MemoryExtractionConfig(BaseModel):
     candidate_threshold: float = Field(default=0.7, alias="candidateThreshold")
 
 
+class SemanticCacheConfig(BaseModel):
+    """Semantic response cache for near-duplicate user turns."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    enabled: bool = False
+    threshold: float = 0.9  # Minimum cosine similarity for a hit
+    ttl_s: int = Field(default=3600, alias="ttlS")
+    max_entries: int = Field(default=200, alias="maxEntries")  # Per session
+    db_path: str = Field(default="~/.nanobot/data/response_cache.db", alias="dbPath")
+    # Subagent announces: reuse the reply to a near-identical recent announce
+    announce_threshold: float = Field(default=0.95, alias="announceThreshold")
+    announce_window: int = Field(default=16, alias="announceWindow")  # Per session
+    # Subagents: reuse the result of an identical task on an unchanged workspace
+    plan_cache: bool = Field(default=False, alias="planCache")
+    plan_cache_ttl_s: int = Field(default=7 * 24 * 3600, alias="planCacheTtlS")
+    plan_cache_max_bytes: int = Field(default=100 * 1024 * 1024, alias="planCacheMaxBytes")
+
+
+class SubagentConfig(BaseModel):
+    """Background subagent configuration."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    # Subagents running at once; further spawns queue (None = unlimited)
+    max_concurrent: int | None = Field(default=None, ge=1, alias="maxConcurrent")
+
+
 class StreamingConfig(BaseModel):
     """Streaming response configuration."""
 
@@ -176,6 +208,7 @@ class StreamingConfig(BaseModel):
     enabled: bool = True
     edit_interval_ms: int = Field(default=1500, alias="editIntervalMs")
     min_chunk_chars: int = Field(default=50, alias="minChunkChars")
+    early_tool_dispatch: bool = Field(default=False, alias="earlyToolDispatch")
 
 
 class RetryConfig(BaseModel):
@@ -290,6 +323,10 @@ class AgentDefaults(BaseModel):
         default_factory=MemoryExtractionConfig, alias="memoryExtraction"
     )
     streaming: StreamingConfig = Field(default_factory=StreamingConfig)
+    subagents: SubagentConfig = Field(default_factory=SubagentConfig)
+    semantic_cache: SemanticCacheConfig = Field(
+        default_factory=SemanticCacheConfig, alias="semanticCache"
+    )
     retry: RetryConfig = Field(default_factory=RetryConfig)
     tracing: TracingConfig = Field(default_factory=TracingConfig)
     guardrails: GuardrailConfig = Field(default_factory=GuardrailConfig)
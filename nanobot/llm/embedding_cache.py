@@ -0,0 +1,90 @@
+"""Content-addressed embedding cache: skip re-embedding text that was seen before."""
+
+import hashlib
+import os
+import sqlite3
+import struct
+from collections import OrderedDict
+from pathlib import Path
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed store of embedding vectors keyed by ``sha256(model, text)``.
+
+    Vectors are stored as packed float16 (2 bytes per dimension); the
+    rounding error is far below what cosine-similarity thresholds resolve.
+    A small in-process LRU sits in front of the database so hot texts
+    (repeated queries) never touch disk.
+    """
+
+    def __init__(self, db_path: Path, hot_size: int = 1024):
+        self.hot_size = hot_size
+        self._hot: OrderedDict[bytes, list[float]] = OrderedDict()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Memory-store services call in from a (single) worker thread
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_f16 (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+        # Cached vectors can be inverted back towards memory text; keep them owner-only
+        try:
+            os.chmod(db_path, 0o600)
+        except OSError:
+            pass
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Cache key for a text embedded by ``model``."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        """Return cached vectors for the keys that are present."""
+        found: dict[bytes, list[float]] = {}
+        cold: list[bytes] = []
+        for k in keys:
+            vec = self._hot.get(k)
+            if vec is None:
+                cold.append(k)
+            else:
+                self._hot.move_to_end(k)
+                found[k] = vec
+
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(cold), 500):
+            chunk = cold[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT hash, vec FROM embeddings_f16 WHERE hash IN ({placeholders})", chunk
+            ).fetchall()
+            for k, blob in rows:
+                vec = list(struct.unpack(f"{len(blob) // 2}e", blob))
+                found[k] = vec
+                self._remember(k, vec)
+        return found
+
+    def put_many(self, items: list[tuple[bytes, list[float]]]) -> None:
+        """Store freshly computed vectors."""
+        if not items:
+            return
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings_f16 (hash, vec) VALUES (?, ?)",
+            [(k, struct.pack(f"{len(vec)}e", *vec)) for k, vec in items],
+        )
+        self._db.commit()
+        for k, vec in items:
+            self._remember(k, vec)
+
+    def _remember(self, k: bytes, vec: list[float]) -> None:
+        self._hot[k] = vec
+        self._hot.move_to_end(k)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def close(self) -> None:
+        """Close database connection."""
+        self._db.close()
@@ -2,11 +2,39 @@
 
 import asyncio
 import os
+import random
+from collections import OrderedDict
+from pathlib import Path
 from typing import Any
 
 import litellm
 from loguru import logger
 
+from nanobot.llm.embedding_cache import EmbeddingCache
+
+# Provider errors worth retrying; anything else (bad request, auth) fails fast
+_TRANSIENT_ERRORS = (
+    litellm.RateLimitError,
+    litellm.APIConnectionError,
+    litellm.Timeout,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError,
+)
+_MAX_RETRIES = 4
+_BACKOFF_BASE_S = 0.5
+_BACKOFF_CAP_S = 8.0
+
+
+def _retry_after(error: Exception) -> float:
+    """Seconds the provider asked us to wait (Retry-After header), or 0."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return 0.0
+    try:
+        return max(float(headers.get("retry-after") or headers.get("Retry-After") or 0), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
 
 class EmbeddingService:
     """
@@ -20,6 +48,9 @@ class EmbeddingService:
         model: str = "openai/text-embedding-3-small",
         api_key: str | None = None,
         api_base: str | None = None,
+        cache_path: Path | None = None,
+        batch_size: int = 96,
+        max_concurrency: int = 8,
     ):
         """
         Initialize the embedding service.
@@ -28,10 +59,19 @@ class EmbeddingService:
             model: Embedding model to use.
             api_key: API key for the provider.
             api_base: Optional API base URL.
+            cache_path: Optional SQLite file for caching vectors across runs.
+            batch_size: Maximum texts per provider request.
+            max_concurrency: Maximum provider requests in flight at once.
         """
         self.model = model
         self.api_key = api_key
         self.api_base = api_base
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self._cache = EmbeddingCache(cache_path) if cache_path else None
+        # Hot query vectors for embed_single; search queries repeat heavily
+        self._query_lru: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._query_lru_size = 512
 
         # Detect OpenRouter
         self.is_openrouter = (api_key and api_key.startswith("sk-or-")) or (
@@ -57,7 +97,42 @@ class EmbeddingService:
         """
         if not texts:
             return []
-
+        if self._cache is None:
+            return await self._embed_uncached(texts)
+
+        # Serve repeated texts from the cache; only misses go to the provider
+        keys = [EmbeddingCache.key(self.model, t) for t in texts]
+        cached = self._cache.get_many(keys)
+        misses = [i for i, k in enumerate(keys) if k not in cached]
+        if misses:
+            fresh = await self._embed_uncached([texts[i] for i in misses])
+            self._cache.put_many([(keys[i], vec) for i, vec in zip(misses, fresh)])
+            cached.update((keys[i], vec) for i, vec in zip(misses, fresh))
+        return [cached[k] for k in keys]
+
+    async def _embed_uncached(self, texts: list[str]) -> list[list[float]]:
+        """Request embeddings from the provider in concurrent mini-batches."""
+        if len(texts) <= self.batch_size:
+            return await self._embed_batch(texts)
+
+        # Length-sorted shards keep each request homogeneous
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        shards = [order[i : i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(shard: list[int]) -> list[list[float]]:
+            async with sem:
+                return await self._embed_batch([texts[i] for i in shard])
+
+        results = await asyncio.gather(*(_run(shard) for shard in shards))
+        embeddings: list[list[float]] = [[] for _ in texts]
+        for shard, vectors in zip(shards, results):
+            for i, vec in zip(shard, vectors):
+                embeddings[i] = vec
+        return embeddings
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Request one batch of embeddings, retrying transient failures."""
         # Format model name for LiteLLM
         model = self.model
         if self.is_openrouter and not model.startswith("openrouter/"):
@@ -71,11 +146,11 @@ class EmbeddingService:
         if self.api_base:
             kwargs["api_base"] = self.api_base
 
-        max_retries = 2
-        backoff_seconds = [1, 2]
         last_error: Exception | None = None
+        attempts = 0
 
-        for attempt in range(max_retries + 1):
+        for attempt in range(_MAX_RETRIES + 1):
+            attempts = attempt + 1
             try:
                 response = await litellm.aembedding(**kwargs)
 
@@ -86,20 +161,25 @@ class EmbeddingService:
 
                 return embeddings
 
-            except Exception as e:
+            except _TRANSIENT_ERRORS as e:
                 last_error = e
-                if attempt < max_retries:
-                    wait = backoff_seconds[attempt]
+                if attempt < _MAX_RETRIES:
+                    # Full jitter so concurrent callers do not retry in lockstep
+                    ceiling = min(_BACKOFF_CAP_S, _BACKOFF_BASE_S * 2**attempt)
+                    wait = max(random.uniform(0, ceiling), _retry_after(e))
                     logger.warning(
                         f"Embedding attempt {attempt + 1} failed "
                         f"(model={model}, input_count={len(texts)}), "
-                        f"retrying in {wait}s"
+                        f"retrying in {wait:.1f}s"
                     )
                     await asyncio.sleep(wait)
+            except Exception as e:
+                last_error = e
+                break
 
         total_chars = sum(len(t) for t in texts)
         logger.error(
-            f"Embedding failed after {max_retries + 1} attempts: "
+            f"Embedding failed after {attempts} attempts: "
             f"model={model}, input_count={len(texts)}, "
             f"total_chars={total_chars}, error={last_error}"
         )
@@ -115,5 +195,16 @@ class EmbeddingService:
         Returns:
             Embedding vector.
         """
+        key = (self.model, text)
+        cached = self._query_lru.get(key)
+        if cached is not None:
+            self._query_lru.move_to_end(key)
+            return cached
+
         embeddings = await self.embed([text])
-        return embeddings[0] if embeddings else []
+        if not embeddings:
+            return []
+        self._query_lru[key] = embeddings[0]
+        if len(self._query_lru) > self._query_lru_size:
+            self._query_lru.popitem(last=False)
+        return embeddings[0]
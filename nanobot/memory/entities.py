@@ -1,18 +1,48 @@
 """Lightweight entity-based knowledge graph backed by SQLite."""
 
-import json
 import os
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
+from nanobot.utils import fastjson
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Per-connection tuning; safe with WAL (commits skip the extra fsync)."""
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA busy_timeout = 30000")
+    conn.execute("PRAGMA foreign_keys = ON")
+
 
 class EntityStore:
     """Lightweight knowledge graph for entity relationships."""
 
+    # Insert, or update type and merge attributes in SQL (no Python round-trip)
+    _UPSERT_SQL = (
+        "INSERT INTO entities (name, type, attributes, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET type = excluded.type, "
+        "attributes = json_patch(COALESCE(attributes, '{}'), excluded.attributes), "
+        "updated_at = excluded.updated_at"
+    )
+    # Get-or-create by name; the no-op update makes RETURNING yield existing ids
+    _ENSURE_SQL = (
+        "INSERT INTO entities (name, type, attributes, created_at, updated_at) "
+        "VALUES (?, 'unknown', '{}', ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET updated_at = updated_at "
+        "RETURNING id"
+    )
+
     def __init__(self, db_path: str | Path):
         """
         Initialize the entity store.
@@ -23,11 +53,18 @@ class EntityStore:
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        # One long-lived connection; the lock serializes callers across threads
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = sqlite3.connect(
+            self.db_path, check_same_thread=False
+        )
+        _apply_pragmas(self._conn)
 
     def _init_db(self) -> None:
         """Create entities and relations tables."""
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("PRAGMA journal_mode=WAL")
+            _apply_pragmas(conn)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS entities (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -64,8 +101,10 @@ class EntityStore:
                 CREATE INDEX IF NOT EXISTS idx_relation_target
                 ON relations(target_id)
             """)
-            conn.execute("PRAGMA foreign_keys = ON")
+            self._has_fts = self._init_fts(conn)
             conn.commit()
+            # Refresh planner statistics once per process start
+            conn.execute("PRAGMA optimize")
 
         # Set file permissions to owner-only
         try:
@@ -73,11 +112,59 @@ class EntityStore:
         except OSError:
             pass
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get a database connection with foreign keys enabled."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+    @staticmethod
+    def _init_fts(conn: sqlite3.Connection) -> bool:
+        """Mirror entity names into a trigram FTS5 index; False if FTS5 is unavailable."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entities_fts'"
+        ).fetchone()
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                    name, content='entities', content_rowid='id', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Entity name index unavailable, using LIKE scans: {e}")
+            return False
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN
+                INSERT INTO entities_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN
+                INSERT INTO entities_fts (entities_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE OF name ON entities BEGIN
+                INSERT INTO entities_fts (entities_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+                INSERT INTO entities_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        """)
+        if not exists:
+            # Index entities written before the FTS table existed
+            conn.execute("INSERT INTO entities_fts (entities_fts) VALUES ('rebuild')")
+        return True
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _get_conn(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection in a transaction (commit on success)."""
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("EntityStore is closed")
+            with self._conn:
+                yield self._conn
 
     def upsert_entity(
         self,
@@ -98,61 +185,16 @@ class EntityStore:
         """
         now = datetime.now().isoformat()
         with self._get_conn() as conn:
-            cursor = conn.execute(
-                "SELECT id, attributes FROM entities WHERE name = ?",
-                (name,),
-            )
-            row = cursor.fetchone()
-
-            if row:
-                entity_id, existing_json = row
-                existing = json.loads(existing_json) if existing_json else {}
-                if attributes:
-                    existing.update(attributes)
-                conn.execute(
-                    "UPDATE entities SET type = ?, attributes = ?, updated_at = ? WHERE id = ?",
-                    (
-                        entity_type,
-                        json.dumps(existing, ensure_ascii=False),
-                        now,
-                        entity_id,
-                    ),
-                )
-                conn.commit()
-                logger.debug(f"Updated entity: {name}")
-                return entity_id
-            else:
-                cursor = conn.execute(
-                    "INSERT INTO entities "
-                    "(name, type, attributes, created_at, updated_at) "
-                    "VALUES (?, ?, ?, ?, ?)",
-                    (
-                        name,
-                        entity_type,
-                        json.dumps(
-                            attributes or {},
-                            ensure_ascii=False,
-                        ),
-                        now,
-                        now,
-                    ),
-                )
-                conn.commit()
-                entity_id = cursor.lastrowid or 0
-                logger.debug(f"Created entity: {name} (id={entity_id})")
-                return entity_id
-
-    def _ensure_entity(self, name: str) -> int:
+            entity_id = conn.execute(
+                f"{self._UPSERT_SQL} RETURNING id",
+                (name, entity_type, fastjson.dumps(attributes or {}), now, now),
+            ).fetchone()[0]
+        logger.debug(f"Upserted entity: {name} (id={entity_id})")
+        return entity_id
+
+    def _ensure_entity(self, conn: sqlite3.Connection, name: str, now: str) -> int:
         """Get or create an entity by name. Returns entity ID."""
-        with self._get_conn() as conn:
-            cursor = conn.execute(
-                "SELECT id FROM entities WHERE name = ?",
-                (name,),
-            )
-            row = cursor.fetchone()
-            if row:
-                return row[0]
-        return self.upsert_entity(name, "unknown")
+        return conn.execute(self._ENSURE_SQL, (name, now, now)).fetchone()[0]
 
     def add_relation(self, source: str, relation: str, target: str) -> bool:
         """
@@ -168,10 +210,10 @@ class EntityStore:
         Returns:
             True if relation was added, False if it already exists.
         """
-        source_id = self._ensure_entity(source)
-        target_id = self._ensure_entity(target)
-
+        now = datetime.now().isoformat()
         with self._get_conn() as conn:
+            source_id = self._ensure_entity(conn, source, now)
+            target_id = self._ensure_entity(conn, target, now)
             try:
                 conn.execute(
                     "INSERT INTO relations "
@@ -181,16 +223,80 @@ class EntityStore:
                         source_id,
                         relation,
                         target_id,
-                        datetime.now().isoformat(),
+                        now,
                     ),
                 )
-                conn.commit()
                 logger.debug(f"Added relation: {source} --{relation}--> {target}")
                 return True
             except sqlite3.IntegrityError:
                 logger.debug(f"Relation already exists: {source} --{relation}--> {target}")
                 return False
 
+    def upsert_entities(self, rows: list[tuple[str, str, dict[str, Any] | None]]) -> None:
+        """
+        Insert or update many entities in one transaction.
+
+        Attributes are merged into existing ones with ``json_patch``.
+
+        Args:
+            rows: (name, entity_type, attributes) tuples.
+        """
+        if not rows:
+            return
+        now = datetime.now().isoformat()
+        with self._get_conn() as conn:
+            conn.executemany(
+                self._UPSERT_SQL,
+                [
+                    (name, etype, fastjson.dumps(attrs or {}), now, now)
+                    for name, etype, attrs in rows
+                ],
+            )
+        logger.debug(f"Upserted {len(rows)} entities")
+
+    def add_relations(self, rows: list[tuple[str, str, str]]) -> int:
+        """
+        Add many relations in one transaction.
+
+        Creates entities that do not exist yet.
+
+        Args:
+            rows: (source, relation, target) name tuples.
+
+        Returns:
+            Number of relations added (existing ones are skipped).
+        """
+        if not rows:
+            return 0
+        now = datetime.now().isoformat()
+        names = list({n for source, _, target in rows for n in (source, target)})
+        with self._get_conn() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO entities (name, type, attributes, created_at, updated_at) "
+                "VALUES (?, 'unknown', '{}', ?, ?)",
+                [(name, now, now) for name in names],
+            )
+            ids: dict[str, int] = {}
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(names), 500):
+                chunk = names[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for entity_id, name in conn.execute(
+                    f"SELECT id, name FROM entities WHERE name IN ({placeholders})", chunk
+                ):
+                    ids[name] = entity_id
+
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO relations "
+                "(source_id, relation, target_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(ids[source], relation, ids[target], now) for source, relation, target in rows],
+            )
+            added = conn.total_changes - before
+        logger.debug(f"Added {added} of {len(rows)} relations")
+        return added
+
     def query_entity(self, name: str) -> dict[str, Any] | None:
         """
         Get an entity with all its relations.
@@ -213,7 +319,7 @@ class EntityStore:
                 return None
 
             entity_id, ename, etype, attr_json, created, updated = row
-            attributes = json.loads(attr_json) if attr_json else {}
+            attributes = fastjson.loads(attr_json) if attr_json else {}
 
             relations = self._get_relations_for_id(conn, entity_id, ename)
 
@@ -232,49 +338,31 @@ class EntityStore:
         entity_id: int,
         entity_name: str,
     ) -> list[dict[str, str]]:
-        """Get all relations for an entity ID."""
-        relations: list[dict[str, str]] = []
-
-        # Outgoing relations
+        """Get all relations for an entity ID, outgoing then incoming."""
         cursor = conn.execute(
-            "SELECT r.relation, e.name "
+            "SELECT r.relation, e.name, 'outgoing' "
             "FROM relations r "
             "JOIN entities e ON e.id = r.target_id "
-            "WHERE r.source_id = ?",
-            (entity_id,),
-        )
-        for rel_type, target_name in cursor:
-            relations.append(
-                {
-                    "relation": rel_type,
-                    "target": target_name,
-                    "direction": "outgoing",
-                }
-            )
-
-        # Incoming relations
-        cursor = conn.execute(
-            "SELECT r.relation, e.name "
+            "WHERE r.source_id = ? "
+            "UNION ALL "
+            "SELECT r.relation, e.name, 'incoming' "
             "FROM relations r "
             "JOIN entities e ON e.id = r.source_id "
             "WHERE r.target_id = ?",
-            (entity_id,),
+            (entity_id, entity_id),
         )
-        for rel_type, source_name in cursor:
-            relations.append(
-                {
-                    "relation": rel_type,
-                    "target": source_name,
-                    "direction": "incoming",
-                }
-            )
-
-        return relations
+        return [
+            {"relation": rel_type, "target": other, "direction": direction}
+            for rel_type, other, direction in cursor
+        ]
 
     def search_entities(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
         """
         Search entities by name using LIKE matching.
 
+        With FTS5 available the LIKE runs against the trigram index, so
+        substring patterns of three or more characters avoid a table scan.
+
         Args:
             query: Search string (supports SQL LIKE wildcards).
             limit: Maximum results to return.
@@ -285,17 +373,27 @@ class EntityStore:
         pattern = f"%{query}%"
         results: list[dict[str, Any]] = []
 
-        with self._get_conn() as conn:
-            cursor = conn.execute(
+        if self._has_fts:
+            sql = (
+                "SELECT e.name, e.type, e.attributes, "
+                "e.created_at, e.updated_at "
+                "FROM entities_fts f JOIN entities e ON e.id = f.rowid "
+                "WHERE f.name LIKE ? "
+                "ORDER BY e.updated_at DESC LIMIT ?"
+            )
+        else:
+            sql = (
                 "SELECT name, type, attributes, "
                 "created_at, updated_at "
                 "FROM entities WHERE name LIKE ? "
-                "ORDER BY updated_at DESC LIMIT ?",
-                (pattern, limit),
+                "ORDER BY updated_at DESC LIMIT ?"
             )
+
+        with self._get_conn() as conn:
+            cursor = conn.execute(sql, (pattern, limit))
             for row in cursor:
                 name, etype, attr_json, created, updated = row
-                attributes = json.loads(attr_json) if attr_json else {}
+                attributes = fastjson.loads(attr_json) if attr_json else {}
                 results.append(
                     {
                         "name": name,
@@ -356,7 +454,6 @@ class EntityStore:
                 "DELETE FROM entities WHERE id = ?",
                 (entity_id,),
             )
-            conn.commit()
             logger.debug(f"Removed entity: {name}")
             return True
 
@@ -41,20 +41,32 @@ _MANIPULATION_PHRASES = (
     "in all future",
 )
 
-# PII regex patterns
-_PASSWORD_RE = re.compile(r"(?:password|passwd|pwd)\s*[:=]\s*\S+", re.IGNORECASE)
-_API_KEY_RE = re.compile(r"api[_\-]?key\s*[:=]\s*\S+", re.IGNORECASE)
-_TOKEN_RE = re.compile(r"token\s*[:=]\s*\S+", re.IGNORECASE)
-_SECRET_RE = re.compile(r"secret\s*[:=]\s*\S+", re.IGNORECASE)
-# Common credential prefixes: OpenAI sk-, GitHub ghp_, Slack xoxb-
-_CREDENTIAL_RE = re.compile(
-    r"\b(?:sk-[A-Za-z0-9]{20,}|ghp_[A-Za-z0-9]{36,}"
-    r"|xoxb-[A-Za-z0-9\-]{20,}|xoxp-[A-Za-z0-9\-]{20,})\b"
+# All substring phrases fused into one pattern so text is scanned once
+_PHRASE_RE = re.compile(
+    "|".join(map(re.escape, _SYSTEM_PHRASES + _TOOL_PHRASES + _MANIPULATION_PHRASES))
 )
-# Credit card: 4 groups of 4 digits
-_CREDIT_CARD_RE = re.compile(r"\b\d{4}[\s\-]\d{4}[\s\-]\d{4}[\s\-]\d{4}\b")
-# SSN: XXX-XX-XXXX
-_SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+
+# PII patterns as (type, regex); (?i:...) scopes case-insensitivity per pattern
+_PII_PATTERNS = (
+    ("password", r"(?i:(?:password|passwd|pwd)\s*[:=]\s*\S+)"),
+    ("api_key", r"(?i:api[_\-]?key\s*[:=]\s*\S+)"),
+    ("token", r"(?i:token\s*[:=]\s*\S+)"),
+    ("secret", r"(?i:secret\s*[:=]\s*\S+)"),
+    # Common credential prefixes: OpenAI sk-, GitHub ghp_, Slack xoxb-
+    (
+        "credential",
+        r"\b(?:sk-[A-Za-z0-9]{20,}|ghp_[A-Za-z0-9]{36,}"
+        r"|xoxb-[A-Za-z0-9\-]{20,}|xoxp-[A-Za-z0-9\-]{20,})\b",
+    ),
+    # Credit card: 4 groups of 4 digits
+    ("credit_card", r"\b\d{4}[\s\-]\d{4}[\s\-]\d{4}[\s\-]\d{4}\b"),
+    # SSN: XXX-XX-XXXX
+    ("ssn", r"\b\d{3}-\d{2}-\d{4}\b"),
+)
+_PII_ORDER = {name: i for i, (name, _) in enumerate(_PII_PATTERNS)}
+# One pass over the text; zero-width lookahead so a match (e.g. "api_key=sk-...")
+# never consumes text another pattern would also flag
+_PII_RE = re.compile("(?=" + "|".join(f"(?P<{name}>{pat})" for name, pat in _PII_PATTERNS) + ")")
 
 
 def is_instruction(text: str) -> bool:
@@ -66,27 +78,8 @@ def is_instruction(text: str) -> bool:
     """
     lower = text.lower().strip()
 
-    # Check imperative prefixes
-    for prefix in _IMPERATIVE_PREFIXES:
-        if lower.startswith(prefix):
-            return True
-
-    # Check system-prompt-like language
-    for phrase in _SYSTEM_PHRASES:
-        if phrase in lower:
-            return True
-
-    # Check tool/function references
-    for phrase in _TOOL_PHRASES:
-        if phrase in lower:
-            return True
-
-    # Check manipulation phrases
-    for phrase in _MANIPULATION_PHRASES:
-        if phrase in lower:
-            return True
-
-    return False
+    # Imperative prefixes, then system/tool/manipulation phrases anywhere
+    return lower.startswith(_IMPERATIVE_PREFIXES) or _PHRASE_RE.search(lower) is not None
 
 
 def detect_pii(text: str) -> list[str]:
@@ -94,24 +87,8 @@ def detect_pii(text: str) -> list[str]:
 
     Returns a list of PII types found (empty list means clean).
     """
-    found: list[str] = []
-
-    if _PASSWORD_RE.search(text):
-        found.append("password")
-    if _API_KEY_RE.search(text):
-        found.append("api_key")
-    if _TOKEN_RE.search(text):
-        found.append("token")
-    if _SECRET_RE.search(text):
-        found.append("secret")
-    if _CREDENTIAL_RE.search(text):
-        found.append("credential")
-    if _CREDIT_CARD_RE.search(text):
-        found.append("credit_card")
-    if _SSN_RE.search(text):
-        found.append("ssn")
-
-    return found
+    found = {m.lastgroup for m in _PII_RE.finditer(text)}
+    return sorted(found, key=_PII_ORDER.__getitem__)
 
 
 def sanitize_for_memory(text: str) -> str | None:
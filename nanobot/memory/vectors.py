@@ -17,7 +17,7 @@ from loguru import logger
 from nanobot.llm.embeddings import EmbeddingService
 from nanobot.utils.helpers import ensure_dir
 
-CURRENT_SCHEMA_VERSION = 1
+CURRENT_SCHEMA_VERSION = 2
 
 # Try to use numpy for accelerated vector operations
 try:
@@ -56,6 +56,26 @@ def _cosine_similarity_py(a: list[float], b: list[float]) -> float:
 _cosine_similarity_fast = _cosine_similarity_np if _HAS_NUMPY else _cosine_similarity_py
 
 
+def _quantize_int8(embedding: list[float]) -> bytes:
+    """Quantize an embedding to int8 codes with a symmetric per-vector scale.
+
+    Cosine similarity is invariant to the per-vector scale, so only the
+    codes are stored; scans read 1 byte per dimension instead of 4.
+    """
+    if _HAS_NUMPY:
+        vec = np.asarray(embedding, dtype=np.float32)
+        peak = float(np.max(np.abs(vec))) if vec.size else 0.0
+        if peak == 0.0:
+            return np.zeros(vec.size, dtype=np.int8).tobytes()
+        return np.clip(np.rint(vec * (127.0 / peak)), -127, 127).astype(np.int8).tobytes()
+
+    peak = max((abs(x) for x in embedding), default=0.0)
+    if peak == 0.0:
+        return bytes(len(embedding))
+    codes = [max(-127, min(127, round(x * 127.0 / peak))) for x in embedding]
+    return struct.pack(f"{len(codes)}b", *codes)
+
+
 class VectorStore:
     """
     SQLite-based vector store for semantic memory.
@@ -128,7 +148,8 @@ class VectorStore:
                             metadata TEXT,
                             created_at TEXT NOT NULL,
                             access_count INTEGER DEFAULT 0,
-                            last_accessed_at TEXT
+                            last_accessed_at TEXT,
+                            embedding_q8 BLOB
                         )
                     """)
                     conn.execute("""
@@ -160,6 +181,10 @@ class VectorStore:
                 conn.execute("ALTER TABLE vectors ADD COLUMN last_accessed_at TEXT")
                 conn.commit()
                 logger.info("Added missing last_accessed_at column to vectors table")
+            if "embedding_q8" not in cols:
+                conn.execute("ALTER TABLE vectors ADD COLUMN embedding_q8 BLOB")
+                conn.commit()
+                logger.info("Added missing embedding_q8 column to vectors table")
 
         # Set file permissions
         if self.db_path.exists():
@@ -175,6 +200,22 @@ class VectorStore:
             if "last_accessed_at" not in cols:
                 conn.execute("ALTER TABLE vectors ADD COLUMN last_accessed_at TEXT")
 
+        if from_version < 2:
+            # Migration to v2: int8-quantized copy of each embedding for search scans
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(vectors)")}
+            if "embedding_q8" not in cols:
+                conn.execute("ALTER TABLE vectors ADD COLUMN embedding_q8 BLOB")
+            rows = conn.execute(
+                "SELECT id, embedding FROM vectors WHERE embedding_q8 IS NULL"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE vectors SET embedding_q8 = ? WHERE id = ?",
+                [
+                    (_quantize_int8(self._deserialize_embedding(blob)), entry_id)
+                    for entry_id, blob in rows
+                ],
+            )
+
         conn.execute(
             "UPDATE schema_version SET version = ?",
             (CURRENT_SCHEMA_VERSION,),
@@ -208,6 +249,29 @@ class VectorStore:
         count = len(data) // 4
         return list(struct.unpack(f"{count}f", data))
 
+    def _decode_scan_embedding(self, q8: bytes | None, data: bytes | None) -> list[float]:
+        """Decode a scan row: int8 codes when present, else the full embedding."""
+        if q8 is not None:
+            return list(struct.unpack(f"{len(q8)}b", q8))
+        return self._deserialize_embedding(data or b"")
+
+    def _scan_matrix(self, rows: list[tuple[bytes | None, bytes | None]]) -> "np.ndarray":
+        """Build a float32 matrix from scan rows (numpy path).
+
+        Rows that all carry int8 codes are decoded in one ``frombuffer`` call.
+        """
+        q8_blobs = [q8 for q8, _ in rows]
+        if all(q8 is not None for q8 in q8_blobs) and len({len(b) for b in q8_blobs}) == 1:
+            return (
+                np.frombuffer(b"".join(q8_blobs), dtype=np.int8)
+                .reshape(len(q8_blobs), -1)
+                .astype(np.float32)
+            )
+        return np.array(
+            [self._decode_scan_embedding(q8, data) for q8, data in rows],
+            dtype=np.float32,
+        )
+
     def _cache_query_embedding(self, query: str, embedding: list[float]) -> None:
         """Cache a query embedding with FIFO eviction."""
         key = hashlib.md5(query.encode("utf-8")).hexdigest()
@@ -266,17 +330,16 @@ class VectorStore:
             if not skip_dedup:
                 with sqlite3.connect(self.db_path) as conn:
                     rows = conn.execute(
-                        "SELECT id, embedding FROM vectors ORDER BY id DESC LIMIT 500"
+                        "SELECT embedding_q8,"
+                        " CASE WHEN embedding_q8 IS NULL THEN embedding END"
+                        " FROM vectors ORDER BY id DESC LIMIT 500"
                     ).fetchall()
 
                 if rows:
                     if _HAS_NUMPY:
                         # Batch cosine similarity with numpy
                         emb_vec = np.asarray(embedding, dtype=np.float32)
-                        emb_matrix = np.array(
-                            [self._deserialize_embedding(r[1]) for r in rows],
-                            dtype=np.float32,
-                        )
+                        emb_matrix = self._scan_matrix(rows)
                         dots = emb_matrix @ emb_vec
                         norms = np.linalg.norm(emb_matrix, axis=1) * np.linalg.norm(emb_vec)
                         norms[norms == 0] = 1.0
@@ -286,8 +349,8 @@ class VectorStore:
                             logger.debug(f"Skipping semantically similar entry (sim={max_sim:.3f})")
                             return False
                     else:
-                        for row in rows:
-                            existing_emb = self._deserialize_embedding(row[1])
+                        for q8, data in rows:
+                            existing_emb = self._decode_scan_embedding(q8, data)
                             sim = self._cosine_similarity(embedding, existing_emb)
                             if sim > 0.85:
                                 logger.debug(f"Skipping semantically similar entry (sim={sim:.3f})")
@@ -298,14 +361,15 @@ class VectorStore:
                 conn.execute(
                     """
                     INSERT OR IGNORE INTO vectors
-                    (content_hash, text, embedding, metadata,
+                    (content_hash, text, embedding, embedding_q8, metadata,
                      created_at, access_count, last_accessed_at)
-                    VALUES (?, ?, ?, ?, ?, 0, NULL)
+                    VALUES (?, ?, ?, ?, ?, ?, 0, NULL)
                     """,
                     (
                         content_hash,
                         text,
                         self._serialize_embedding(embedding),
+                        _quantize_int8(embedding),
                         json.dumps(metadata) if metadata else None,
                         datetime.now().isoformat(),
                     ),
@@ -363,15 +427,16 @@ class VectorStore:
                         conn.execute(
                             """
                             INSERT OR IGNORE INTO vectors
-                            (content_hash, text, embedding,
+                            (content_hash, text, embedding, embedding_q8,
                              metadata, created_at,
                              access_count, last_accessed_at)
-                            VALUES (?, ?, ?, ?, ?, 0, NULL)
+                            VALUES (?, ?, ?, ?, ?, ?, 0, NULL)
                             """,
                             (
                                 content_hash,
                                 text,
                                 self._serialize_embedding(embeddings[i]),
+                                _quantize_int8(embeddings[i]),
                                 json.dumps(metadata) if metadata else None,
                                 datetime.now().isoformat(),
                             ),
@@ -393,6 +458,7 @@ class VectorStore:
         after: str | None = None,
         before: str | None = None,
         type_weights: dict[str, float] | None = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for similar entries with time-decayed relevance.
@@ -405,6 +471,8 @@ class VectorStore:
             after: ISO date string, only include entries after this.
             before: ISO date string, only include entries before this.
             type_weights: Score multipliers by entry type.
+            metadata_filter: Only include entries whose metadata has these
+                key/value pairs (applied in SQL, before ranking).
 
         Returns:
             List of matching entries with similarity scores.
@@ -428,9 +496,14 @@ class VectorStore:
         now = datetime.now()
 
         # Build SQL query with optional time filters
-        sql = "SELECT id, text, embedding, metadata, created_at FROM vectors"
+        # Scan the int8 codes; the full embedding is only read for unmigrated rows
+        sql = (
+            "SELECT id, text, embedding_q8,"
+            " CASE WHEN embedding_q8 IS NULL THEN embedding END,"
+            " metadata, created_at FROM vectors"
+        )
         conditions = []
-        params: list[str] = []
+        params: list[Any] = []
 
         if after is not None:
             conditions.append("created_at >= ?")
@@ -438,6 +511,9 @@ class VectorStore:
         if before is not None:
             conditions.append("created_at <= ?")
             params.append(before)
+        for key, value in (metadata_filter or {}).items():
+            conditions.append("json_extract(metadata, ?) = ?")
+            params.extend([f"$.{key}", value])
 
         if conditions:
             sql += " WHERE " + " AND ".join(conditions)
@@ -458,19 +534,19 @@ class VectorStore:
             texts = []
             metadatas = []
             created_ats = []
-            embeddings_list = []
+            scan_rows = []
 
             for row in rows:
-                entry_id, text, embedding_blob, metadata_json, created_at = row
+                entry_id, text, q8_blob, embedding_blob, metadata_json, created_at = row
                 ids.append(entry_id)
                 texts.append(text)
                 metadatas.append(json.loads(metadata_json) if metadata_json else {})
                 created_ats.append(created_at)
-                embeddings_list.append(self._deserialize_embedding(embedding_blob))
+                scan_rows.append((q8_blob, embedding_blob))
 
             # Vectorized cosine similarity: compute all at once
             query_vec = np.asarray(query_embedding, dtype=np.float32)
-            emb_matrix = np.array(embeddings_list, dtype=np.float32)
+            emb_matrix = self._scan_matrix(scan_rows)
             # Dot products
             dots = emb_matrix @ query_vec
             # Norms
@@ -514,8 +590,8 @@ class VectorStore:
         else:
             # Pure Python fallback (no numpy)
             for row in rows:
-                entry_id, text, embedding_blob, metadata_json, created_at = row
-                embedding = self._deserialize_embedding(embedding_blob)
+                entry_id, text, q8_blob, embedding_blob, metadata_json, created_at = row
+                embedding = self._decode_scan_embedding(q8_blob, embedding_blob)
                 similarity = self._cosine_similarity(query_embedding, embedding)
 
                 if similarity < min_similarity:
@@ -626,10 +702,13 @@ class VectorStore:
         ids_to_delete: list[int] = []
 
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT id, embedding FROM vectors")
+            cursor = conn.execute(
+                "SELECT id, embedding_q8, CASE WHEN embedding_q8 IS NULL THEN embedding END"
+                " FROM vectors"
+            )
             for row in cursor:
-                entry_id, embedding_blob = row
-                embedding = self._deserialize_embedding(embedding_blob)
+                entry_id, q8_blob, embedding_blob = row
+                embedding = self._decode_scan_embedding(q8_blob, embedding_blob)
                 similarity = self._cosine_similarity(query_embedding, embedding)
                 if similarity >= min_similarity:
                     ids_to_delete.append(entry_id)
@@ -275,8 +275,25 @@ class LiteLLMProvider(LLMProvider):
 
             # Accumulate tool call deltas across chunks
             tool_call_acc: dict[int, dict[str, Any]] = {}
+            emitted: set[int] = set()
             usage: dict[str, int] = {}
 
+            def _complete(below: int | None = None) -> list[ToolCallRequest]:
+                """Parse accumulated calls (those before index ``below``) not yet emitted."""
+                done: list[ToolCallRequest] = []
+                for idx in sorted(tool_call_acc):
+                    if idx in emitted or (below is not None and idx >= below):
+                        continue
+                    emitted.add(idx)
+                    acc = tool_call_acc[idx]
+                    args_str = acc["arguments"]
+                    try:
+                        args = json.loads(args_str) if args_str else {}
+                    except json.JSONDecodeError:
+                        continue
+                    done.append(ToolCallRequest(id=acc["id"], name=acc["name"], arguments=args))
+                return done
+
             async for chunk in response:
                 delta = chunk.choices[0].delta if chunk.choices else None
                 finish_reason = chunk.choices[0].finish_reason if chunk.choices else None
@@ -285,11 +302,15 @@ class LiteLLMProvider(LLMProvider):
                 if delta and delta.content:
                     content = delta.content
 
-                # Accumulate tool call deltas
+                # Accumulate tool call deltas. Calls stream in index order, so a
+                # new index means every earlier call is complete and can be
+                # emitted right away instead of waiting for the finish chunk.
+                completed_tools: list[ToolCallRequest] = []
                 if delta and hasattr(delta, "tool_calls") and delta.tool_calls:
                     for tc_delta in delta.tool_calls:
                         idx = tc_delta.index
                         if idx not in tool_call_acc:
+                            completed_tools.extend(_complete(below=idx))
                             tool_call_acc[idx] = {
                                 "id": tc_delta.id or "",
                                 "name": "",
@@ -311,22 +332,9 @@ class LiteLLMProvider(LLMProvider):
                         "total_tokens": chunk.usage.total_tokens,
                     }
 
-                # Build completed tool calls on finish
-                completed_tools: list[ToolCallRequest] = []
+                # Emit any remaining tool calls on finish
                 if finish_reason and tool_call_acc:
-                    for acc in tool_call_acc.values():
-                        args_str = acc["arguments"]
-                        try:
-                            args = json.loads(args_str) if args_str else {}
-                        except json.JSONDecodeError:
-                            continue
-                        completed_tools.append(
-                            ToolCallRequest(
-                                id=acc["id"],
-                                name=acc["name"],
-                                arguments=args,
-                            )
-                        )
+                    completed_tools.extend(_complete())
 
                 yield StreamChunk(
                     content=content,
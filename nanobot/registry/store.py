@@ -5,6 +5,7 @@ import json
 import os
 import sqlite3
 import time
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
@@ -266,6 +267,21 @@ class AgentRegistry:
                 )
                 conn.commit()
 
+    async def record_pulse_many(self, agent_ids: Iterable[str]) -> None:
+        """Update the last pulse timestamp for several agents in one write."""
+        ids = list(agent_ids)
+        if not ids:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        async with self._write_lock:
+            with sqlite3.connect(str(self._db_path)) as conn:
+                conn.execute(
+                    "UPDATE agents SET last_pulse_at = ?, updated_at = ? "
+                    f"WHERE agent_id IN ({placeholders})",
+                    (time.time(), self._now_iso(), *ids),
+                )
+                conn.commit()
+
     async def mark_stale_agents(self, stale_threshold_s: int = 180) -> list[str]:
         """Mark agents as FAILED if they haven't pulsed within the threshold."""
         cutoff = time.time() - stale_threshold_s
@@ -1,5 +1,7 @@
 """Session compaction for managing conversation history size."""
 
+import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
@@ -8,6 +10,20 @@ from loguru import logger
 if TYPE_CHECKING:
     from nanobot.agent.memory.extractor import MemoryExtractor
 
+_LINE_RE = re.compile(r"[^\n]+")
+
+
+def _leading_sentences(content: str, n: int = 3) -> Iterator[str]:
+    """Yield the first ``n`` '.'-separated segments without splitting the rest."""
+    pos = 0
+    for _ in range(n):
+        end = content.find(".", pos)
+        if end == -1:
+            yield content[pos:]
+            return
+        yield content[pos:end]
+        pos = end + 1
+
 
 @dataclass
 class CompactionConfig:
@@ -155,12 +171,14 @@ class SessionCompactor:
 
     def _summarize(self, messages: list[dict[str, Any]]) -> str:
         """Summarize middle-section messages using heuristics."""
-        user_questions: list[str] = []
-        seen_questions: set[str] = set()
-        assistant_conclusions: list[str] = []
-        seen_conclusions: set[str] = set()
+        # Insertion-ordered sets; only the first three of each are reported
+        user_questions: dict[str, None] = {}
+        assistant_conclusions: dict[str, None] = {}
 
         for msg in messages:
+            if len(user_questions) >= 3 and len(assistant_conclusions) >= 3:
+                break
+
             content = msg.get("content", "")
             if not content:
                 continue
@@ -168,33 +186,29 @@ class SessionCompactor:
             role = msg.get("role", "")
 
             if role == "user":
-                for line in content.split("\n"):
-                    line = line.strip()
+                for match in _LINE_RE.finditer(content):
+                    if len(user_questions) >= 3:
+                        break
+                    line = match.group().strip()
                     if line.endswith("?") and len(line) > self.MIN_QUESTION_LENGTH:
-                        extracted = line[: self.MAX_EXTRACT_LENGTH]
-                        if extracted not in seen_questions:
-                            user_questions.append(extracted)
-                            seen_questions.add(extracted)
+                        user_questions.setdefault(line[: self.MAX_EXTRACT_LENGTH])
 
             if role == "assistant" and len(content) > self.MIN_CONTENT_LENGTH:
-                for sentence in content.split(".")[:3]:
+                for sentence in _leading_sentences(content):
                     sentence = sentence.strip()
                     if len(sentence) > self.MIN_SENTENCE_LENGTH:
-                        extracted = sentence[: self.MAX_EXTRACT_LENGTH]
-                        if extracted not in seen_conclusions:
-                            assistant_conclusions.append(extracted)
-                            seen_conclusions.add(extracted)
+                        assistant_conclusions.setdefault(sentence[: self.MAX_EXTRACT_LENGTH])
                         break
 
         parts: list[str] = []
         if user_questions:
             parts.append("User asked about:")
-            for q in user_questions[:3]:
+            for q in list(user_questions)[:3]:
                 parts.append(f"  - {q}")
 
         if assistant_conclusions:
             parts.append("Assistant responses:")
-            for c in assistant_conclusions[:3]:
+            for c in list(assistant_conclusions)[:3]:
                 parts.append(f"  - {c}")
 
         return "\n".join(parts) if parts else "General discussion continued"
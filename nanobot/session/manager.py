@@ -25,12 +25,29 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Formatted history keyed by (max_messages, max_tokens); cleared when messages change
+    _history_cache: dict[tuple[int | None, int | None], tuple[int, list[dict[str, Any]]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _user_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Count once for sessions restored from disk; add_message keeps it current
+        self._user_count = sum(1 for m in self.messages if m.get("role") == "user")
+
+    @property
+    def user_count(self) -> int:
+        """Number of user messages in the session."""
+        return self._user_count
 
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
         msg = {"role": role, "content": content, "timestamp": datetime.now().isoformat(), **kwargs}
         self.messages.append(msg)
         self.updated_at = datetime.now()
+        self._history_cache.clear()
+        if role == "user":
+            self._user_count += 1
 
     def get_history(
         self,
@@ -47,19 +64,31 @@ class Session:
         Returns:
             List of messages in LLM format.
         """
-        if max_tokens is not None:
-            return self._get_history_by_tokens(max_tokens)
+        # Memoized until the next add_message/clear; the length check also
+        # catches direct edits to self.messages
+        key = (max_messages, max_tokens)
+        cached = self._history_cache.get(key)
+        if cached is not None and cached[0] == len(self.messages):
+            return list(cached[1])
 
-        # Fallback to message count limit
-        if max_messages is None:
-            max_messages = 50
+        if max_tokens is not None:
+            history = self._get_history_by_tokens(max_tokens)
+        else:
+            # Fallback to message count limit
+            if max_messages is None:
+                max_messages = 50
+
+            recent = (
+                self.messages[-max_messages:]
+                if len(self.messages) > max_messages
+                else self.messages
+            )
 
-        recent = (
-            self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        )
+            # Convert to LLM format (just role and content)
+            history = [{"role": m["role"], "content": m["content"]} for m in recent]
 
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        self._history_cache[key] = (len(self.messages), history)
+        return list(history)
 
     def _get_history_by_tokens(self, max_tokens: int) -> list[dict[str, Any]]:
         """
@@ -95,19 +124,35 @@ class Session:
         """Clear all messages in the session."""
         self.messages = []
         self.updated_at = datetime.now()
+        self._history_cache.clear()
+        self._user_count = 0
 
     def get_rolling_summary(self) -> str | None:
         """Get the rolling summary from metadata."""
         return self.metadata.get("rolling_summary")
 
-    def set_rolling_summary(self, summary: str | None) -> None:
-        """Store the rolling summary in metadata."""
+    def set_rolling_summary(self, summary: str | None, upto: int | None = None) -> None:
+        """Store the rolling summary in metadata.
+
+        Args:
+            summary: The summary text (None clears it).
+            upto: Number of leading session messages the summary covers.
+        """
         if summary:
             self.metadata["rolling_summary"] = summary
         elif "rolling_summary" in self.metadata:
             del self.metadata["rolling_summary"]
+        if summary and upto is not None:
+            self.metadata["compacted_upto_idx"] = upto
+        else:
+            self.metadata.pop("compacted_upto_idx", None)
         self.updated_at = datetime.now()
 
+    def get_rolling_summary_upto(self) -> int | None:
+        """Get how many leading session messages the rolling summary covers."""
+        upto = self.metadata.get("compacted_upto_idx")
+        return upto if isinstance(upto, int) else None
+
 
 class SessionManager:
     """
@@ -0,0 +1,39 @@
+"""Fast JSON serialization for hot paths."""
+
+import json
+from typing import Any
+
+# Prefer orjson when available; fall back to the stdlib encoder
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize an object to a compact JSON string.
+
+    Uses orjson when installed. Objects orjson rejects (non-string keys,
+    integers beyond 64 bits) fall back to the stdlib encoder. With
+    ``sort_keys`` the output is canonical and suitable as a cache key.
+    """
+    if _HAS_ORJSON:
+        try:
+            option = orjson.OPT_SORT_KEYS if sort_keys else 0
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=sort_keys)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document.
+
+    Uses orjson when installed (integers beyond 64 bits decode as floats);
+    raises ``json.JSONDecodeError`` on invalid input either way.
+    """
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
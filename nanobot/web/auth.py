@@ -1,5 +1,8 @@
 """Session-based authentication for the web dashboard."""
 
+import time
+from collections import OrderedDict
+
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
@@ -20,6 +23,7 @@ class AuthManager:
 
     COOKIE_NAME = "nanobot_session"
     MAX_AGE = 86400 * 7  # 7 days
+    VERIFIED_CACHE_SIZE = 256
 
     def __init__(
         self,
@@ -34,6 +38,8 @@ class AuthManager:
             self._serializer = URLSafeTimedSerializer(secret_key)
         else:
             self._serializer = None
+        # token -> (username, expires_at); skips re-checking the signature on every request
+        self._verified: OrderedDict[str, tuple[str, float]] = OrderedDict()
 
     def verify_password(self, password: str) -> bool:
         """Verify a password against the stored hash."""
@@ -61,11 +67,25 @@ class AuthManager:
         if not token:
             return None
         if self._serializer:
+            cached = self._verified.get(token)
+            if cached is not None:
+                user, expires_at = cached
+                if time.time() < expires_at:
+                    self._verified.move_to_end(token)
+                    return user
+                del self._verified[token]
             try:
-                data = self._serializer.loads(token, max_age=self.MAX_AGE)
-                return data.get("user")
+                data, signed_at = self._serializer.loads(
+                    token, max_age=self.MAX_AGE, return_timestamp=True
+                )
+                user = data.get("user")
             except Exception:
                 return None
+            if user:
+                self._verified[token] = (user, signed_at.timestamp() + self.MAX_AGE)
+                if len(self._verified) > self.VERIFIED_CACHE_SIZE:
+                    self._verified.popitem(last=False)
+            return user
         # Fallback
         if token.startswith("session:"):
             return token.split(":", 1)[1]
@@ -0,0 +1,14 @@
+"""Response classes shared by the web routes."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from nanobot.utils import fastjson
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (via ``fastjson``) instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return fastjson.dumps(content).encode("utf-8")
@@ -1,15 +1,81 @@
 """Chat route with WebSocket endpoint for agent communication."""
 
-import json
+import asyncio
+import os
 from typing import Any
 
 from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
 
 from nanobot.bus.events import InboundMessage
+from nanobot.utils import fastjson
+from nanobot.web.responses import FastJSONResponse
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Session files are JSONL written with json.dumps defaults (", " / ": " separators)
+_METADATA_PREFIX = b'{"_type": "metadata"'
+_USER_ROLE = b'"role": "user"'
+
+# Upper bound on WebSocket frames published to the bus in one batch
+_WS_BATCH_LIMIT = 128
+
+# path -> ((mtime_ns, size), message_count, preview)
+_summary_cache: dict[str, tuple[tuple[int, int], int, str]] = {}
+
+
+def _summarize_session_bytes(raw: bytes) -> tuple[int, str]:
+    """Count messages and find the first user message without parsing every line."""
+    lines = raw.count(b"\n") + (1 if raw and not raw.endswith(b"\n") else 0)
+    metadata = raw.startswith(_METADATA_PREFIX) + raw.count(b"\n" + _METADATA_PREFIX)
+    preview = ""
+    pos = raw.find(_USER_ROLE)
+    while pos != -1:
+        start = raw.rfind(b"\n", 0, pos) + 1
+        end = raw.find(b"\n", pos)
+        end = len(raw) if end == -1 else end
+        # The marker could sit inside a nested value; only a real user line counts,
+        # and empty user messages are skipped like before
+        data = fastjson.loads(raw[start:end])
+        if data.get("role") == "user" and data.get("_type") != "metadata":
+            preview = (data.get("content") or "")[:120]
+            if preview:
+                break
+        pos = raw.find(_USER_ROLE, end)
+    return lines - metadata, preview
+
+
+def _summarize_sessions(paths: list[str]) -> dict[str, tuple[int, str]]:
+    """Summaries for session files, reusing cached ones whose mtime and size are unchanged."""
+    summaries: dict[str, tuple[int, str]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = _summary_cache.get(path)
+            if cached is not None and cached[0] == stamp:
+                summaries[path] = cached[1:]
+                continue
+            with open(path, "rb") as f:
+                count, preview = _summarize_session_bytes(f.read())
+        except Exception:
+            continue
+        _summary_cache[path] = (stamp, count, preview)
+        summaries[path] = (count, preview)
+    # Forget files that are no longer listed (deleted sessions)
+    for stale in _summary_cache.keys() - set(paths):
+        _summary_cache.pop(stale, None)
+    return summaries
+
+
+def _scan_web_sessions(sessions: Any) -> tuple[list[dict[str, Any]], dict[str, tuple[int, str]]]:
+    """List web sessions and summarize their files (blocking; run in a worker thread)."""
+    web_sessions = [
+        info for info in sessions.list_sessions() if info.get("key", "").startswith("web:")
+    ]
+    summaries = _summarize_sessions([info["path"] for info in web_sessions if info.get("path")])
+    return web_sessions, summaries
+
 
 @router.get("", response_class=HTMLResponse)
 async def chat_page(request: Request):
@@ -27,41 +93,19 @@ async def chat_page(request: Request):
 
 
 @router.get("/sessions")
-async def list_sessions(request: Request) -> JSONResponse:
+async def list_sessions(request: Request) -> FastJSONResponse:
     """List web chat sessions with preview text."""
     agent = request.app.state.agent
     if not agent:
-        return JSONResponse([])
+        return FastJSONResponse([])
 
-    all_sessions = agent.sessions.list_sessions()
-    result = []
-    for info in all_sessions:
-        key = info.get("key", "")
-        if not key.startswith("web:"):
-            continue
-
-        session_id = key[4:]  # strip "web:" prefix
-        preview = ""
-        message_count = 0
-
-        # Read session file to get first user message and count
-        path = info.get("path")
-        if path:
-            try:
-                with open(path, encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        data = json.loads(line)
-                        if data.get("_type") == "metadata":
-                            continue
-                        message_count += 1
-                        if not preview and data.get("role") == "user":
-                            preview = (data.get("content") or "")[:120]
-            except Exception:
-                continue
+    # Directory listing and file scanning are blocking; keep them off the event loop
+    web_sessions, summaries = await asyncio.to_thread(_scan_web_sessions, agent.sessions)
 
+    result = []
+    for info in web_sessions:
+        session_id = info["key"][4:]  # strip "web:" prefix
+        message_count, preview = summaries.get(info.get("path"), (0, ""))
         if message_count == 0:
             continue
 
@@ -74,15 +118,15 @@ async def list_sessions(request: Request) -> JSONResponse:
             }
         )
 
-    return JSONResponse(result)
+    return FastJSONResponse(result)
 
 
 @router.get("/sessions/{session_id}/history")
-async def session_history(request: Request, session_id: str) -> JSONResponse:
+async def session_history(request: Request, session_id: str) -> FastJSONResponse:
     """Load full message history for a session."""
     agent = request.app.state.agent
     if not agent:
-        return JSONResponse({"messages": []})
+        return FastJSONResponse({"messages": []})
 
     key = f"web:{session_id}"
     session = agent.sessions.get_or_create(key)
@@ -101,19 +145,19 @@ async def session_history(request: Request, session_id: str) -> JSONResponse:
             }
         )
 
-    return JSONResponse({"messages": messages})
+    return FastJSONResponse({"messages": messages})
 
 
 @router.delete("/sessions/{session_id}")
-async def delete_session(request: Request, session_id: str) -> JSONResponse:
+async def delete_session(request: Request, session_id: str) -> FastJSONResponse:
     """Delete a chat session."""
     agent = request.app.state.agent
     if not agent:
-        return JSONResponse({"ok": False})
+        return FastJSONResponse({"ok": False})
 
     key = f"web:{session_id}"
     deleted = agent.sessions.delete(key)
-    return JSONResponse({"ok": deleted})
+    return FastJSONResponse({"ok": deleted})
 
 
 @router.websocket("/ws/{session_id}")
@@ -135,6 +179,7 @@ async def chat_ws(websocket: WebSocket, session_id: str):
         return
 
     web_channel.register(session_id, websocket)
+    pending: asyncio.Future | None = None
 
     try:
         # If context query params present, send auto-context message
@@ -153,23 +198,38 @@ async def chat_ws(websocket: WebSocket, session_id: str):
                     )
                 )
 
-        # Listen for user messages
+        # Listen for user messages. After one frame arrives, frames that are already
+        # buffered are drained and published together; a receive is never cancelled
+        # mid-flight, so the next one simply carries over to the following batch.
+        pending = asyncio.ensure_future(websocket.receive_json())
         while True:
-            data = await websocket.receive_json()
-            content = data.get("content", "").strip()
-            if not content:
-                continue
-            await bus.publish_inbound(
-                InboundMessage(
-                    channel="web",
-                    sender_id="admin",
-                    chat_id=session_id,
-                    content=content,
-                )
-            )
+            data = await pending
+            batch: list[InboundMessage] = []
+            while True:
+                content = data.get("content", "").strip()
+                if content:
+                    batch.append(
+                        InboundMessage(
+                            channel="web",
+                            sender_id="admin",
+                            chat_id=session_id,
+                            content=content,
+                        )
+                    )
+                pending = asyncio.ensure_future(websocket.receive_json())
+                if len(batch) >= _WS_BATCH_LIMIT:
+                    break
+                await asyncio.sleep(0)
+                if not pending.done() or pending.exception() is not None:
+                    break
+                data = pending.result()
+            if batch:
+                await bus.publish_inbound_batch(batch)
     except WebSocketDisconnect:
         pass
     finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
         web_channel.unregister(session_id)
 
 
@@ -294,41 +294,45 @@ function connectWebSocket(context, id) {
 
     chatWs.onmessage = function(event) {
         try {
-            var data = JSON.parse(event.data);
-            if (data.type === 'message') {
-                if (streamingMsgEl && data.content) {
-                    streamingMsgEl
-                        .querySelector('.chat-msg-content')
-                        .innerHTML = renderMarkdown(data.content);
-                    streamingMsgEl = null;
-                } else if (streamingMsgEl && !data.content) {
-                    streamingMsgEl = null;
-                } else if (data.content) {
-                    appendMessage('nano', data.content);
-                }
-                hideTyping();
-            } else if (data.type === 'progress') {
-                if (data.kind === 'streaming' && data.detail) {
-                    if (!streamingMsgEl) {
-                        streamingMsgEl =
-                            createMessageEl('nano', data.detail);
-                    } else {
+            var parsed = JSON.parse(event.data);
+            // Frames queued during a write arrive together as an array
+            var frames = Array.isArray(parsed) ? parsed : [parsed];
+            frames.forEach(function(data) {
+                if (data.type === 'message') {
+                    if (streamingMsgEl && data.content) {
                         streamingMsgEl
                             .querySelector('.chat-msg-content')
-                            .innerHTML =
-                                renderMarkdown(data.detail);
+                            .innerHTML = renderMarkdown(data.content);
+                        streamingMsgEl = null;
+                    } else if (streamingMsgEl && !data.content) {
+                        streamingMsgEl = null;
+                    } else if (data.content) {
+                        appendMessage('nano', data.content);
+                    }
+                    hideTyping();
+                } else if (data.type === 'progress') {
+                    if (data.kind === 'streaming' && data.detail) {
+                        if (!streamingMsgEl) {
+                            streamingMsgEl =
+                                createMessageEl('nano', data.detail);
+                        } else {
+                            streamingMsgEl
+                                .querySelector('.chat-msg-content')
+                                .innerHTML =
+                                    renderMarkdown(data.detail);
+                        }
+                        scrollToBottom();
+                    } else {
+                        showTyping(
+                            data.detail
+                                || data.tool_name
+                                || 'Thinking...'
+                        );
                     }
-                    scrollToBottom();
-                } else {
-                    showTyping(
-                        data.detail
-                            || data.tool_name
-                            || 'Thinking...'
-                    );
+                } else if (data.type === 'error') {
+                    appendStatus('Error: ' + data.content);
                 }
-            } else if (data.type === 'error') {
-                appendStatus('Error: ' + data.content);
-            }
+            });
         } catch (e) {
             appendMessage('nano', event.data);
         }
@@ -0,0 +1,99 @@
+"""Tests for incremental message compaction."""
+
+from typing import Any
+
+import pytest
+
+from nanobot.agent.compaction import MessageCompactor
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class SummaryProvider(LLMProvider):
+    """Provider that records summarization prompts."""
+
+    def __init__(self) -> None:
+        super().__init__(api_key="fake-key", api_base=None)
+        self.prompts: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.prompts.append(messages[0]["content"])
+        return LLMResponse(content=f"summary {len(self.prompts)}")
+
+    def get_default_model(self) -> str:
+        return "fake-model"
+
+
+def _conversation(n: int) -> list[dict[str, Any]]:
+    msgs: list[dict[str, Any]] = [{"role": "system", "content": "sys"}]
+    for i in range(n):
+        role = "user" if i % 2 == 0 else "assistant"
+        msgs.append({"role": role, "content": f"message {i} " + "x" * 200})
+    return msgs
+
+
+@pytest.mark.asyncio
+async def test_second_compaction_only_summarizes_new_messages() -> None:
+    provider = SummaryProvider()
+    compactor = MessageCompactor(provider=provider, keep_recent=2)
+
+    msgs = _conversation(10)
+    _, summary, upto = await compactor.compact_incremental(msgs, 200)
+    assert upto == 8
+    assert "message 0 " in provider.prompts[0]
+
+    msgs = _conversation(12)
+    _, summary2, _ = await compactor.compact_incremental(msgs, 200, summary, upto)
+    assert summary2 == "summary 2"
+    assert "message 0 " not in provider.prompts[1]
+    assert "message 8 " in provider.prompts[1]
+    assert "message 9 " in provider.prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_no_new_messages_reuses_summary_without_llm() -> None:
+    provider = SummaryProvider()
+    compactor = MessageCompactor(provider=provider, keep_recent=2)
+
+    msgs = _conversation(10)
+    _, summary, upto = await compactor.compact_incremental(msgs, 200)
+    compacted, summary2, _ = await compactor.compact_incremental(msgs, 200, summary, upto)
+
+    assert len(provider.prompts) == 1
+    assert summary2 == summary
+    assert any(summary in m["content"] for m in compacted)
+
+
+@pytest.mark.asyncio
+async def test_repeated_short_messages_are_not_skipped() -> None:
+    provider = SummaryProvider()
+    compactor = MessageCompactor(provider=provider, keep_recent=2)
+
+    msgs: list[dict[str, Any]] = [{"role": "system", "content": "sys"}]
+    for i in range(8):
+        msgs.append({"role": "user", "content": f"question {i} " + "x" * 200})
+        msgs.append({"role": "assistant", "content": "ok"})
+    _, summary, upto = await compactor.compact_incremental(msgs, 200)
+    assert upto == 14
+
+    # The new turns end with the same short reply as the summarized prefix
+    msgs += [
+        {"role": "user", "content": "unsummarized detail " + "y" * 200},
+        {"role": "assistant", "content": "ok"},
+        {"role": "user", "content": "latest question " + "z" * 200},
+        {"role": "assistant", "content": "ok"},
+    ]
+    await compactor.compact_incremental(msgs, 200, summary, upto)
+    assert "unsummarized detail" in provider.prompts[1]
+    assert "question 7 " in provider.prompts[1]
+    assert "question 6 " not in provider.prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_position_past_the_prefix_falls_back_to_previous_summary() -> None:
+    provider = SummaryProvider()
+    compactor = MessageCompactor(provider=provider, keep_recent=2)
+
+    _, summary, upto = await compactor.compact_incremental(_conversation(10), 200, "old", 99)
+    assert provider.prompts == []
+    assert summary == "old"
+    assert upto == 8
@@ -5,6 +5,7 @@ These tests exercise the full lifecycle: message processing -> fact extraction
 deterministic embeddings.
 """
 
+import asyncio
 import hashlib
 import json
 from pathlib import Path
@@ -501,6 +502,8 @@ async def test_agent_loop_triggers_extraction_on_interval(
             new=AsyncMock(return_value=extraction_resp),
         ):
             await agent_loop._process_message(msg)
+            # Let background extraction finish while the mock is active
+            await asyncio.gather(*agent_loop._background_tasks)
 
     # After 3 messages, extraction should have stored facts
     total = sum(
@@ -0,0 +1,78 @@
+"""Tests for the embedding service cache."""
+
+from pathlib import Path
+from typing import Any
+
+import httpx
+import litellm
+import pytest
+
+from nanobot.llm.embeddings import EmbeddingService, _retry_after
+
+
+class RecordingEmbeddingService(EmbeddingService):
+    """Embeds text as its length and records which texts reach the provider."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.requested: list[list[str]] = []
+
+    async def _embed_uncached(self, texts: list[str]) -> list[list[float]]:
+        self.requested.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_embed_only_requests_misses(tmp_path: Path) -> None:
+    service = RecordingEmbeddingService(cache_path=tmp_path / "cache.db")
+
+    assert await service.embed(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert await service.embed(["ccc", "a", "bb"]) == [[3.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+    assert service.requested == [["a", "bb"], ["ccc"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_cache_persists_per_model(tmp_path: Path) -> None:
+    first = RecordingEmbeddingService(cache_path=tmp_path / "cache.db")
+    await first.embed(["hello"])
+
+    reopened = RecordingEmbeddingService(cache_path=tmp_path / "cache.db")
+    assert await reopened.embed(["hello"]) == [[5.0, 1.0]]
+    assert reopened.requested == []
+
+    other_model = RecordingEmbeddingService(model="other/model", cache_path=tmp_path / "cache.db")
+    await other_model.embed(["hello"])
+    assert other_model.requested == [["hello"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_single_reuses_recent_queries() -> None:
+    service = RecordingEmbeddingService()
+
+    assert await service.embed_single("query") == [5.0, 1.0]
+    assert await service.embed_single("query") == [5.0, 1.0]
+    assert service.requested == [["query"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_splits_large_inputs_into_batches() -> None:
+    batches: list[list[str]] = []
+
+    class BatchingService(EmbeddingService):
+        async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+            batches.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+    texts = ["x" * n for n in (5, 1, 4, 2, 3)]
+    service = BatchingService(batch_size=2)
+    assert await service.embed(texts) == [[5.0], [1.0], [4.0], [2.0], [3.0]]
+    assert sorted(len(b) for b in batches) == [1, 2, 2]
+    assert sorted(batches) == [["x", "xx"], ["xxx", "xxxx"], ["xxxxx"]]
+
+
+def test_retry_after_reads_provider_header() -> None:
+    request = httpx.Request("POST", "https://example.invalid/embeddings")
+    limited = httpx.Response(429, headers={"Retry-After": "3"}, request=request)
+    error = litellm.RateLimitError("slow down", "openai", "m", response=limited)
+    assert _retry_after(error) == 3.0
+    assert _retry_after(ValueError("no response")) == 0.0
@@ -0,0 +1,90 @@
+"""Tests for the SQLite entity store."""
+
+from pathlib import Path
+
+import pytest
+
+from nanobot.memory.entities import EntityStore
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    s = EntityStore(tmp_path / "entities.db")
+    yield s
+    s.close()
+
+
+def test_upsert_merges_attributes(store: EntityStore) -> None:
+    first = store.upsert_entity("Alice", "person", {"role": "engineer", "team": "core"})
+    second = store.upsert_entity("Alice", "employee", {"role": "lead"})
+    assert first == second
+
+    entity = store.query_entity("Alice")
+    assert entity["type"] == "employee"
+    assert entity["attributes"] == {"role": "lead", "team": "core"}
+
+
+def test_upsert_entities_in_bulk(store: EntityStore) -> None:
+    store.upsert_entity("Acme", "company", {"size": "small"})
+    store.upsert_entities([("Acme", "company", {"city": "Berlin"}), ("Bob", "person", None)])
+
+    assert store.query_entity("Acme")["attributes"] == {"size": "small", "city": "Berlin"}
+    assert store.query_entity("Bob")["attributes"] == {}
+
+
+def test_add_relations_creates_entities_and_skips_duplicates(store: EntityStore) -> None:
+    store.upsert_entity("Alice", "person")
+    added = store.add_relations(
+        [("Alice", "works_at", "Acme"), ("Bob", "knows", "Alice"), ("Alice", "works_at", "Acme")]
+    )
+    assert added == 2
+    assert store.add_relations([("Alice", "works_at", "Acme")]) == 0
+    assert not store.add_relation("Bob", "knows", "Alice")
+
+    assert store.query_entity("Acme")["type"] == "unknown"
+    assert store.get_relations("Alice") == [
+        {"relation": "works_at", "target": "Acme", "direction": "outgoing"},
+        {"relation": "knows", "target": "Bob", "direction": "incoming"},
+    ]
+
+
+@pytest.mark.parametrize("use_fts", [True, False])
+def test_search_entities(store: EntityStore, use_fts: bool) -> None:
+    if use_fts and not store._has_fts:
+        pytest.skip("SQLite built without FTS5")
+    store._has_fts = use_fts
+    store.upsert_entities(
+        [
+            ("Project Apollo", "project", {"status": "active"}),
+            ("Apollo Labs", "company", None),
+            ("Zeus", "project", None),
+        ]
+    )
+
+    names = {e["name"] for e in store.search_entities("apollo")}
+    assert names == {"Project Apollo", "Apollo Labs"}
+    assert len(store.search_entities("apollo", limit=1)) == 1
+    hit = store.search_entities("Project Apo")[0]
+    assert hit["attributes"] == {"status": "active"}
+    assert store.search_entities("hermes") == []
+
+
+def test_reopen_existing_database(tmp_path: Path) -> None:
+    db_path = tmp_path / "entities.db"
+    store = EntityStore(db_path)
+    store.upsert_entity("Alice", "person", {"role": "engineer"})
+    store.add_relation("Alice", "works_at", "Acme")
+    store.close()
+
+    reopened = EntityStore(db_path)
+    try:
+        assert reopened.query_entity("Alice")["attributes"] == {"role": "engineer"}
+        assert reopened.get_relations("Acme") == [
+            {"relation": "works_at", "target": "Alice", "direction": "incoming"}
+        ]
+        if reopened._has_fts:
+            assert [e["name"] for e in reopened.search_entities("Alic")] == ["Alice"]
+        assert (db_path.stat().st_mode & 0o777) == 0o600
+    finally:
+        reopened.close()
+
@@ -0,0 +1,20 @@
+"""Tests for structured error logging."""
+
+from pathlib import Path
+
+from nanobot.agent.errors import ErrorCategory, ErrorLogger
+
+
+def test_recent_errors_are_persisted_and_filtered(tmp_path: Path) -> None:
+    errors = ErrorLogger(tmp_path)
+    errors.log(ErrorCategory.NETWORK, "timeout", "TimeoutError", severity="warning")
+    errors.log(ErrorCategory.NETWORK, "refused", "ConnectionError")
+    errors.log(ErrorCategory.FILESYSTEM, "missing", "FileNotFoundError")
+
+    recent = errors.get_recent_errors()
+    assert [r["error_message"] for r in recent] == ["missing", "refused", "timeout"]
+    assert recent[0]["category"] == "filesystem"
+
+    network = errors.get_recent_errors(category="network")
+    assert [r["error_message"] for r in network] == ["refused", "timeout"]
+    assert errors.get_recent_errors(category="network", severity="warning", limit=5) == [network[1]]
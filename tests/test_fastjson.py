@@ -0,0 +1,28 @@
+"""Tests for the fast JSON serialization helper."""
+
+import json
+
+from nanobot.utils.fastjson import dumps, loads
+
+
+def test_dumps_round_trips_tool_arguments() -> None:
+    args = {"path": "notes/日记.md", "content": "line 1\nline 2", "nested": {"n": [1, 2.5, None]}}
+    assert json.loads(dumps(args)) == args
+
+
+def test_dumps_falls_back_for_non_string_keys() -> None:
+    assert json.loads(dumps({1: "a"})) == {"1": "a"}
+
+
+def test_dumps_handles_big_integers() -> None:
+    assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+
+
+def test_dumps_sort_keys_is_order_independent() -> None:
+    assert dumps({"b": 1, "a": 2}, sort_keys=True) == dumps({"a": 2, "b": 1}, sort_keys=True)
+    assert dumps({2: "x", 1: "y"}, sort_keys=True) == json.dumps({1: "y", 2: "x"})
+
+
+def test_loads_parses_what_dumps_writes() -> None:
+    attrs = {"city": "Zürich", "tags": ["a", "b"], "n": 1.5}
+    assert loads(dumps(attrs)) == attrs
@@ -24,6 +24,7 @@ from nanobot.agent.memory.store import (
     TOOLS_NAMESPACE,
     USER_NAMESPACE,
     VALID_NAMESPACE_PATTERN,
+    EmbeddingService,
 )
 
 
@@ -285,6 +286,74 @@ async def test_extract_falls_back_to_heuristic_on_llm_failure() -> None:
     assert metrics.heuristic_fallbacks == 1
 
 
+@pytest.mark.asyncio
+async def test_extract_all_uses_single_llm_call() -> None:
+    """extract_all() returns facts, lessons and tool lessons from one completion."""
+    extractor = MemoryExtractor(model="gpt-4o-mini", max_facts=5)
+    messages = [
+        {"role": "user", "content": "My name is Alice and I work at Acme Corp."},
+        {"role": "assistant", "content": "I used tabs for indentation."},
+        {"role": "user", "content": "I prefer concise answers."},
+        {"role": "tool", "name": "exec", "content": "Error: command not found"},
+        {"role": "user", "content": "Actually, use spaces instead. That was wrong."},
+    ]
+    llm_response = MagicMock()
+    llm_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content=json.dumps({
+                    "facts": [
+                        {"type": "user", "fact": "User name is Alice", "importance": "high"},
+                    ],
+                    "lessons": [
+                        {
+                            "correction": 1,
+                            "lesson": "When formatting code, prefer spaces over tabs",
+                            "category": "tool_usage",
+                            "importance": "high",
+                        }
+                    ],
+                })
+            )
+        )
+    ]
+    mock = AsyncMock(return_value=llm_response)
+    with patch("litellm.acompletion", new=mock):
+        extracted = await extractor.extract_all(messages)
+
+    assert mock.await_count == 1
+    assert mock.await_args.kwargs["response_format"] == {"type": "json_object"}
+    assert [f.content for f in extracted["facts"]] == ["User name is Alice"]
+    assert extracted["lessons"][0].source == "llm_lesson"
+    assert "spaces" in extracted["lessons"][0].content
+    assert extracted["tool_lessons"][0].fact_type == "tool_lesson"
+
+    with patch("litellm.acompletion", new=AsyncMock(return_value=llm_response)):
+        extracted = await extractor.extract_all(messages, include_tool_lessons=False)
+    assert extracted["tool_lessons"] == []
+
+
+@pytest.mark.asyncio
+async def test_extract_all_falls_back_on_llm_failure() -> None:
+    """extract_all() uses heuristic facts and raw corrections when the LLM fails."""
+    extractor = MemoryExtractor(model="gpt-4o-mini", max_facts=5)
+    messages = [
+        {"role": "user", "content": "My name is Alice and I work at Acme Corp."},
+        {"role": "assistant", "content": "I used tabs for indentation."},
+        {"role": "user", "content": "I prefer dark themes."},
+        {"role": "assistant", "content": "Noted."},
+        {"role": "user", "content": "Actually, use spaces instead. That was wrong."},
+    ]
+    with patch("litellm.acompletion", new=AsyncMock(side_effect=RuntimeError("API down"))):
+        extracted = await extractor.extract_all(messages)
+
+    assert len(extracted["facts"]) >= 1
+    assert extracted["lessons"][0].source == "lesson"
+    metrics = extractor.get_metrics()
+    assert metrics.llm_failures == 1
+    assert metrics.heuristic_fallbacks == 1
+
+
 @pytest.mark.asyncio
 async def test_extract_for_pre_compaction_with_mocked_llm() -> None:
     """extract_for_pre_compaction parses LLM JSON into ExtractedFacts."""
@@ -421,6 +490,72 @@ def test_fact_type_in_metadata_on_store() -> None:
     assert metadata.get("importance") == 0.8
 
 
+@pytest.mark.asyncio
+async def test_consolidate_runs_store_calls_on_executor() -> None:
+    """With an executor, blocking store calls leave the event loop thread."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    threads: list[str] = []
+    store = MagicMock()
+
+    def _search(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return []
+
+    store.search.side_effect = _search
+    store.add.return_value = MagicMock(id="test-id")
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="mem") as pool:
+        con = MemoryConsolidator(store=store, model="gpt-4o-mini", executor=pool)
+        fact = ExtractedFact(content="User prefers Python", importance=0.8, source="llm")
+        results = await con.consolidate([fact], namespace="default")
+
+    assert results[0].operation == Operation.ADD
+    store.add.assert_called_once()
+    assert threads and threads[0].startswith("mem")
+
+
+def test_embed_batch_sends_cache_misses_in_one_request() -> None:
+    """embed_batch issues one request for all uncached texts and fills the cache."""
+    service = EmbeddingService(model="fake-embedding")
+    requests: list[list[str]] = []
+
+    def _embed_many(texts: list[str]) -> list[list[float]]:
+        requests.append(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    service._embed_many = _embed_many
+    service.embed("alpha")
+    vectors = service.embed_batch(["alpha", "beta", "gamma", "beta"])
+
+    assert requests == [["alpha"], ["beta", "gamma"]]
+    assert vectors == [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0], [4.0, 1.0]]
+    assert service.embed("gamma") == [5.0, 1.0]
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_consolidate_prefetches_embeddings_in_one_batch() -> None:
+    """consolidate embeds every fact up front in a single batched call."""
+    store = MagicMock()
+    store.search.return_value = []
+    store.add.return_value = MagicMock(id="test-id")
+
+    con = MemoryConsolidator(store=store, model="gpt-4o-mini")
+    facts = [
+        ExtractedFact(content="User prefers Python", importance=0.8, source="llm"),
+        ExtractedFact(content="User lives in Lisbon", importance=0.6, source="llm"),
+        ExtractedFact(content="hi", importance=0.5, source="llm"),
+    ]
+    await con.consolidate(facts, namespace="default")
+
+    store.embedding_service.embed_batch.assert_called_once_with(
+        ["User prefers Python", "User lives in Lisbon"]
+    )
+    assert store.add.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # ConsolidationMetrics / Operation enum
 # ---------------------------------------------------------------------------
@@ -537,3 +672,138 @@ def test_memory_extraction_config_defaults() -> None:
 
     cfg2 = MemoryExtractionConfig(**{"extractionModel": "claude-3-haiku"})
     assert cfg2.extraction_model == "claude-3-haiku"
+
+
+def test_extraction_due_only_on_interval_with_pipeline(tmp_path) -> None:
+    """Periodic extraction is scheduled only when the pipeline exists and the interval hits."""
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.session.manager import Session
+
+    provider = MagicMock()
+    provider.get_default_model.return_value = "fake-model"
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+    loop._extraction_interval = 3
+    session = Session(key="test:1")
+    for _ in range(3):
+        session.add_message("user", "hi")
+
+    assert not loop._extraction_due(session)
+
+    loop._extractor = MagicMock()
+    loop._consolidator = MagicMock()
+    assert loop._extraction_due(session)
+    session.add_message("user", "one more")
+    assert not loop._extraction_due(session)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_consolidation_checks_duplicates_in_turn() -> None:
+    """Concurrent runs on one namespace search only after the previous write."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls: list[str] = []
+    store = MagicMock()
+
+    def _search(*args, **kwargs):
+        calls.append("search")
+        return []
+
+    def _add(*args, **kwargs):
+        calls.append("add")
+        return MagicMock(id="test-id")
+
+    store.search.side_effect = _search
+    store.add.side_effect = _add
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        con = MemoryConsolidator(store=store, model="gpt-4o-mini", executor=pool)
+        fact = ExtractedFact(content="User prefers Python", importance=0.8, source="llm")
+        await asyncio.gather(
+            con.consolidate([fact], namespace="default"),
+            con.consolidate([fact], namespace="default"),
+        )
+
+    assert calls == ["search", "add", "search", "add"]
+
+
+def test_embedding_service_reuses_disk_cache_across_instances(tmp_path) -> None:
+    """A second service on the same cache file never re-requests known texts."""
+    requests: list[list[str]] = []
+
+    def _embed_many(texts: list[str]) -> list[list[float]]:
+        requests.append(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    first = EmbeddingService(model="fake-embedding", cache_path=tmp_path / "cache.db")
+    first._embed_many = _embed_many
+    first.embed_batch(["alpha", "beta"])
+
+    second = EmbeddingService(model="fake-embedding", cache_path=tmp_path / "cache.db")
+    second._embed_many = _embed_many
+    assert second.embed_batch(["beta", "gamma", "alpha"]) == [
+        [4.0, 1.0],
+        [5.0, 1.0],
+        [5.0, 1.0],
+    ]
+    assert requests == [["alpha", "beta"], ["gamma"]]
+
+
+def test_init_extraction_builds_consolidator(tmp_path) -> None:
+    """Enabling extraction wires up the extractor and consolidator."""
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.schema import MemoryConfig, MemoryExtractionConfig
+
+    provider = MagicMock()
+    provider.get_default_model.return_value = "fake-model"
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        memory_config=MemoryConfig(embedding_cache_path=str(tmp_path / "embed_cache.db")),
+        memory_extraction=MemoryExtractionConfig(enabled=True),
+    )
+    loop._init_extraction()
+
+    assert loop._extractor is not None
+    assert loop._consolidator is not None
+
+
+@pytest.mark.asyncio
+async def test_extract_all_matches_lessons_by_correction_number() -> None:
+    """A dropped lesson does not shift later lessons onto the wrong correction."""
+    extractor = MemoryExtractor(model="gpt-4o-mini", max_facts=5)
+    messages = [
+        {"role": "assistant", "content": "I used tabs for indentation."},
+        {"role": "user", "content": "Actually, use spaces instead. That was wrong."},
+        {"role": "assistant", "content": "Here is a long essay about it."},
+        {"role": "user", "content": "In the future, keep answers short."},
+    ]
+    llm_response = MagicMock()
+    llm_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content=json.dumps({
+                    "facts": [],
+                    "lessons": [
+                        {"correction": 1, "lesson": "Use spaces", "category": "bogus"},
+                        {
+                            "correction": 2,
+                            "lesson": "When answering, prefer brevity",
+                            "category": "communication",
+                        },
+                    ],
+                })
+            )
+        )
+    ]
+    with patch("litellm.acompletion", new=AsyncMock(return_value=llm_response)):
+        extracted = await extractor.extract_all(messages, include_tool_lessons=False)
+
+    first, second = extracted["lessons"]
+    assert first.source == "lesson"
+    assert "spaces" in first.content
+    assert second.source == "llm_lesson"
+    assert "brevity" in second.content
@@ -0,0 +1,224 @@
+"""Tests for tool-call execution in the agent loop."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.tools.base import Tool
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import IntentConfig, StreamingConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallRequest
+
+
+class StubProvider(LLMProvider):
+    def __init__(self) -> None:
+        super().__init__(api_key="fake-key", api_base=None)
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="ok")
+
+    def get_default_model(self) -> str:
+        return "fake-model"
+
+
+class RecordingTool(Tool):
+    """Tool that records start/end events to a shared log."""
+
+    def __init__(self, name: str, log: list[str], parallel_safe: bool) -> None:
+        self._name = name
+        self._log = log
+        self.parallel_safe = parallel_safe
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "recording tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        self._log.append(f"start:{self._name}")
+        await asyncio.sleep(0.01)
+        self._log.append(f"end:{self._name}")
+        return self._name
+
+
+@pytest.fixture
+def agent(tmp_path: Path):
+    from nanobot.agent.loop import AgentLoop
+
+    return AgentLoop(bus=MessageBus(), provider=StubProvider(), workspace=tmp_path)
+
+
+def _call(name: str) -> ToolCallRequest:
+    return ToolCallRequest(id=f"call_{name}", name=name, arguments={})
+
+
+@pytest.mark.asyncio
+async def test_reads_overlap_and_writes_stay_ordered(agent) -> None:
+    log: list[str] = []
+    for name, safe in [("r1", True), ("r2", True), ("w1", False), ("r3", True)]:
+        agent.tools.register(RecordingTool(name, log, parallel_safe=safe))
+
+    calls = [_call("r1"), _call("r2"), _call("w1"), _call("r3")]
+    results = await agent.tools.run_calls(
+        calls, lambda tc: agent.tools.execute(tc.name, tc.arguments)
+    )
+
+    assert results == ["r1", "r2", "w1", "r3"]
+    # r1 and r2 run concurrently; w1 only starts after both finish
+    assert log[:2] == ["start:r1", "start:r2"]
+    assert log.index("start:w1") > log.index("end:r2")
+    assert log.index("start:r3") > log.index("end:w1")
+
+
+@pytest.mark.asyncio
+async def test_failures_are_returned_in_place(agent) -> None:
+    async def run_one(tc: ToolCallRequest) -> str:
+        if tc.name == "boom":
+            raise RuntimeError("kaput")
+        return tc.name
+
+    results = await agent.tools.run_calls([_call("boom"), _call("fine")], run_one)
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == "fine"
+
+
+def test_builtin_read_only_tools_are_parallel_safe(agent) -> None:
+    assert agent.tools.get("read_file").parallel_safe
+    assert agent.tools.get("list_dir").parallel_safe
+    assert not agent.tools.get("write_file").parallel_safe
+    assert not agent.tools.get("exec").parallel_safe
+
+
+class StreamingToolProvider(StubProvider):
+    """Streams a read call, then a write call; answers plainly afterwards."""
+
+    def __init__(self, log: list[str]) -> None:
+        super().__init__()
+        self._log = log
+        self.streamed = False
+
+    async def stream(self, messages: list[dict[str, Any]], **kwargs: Any):
+        if self.streamed:
+            yield StreamChunk(content="done", finish_reason="stop")
+            return
+        self.streamed = True
+        yield StreamChunk(tool_calls=[_call("r1")])
+        await asyncio.sleep(0.05)
+        self._log.append("stream:end")
+        yield StreamChunk(tool_calls=[_call("w1")], finish_reason="tool_calls")
+
+
+@pytest.mark.asyncio
+async def test_early_dispatch_starts_leading_reads_while_streaming(tmp_path: Path) -> None:
+    from nanobot.agent.loop import AgentLoop
+
+    log: list[str] = []
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=StreamingToolProvider(log),
+        workspace=tmp_path,
+        intent_config=IntentConfig(enabled=False),
+        streaming_config=StreamingConfig(early_tool_dispatch=True),
+    )
+    loop.tools.register(RecordingTool("r1", log, parallel_safe=True))
+    loop.tools.register(RecordingTool("w1", log, parallel_safe=False))
+
+    out = await loop._process_message(
+        InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="go")
+    )
+
+    assert out is not None and out.content == "done"
+    # r1 finished before the stream did; w1 waited for the full response
+    assert log.index("end:r1") < log.index("stream:end")
+    assert log.index("start:w1") > log.index("stream:end")
+    assert log.count("start:r1") == 1
+
+
+class RepeatingToolProvider(StubProvider):
+    """Requests the same tool call on every turn."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=None, tool_calls=[_call("r1")])
+
+
+@pytest.mark.asyncio
+async def test_repeated_tool_calls_abort_the_turn(tmp_path: Path) -> None:
+    from nanobot.agent.loop import AgentLoop
+
+    provider = RepeatingToolProvider()
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        intent_config=IntentConfig(enabled=False),
+    )
+    log: list[str] = []
+    loop.tools.register(RecordingTool("r1", log, parallel_safe=True))
+
+    out = await loop._process_message(
+        InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="go")
+    )
+
+    assert out is not None and "tool-call loop" in out.content
+    assert provider.calls == 3
+    assert log.count("start:r1") == 2
+
+
+class IdlessStreamingProvider(StubProvider):
+    """Streams two read calls without ids, then records the follow-up request."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.followup: list[dict[str, Any]] = []
+
+    async def stream(self, messages: list[dict[str, Any]], **kwargs: Any):
+        if self.followup or any(m.get("role") == "tool" for m in messages):
+            self.followup = messages
+            yield StreamChunk(content="done", finish_reason="stop")
+            return
+        yield StreamChunk(tool_calls=[ToolCallRequest(id="", name="r1", arguments={})])
+        yield StreamChunk(
+            tool_calls=[ToolCallRequest(id="", name="r2", arguments={})],
+            finish_reason="tool_calls",
+        )
+
+
+@pytest.mark.asyncio
+async def test_early_dispatch_handles_missing_call_ids(tmp_path: Path) -> None:
+    from nanobot.agent.loop import AgentLoop
+
+    provider = IdlessStreamingProvider()
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        intent_config=IntentConfig(enabled=False),
+        streaming_config=StreamingConfig(early_tool_dispatch=True),
+    )
+    log: list[str] = []
+    loop.tools.register(RecordingTool("r1", log, parallel_safe=True))
+    loop.tools.register(RecordingTool("r2", log, parallel_safe=True))
+
+    await loop._process_message(
+        InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="go")
+    )
+
+    assert log.count("start:r1") == 1
+    assert log.count("start:r2") == 1
+    tool_results = [m for m in provider.followup if m.get("role") == "tool"]
+    assert [(m["name"], m["content"]) for m in tool_results] == [("r1", "r1"), ("r2", "r2")]
@@ -1,6 +1,9 @@
 """Tests for progress event types."""
 
+import pytest
+
 from nanobot.bus.progress import ProgressEvent, ProgressKind
+from nanobot.bus.queue import MessageBus
 
 
 def test_progress_kind_values():
@@ -38,3 +41,22 @@ def test_progress_event_full():
     assert event.tool_name == "exec"
     assert event.iteration == 3
     assert event.metadata == {"key": "val"}
+
+
+@pytest.mark.asyncio
+async def test_bus_publishes_progress_batch_in_order():
+    bus = MessageBus()
+    seen: list[tuple[str, int]] = []
+
+    async def _web(event: ProgressEvent) -> None:
+        seen.append(("web", event.iteration))
+
+    bus.subscribe_progress("web", _web)
+    await bus.publish_progress_batch(
+        [
+            ProgressEvent(channel="web", chat_id="1", kind=ProgressKind.TOOL_START, iteration=1),
+            ProgressEvent(channel="cli", chat_id="1", kind=ProgressKind.TOOL_START, iteration=2),
+            ProgressEvent(channel="web", chat_id="1", kind=ProgressKind.TOOL_COMPLETE, iteration=3),
+        ]
+    )
+    assert seen == [("web", 1), ("web", 3)]
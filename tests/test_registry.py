@@ -194,6 +194,18 @@ class TestPulseAndStale:
         agent = run(registry.get_agent("a1"))
         assert agent["last_pulse_at"] >= before
 
+    def test_record_pulse_many(self, registry):
+        run(registry.register_agent("a1", "sub"))
+        run(registry.register_agent("a2", "sub"))
+        run(registry.register_agent("a3", "sub"))
+        untouched = run(registry.get_agent("a3"))["last_pulse_at"]
+        before = time.time()
+        run(registry.record_pulse_many(["a1", "a2"]))
+        run(registry.record_pulse_many([]))
+        assert run(registry.get_agent("a1"))["last_pulse_at"] >= before
+        assert run(registry.get_agent("a2"))["last_pulse_at"] >= before
+        assert run(registry.get_agent("a3"))["last_pulse_at"] == untouched
+
     def test_mark_stale_agents(self, registry):
         run(registry.register_agent("a1", "sub"))
         run(registry.update_agent_state("a1", AgentState.INIT))
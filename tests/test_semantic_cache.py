@@ -0,0 +1,282 @@
+"""Tests for the semantic response cache."""
+
+import hashlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.semantic_cache import RecentResponseCache, SemanticResponseCache
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class FakeEmbeddingService:
+    """Word-hash embeddings: texts sharing words are similar."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def embed_single(self, text: str) -> list[float]:
+        self.calls += 1
+        vec = [0.0] * 64
+        for word in text.lower().split():
+            idx = int(hashlib.md5(word.encode()).hexdigest(), 16) % 64
+            vec[idx] += 1.0
+        return vec
+
+
+class CountingProvider(LLMProvider):
+    """Provider that numbers its replies and counts calls."""
+
+    def __init__(self) -> None:
+        super().__init__(api_key="fake-key", api_base=None)
+        self.call_count = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.call_count += 1
+        return LLMResponse(content=f"Paris is lovely in spring. ({self.call_count})")
+
+    def get_default_model(self) -> str:
+        return "fake-model"
+
+
+@pytest.fixture
+def embeddings() -> FakeEmbeddingService:
+    return FakeEmbeddingService()
+
+
+@pytest.fixture
+def cache(tmp_path: Path, embeddings: FakeEmbeddingService):
+    c = SemanticResponseCache(tmp_path / "cache.db", embeddings, threshold=0.9)
+    yield c
+    c.close()
+
+
+@pytest.mark.asyncio
+async def test_miss_returns_embedding(cache: SemanticResponseCache) -> None:
+    content, embedding = await cache.lookup("s:1", "tell me about paris")
+    assert content is None
+    assert embedding is not None
+
+
+@pytest.mark.asyncio
+async def test_exact_hit_skips_embedding(
+    cache: SemanticResponseCache, embeddings: FakeEmbeddingService
+) -> None:
+    await cache.store("s:1", "tell me about paris", "Paris answer")
+    calls = embeddings.calls
+    content, _ = await cache.lookup("s:1", "tell me about paris")
+    assert content == "Paris answer"
+    assert embeddings.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_semantic_hit(cache: SemanticResponseCache) -> None:
+    await cache.store("s:1", "tell me about paris please", "Paris answer")
+    content, _ = await cache.lookup("s:1", "please tell me about paris")
+    assert content == "Paris answer"
+
+
+@pytest.mark.asyncio
+async def test_dissimilar_prompt_misses(cache: SemanticResponseCache) -> None:
+    await cache.store("s:1", "tell me about paris", "Paris answer")
+    content, _ = await cache.lookup("s:1", "how do I bake sourdough bread")
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated(cache: SemanticResponseCache) -> None:
+    await cache.store("s:1", "tell me about paris", "Paris answer")
+    content, _ = await cache.lookup("s:2", "tell me about paris")
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_isolated(cache: SemanticResponseCache) -> None:
+    await cache.store("s:1", "what does it mean", "Meaning of A", context="reply A")
+    content, _ = await cache.lookup("s:1", "what does it mean", context="reply B")
+    assert content is None
+    content, _ = await cache.lookup("s:1", "what does it mean", context="reply A")
+    assert content == "Meaning of A"
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_miss(tmp_path: Path, embeddings: FakeEmbeddingService) -> None:
+    c = SemanticResponseCache(tmp_path / "cache.db", embeddings, ttl_s=-1)
+    await c.store("s:1", "tell me about paris", "Paris answer")
+    content, _ = await c.lookup("s:1", "tell me about paris")
+    c.close()
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate(cache: SemanticResponseCache) -> None:
+    await cache.store("s:1", "tell me about paris", "Paris answer")
+    cache.invalidate("s:1")
+    content, _ = await cache.lookup("s:1", "tell me about paris")
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_serves_repeat_from_cache(
+    tmp_path: Path, cache: SemanticResponseCache
+) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.config.schema import IntentConfig
+
+    provider = CountingProvider()
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        intent_config=IntentConfig(enabled=False),
+    )
+    loop._response_cache = cache
+
+    def _msg(metadata: dict[str, Any] | None = None) -> InboundMessage:
+        return InboundMessage(
+            channel="test",
+            sender_id="u1",
+            chat_id="c1",
+            content="tell me about paris",
+            metadata=metadata or {},
+        )
+
+    first = await loop._process_message(_msg())
+    calls = provider.call_count
+    build_messages = loop.context.build_messages
+    built: list[int] = []
+
+    def _counting_build(*args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        built.append(1)
+        return build_messages(*args, **kwargs)
+
+    loop.context.build_messages = _counting_build
+    second = await loop._process_message(_msg())
+    assert second.content == first.content
+    assert provider.call_count == calls
+    assert not built  # a cache hit never assembles the prompt
+
+    await loop._process_message(_msg({"no_cache": True}))
+    assert provider.call_count > calls
+
+    # Editing a prompt source (here a bootstrap file) moves to a fresh context
+    calls = provider.call_count
+    (tmp_path / "USER.md").write_text("The user lives in Lyon.")
+    third = await loop._process_message(_msg())
+    assert provider.call_count > calls
+    assert third.content != first.content
+
+
+def test_system_prompt_digest_ignores_the_clock(tmp_path: Path) -> None:
+    from nanobot.agent.context import ContextBuilder
+
+    builder = ContextBuilder(workspace=tmp_path)
+    builder._current_time = lambda: "2026-01-01 09:00 (Thursday)"
+    morning, morning_digest = builder.build_system_prompt_with_digest()
+    builder._current_time = lambda: "2026-01-01 17:30 (Thursday)"
+    evening, evening_digest = builder.build_system_prompt_with_digest()
+
+    assert "09:00" in morning and "17:30" in evening
+    assert morning_digest == evening_digest
+
+    (tmp_path / "SOUL.md").write_text("Be terse.")
+    assert builder.build_system_prompt_with_digest()[1] != evening_digest
+
+
+@pytest.mark.asyncio
+async def test_recent_cache_hits_similar_text(embeddings: FakeEmbeddingService) -> None:
+    recent = RecentResponseCache(embeddings, threshold=0.95)
+    content, embedding = await recent.lookup("s:1", "subagent still running step 3")
+    assert content is None
+    recent.remember("s:1", embedding, "Noted, still working.")
+
+    content, _ = await recent.lookup("s:1", "subagent still running step 3")
+    assert content == "Noted, still working."
+    content, _ = await recent.lookup("s:2", "subagent still running step 3")
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_recent_cache_window_is_bounded(embeddings: FakeEmbeddingService) -> None:
+    recent = RecentResponseCache(embeddings, window=2)
+    for i in range(3):
+        _, embedding = await recent.lookup("s:1", f"announce number {i}")
+        recent.remember("s:1", embedding, f"reply {i}")
+
+    content, _ = await recent.lookup("s:1", "announce number 0")
+    assert content is None
+    content, _ = await recent.lookup("s:1", "announce number 2")
+    assert content == "reply 2"
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_reuses_reply_for_repeated_announce(
+    tmp_path: Path, embeddings: FakeEmbeddingService
+) -> None:
+    from nanobot.agent.loop import AgentLoop
+
+    provider = CountingProvider()
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+    loop._announce_cache = RecentResponseCache(embeddings)
+
+    announce = InboundMessage(
+        channel="system",
+        sender_id="subagent",
+        chat_id="test:c1",
+        content="Subagent report: build still running",
+    )
+    first = await loop._process_message(announce)
+    calls = provider.call_count
+    second = await loop._process_message(announce)
+    assert second.content == first.content
+    assert provider.call_count == calls
+
+
+@pytest.mark.asyncio
+async def test_auto_recall_skips_search_on_empty_store(
+    tmp_path: Path, embeddings: FakeEmbeddingService
+) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.memory.vectors import VectorStore
+
+    loop = AgentLoop(bus=MessageBus(), provider=CountingProvider(), workspace=tmp_path)
+    loop.vector_store = VectorStore(tmp_path / "vectors.db", embeddings)
+
+    assert await loop._auto_recall("tell me about paris") is None
+    assert embeddings.calls == 0
+
+    await loop.vector_store.add("Paris trip planned for May", skip_dedup=True)
+    calls = embeddings.calls
+    assert "Paris trip" in (await loop._auto_recall("paris trip") or "")
+    assert embeddings.calls > calls
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_builds_the_system_prompt_once(
+    tmp_path: Path, cache: SemanticResponseCache
+) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.config.schema import IntentConfig
+
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=CountingProvider(),
+        workspace=tmp_path,
+        intent_config=IntentConfig(enabled=False),
+    )
+    loop._response_cache = cache
+    build = loop.context.build_system_prompt_with_digest
+    builds: list[int] = []
+
+    def _counting_build(*args: Any, **kwargs: Any) -> tuple[str, str]:
+        builds.append(1)
+        return build(*args, **kwargs)
+
+    loop.context.build_system_prompt_with_digest = _counting_build
+    await loop._process_message(
+        InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="hello there")
+    )
+    assert len(builds) == 1
@@ -0,0 +1,51 @@
+"""Tests for Session history formatting."""
+
+from nanobot.session.manager import Session
+
+
+def test_get_history_is_memoized_until_next_message() -> None:
+    session = Session(key="test:1")
+    session.add_message("user", "hi")
+    session.add_message("assistant", "hello")
+
+    first = session.get_history(max_tokens=1000)
+    assert session.get_history(max_tokens=1000) == first
+
+    session.add_message("user", "again")
+    history = session.get_history(max_tokens=1000)
+    assert [m["content"] for m in history] == ["hi", "hello", "again"]
+
+
+def test_get_history_returns_independent_lists() -> None:
+    session = Session(key="test:1")
+    session.add_message("user", "hi")
+
+    history = session.get_history()
+    history.append({"role": "user", "content": "injected"})
+    assert len(session.get_history()) == 1
+
+
+def test_get_history_sees_direct_message_edits_and_clear() -> None:
+    session = Session(key="test:1")
+    session.add_message("user", "hi")
+    assert len(session.get_history()) == 1
+
+    session.messages.append({"role": "assistant", "content": "direct"})
+    assert len(session.get_history()) == 2
+
+    session.clear()
+    assert session.get_history() == []
+
+
+def test_user_count_tracks_added_and_restored_messages() -> None:
+    session = Session(key="test:1")
+    session.add_message("user", "one")
+    session.add_message("assistant", "reply")
+    session.add_message("user", "two")
+    assert session.user_count == 2
+
+    restored = Session(key="test:1", messages=list(session.messages))
+    assert restored.user_count == 2
+
+    session.clear()
+    assert session.user_count == 0
@@ -0,0 +1,398 @@
+"""Tests for background subagent execution."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.plan_cache import PlanCache, workspace_digest
+from nanobot.agent.subagent import (
+    SubagentManager,
+    ToolRunCache,
+    _ProgressBatcher,
+    _trim_history,
+)
+from nanobot.agent.tools.base import Tool
+from nanobot.bus.progress import ProgressEvent, ProgressKind
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class ScriptedProvider(LLMProvider):
+    """Replays a fixed sequence of responses, then answers plainly."""
+
+    def __init__(self, responses: list[LLMResponse]) -> None:
+        super().__init__(api_key="fake-key", api_base=None)
+        self._responses = list(responses)
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        if self._responses:
+            return self._responses.pop(0)
+        return LLMResponse(content="all done")
+
+    def get_default_model(self) -> str:
+        return "fake-model"
+
+
+class CountingReadTool(Tool):
+    """Stand-in for read_file that counts executions."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+
+    @property
+    def name(self) -> str:
+        return "read_file"
+
+    @property
+    def description(self) -> str:
+        return "read a file"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"path": {"type": "string"}}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        self.runs += 1
+        return f"contents of {kwargs['path']}"
+
+
+def _read(call_id: str, path: str) -> LLMResponse:
+    return LLMResponse(
+        content=None,
+        tool_calls=[ToolCallRequest(id=call_id, name="read_file", arguments={"path": path})],
+    )
+
+
+def test_tool_run_cache_memoizes_pure_calls(tmp_path: Path) -> None:
+    cache = ToolRunCache()
+    args = {"path": str(tmp_path / "a.txt")}
+    assert cache.get("read_file", args) is None
+
+    cache.record("read_file", args, "hello")
+    assert cache.get("read_file", dict(args)) == "hello"
+
+    cache.record("exec", {"command": "ls"}, "ok")
+    assert cache.get("exec", {"command": "ls"}) is None
+
+
+def test_tool_run_cache_skips_errors(tmp_path: Path) -> None:
+    cache = ToolRunCache()
+    args = {"path": str(tmp_path / "missing.txt")}
+    cache.record("read_file", args, "Error: File not found")
+    assert cache.get("read_file", args) is None
+
+
+def test_tool_run_cache_invalidation(tmp_path: Path) -> None:
+    cache = ToolRunCache()
+    a = {"path": str(tmp_path / "a.txt")}
+    b = {"path": str(tmp_path / "b.txt")}
+    listing = {"path": str(tmp_path)}
+    search = {"query": "nanobot"}
+    for name, args in [("read_file", a), ("read_file", b), ("list_dir", listing)]:
+        cache.record(name, args, "cached")
+    cache.record("web_search", search, "results")
+
+    cache.record("write_file", {"path": a["path"], "content": "new"}, "ok")
+    assert cache.get("read_file", a) is None
+    assert cache.get("list_dir", listing) is None
+    assert cache.get("read_file", b) == "cached"
+
+    cache.record("exec", {"command": "rm -rf ."}, "ok")
+    assert cache.get("read_file", b) is None
+    assert cache.get("web_search", search) == "results"
+
+
+@pytest.mark.asyncio
+async def test_subagent_reuses_repeated_reads(tmp_path: Path) -> None:
+    provider = ScriptedProvider([_read("c1", "notes.txt"), _read("c2", "notes.txt")])
+    manager = SubagentManager(provider=provider, workspace=tmp_path, bus=MessageBus())
+    reader = CountingReadTool()
+    manager._base_tools.register(reader)
+
+    await manager._run_subagent(
+        "t1", "summarize notes", "notes", {"channel": "cli", "chat_id": "direct"}, silent=True
+    )
+
+    assert provider.calls == 3
+    assert reader.runs == 1
+
+
+def test_workspace_digest_tracks_visible_files(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("one")
+    before = workspace_digest(tmp_path)
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "state").write_text("ignored")
+    assert workspace_digest(tmp_path) == before
+
+    (tmp_path / "b.txt").write_text("two")
+    assert workspace_digest(tmp_path) != before
+    assert workspace_digest(tmp_path, max_entries=1) is None
+
+
+def test_plan_cache_roundtrip_expiry_and_eviction(tmp_path: Path) -> None:
+    cache = PlanCache(tmp_path / "plans")
+    key = PlanCache.make_key("task", "model", "digest")
+    assert cache.get(key) is None
+    cache.put(key, "result")
+    assert cache.get(key) == "result"
+
+    expired = PlanCache(tmp_path / "plans", ttl_s=-1)
+    assert expired.get(key) is None
+
+    small = PlanCache(tmp_path / "small", max_bytes=1)
+    small.put(key, "result")
+    assert small.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_subagent_reuses_cached_plan(tmp_path: Path) -> None:
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    provider = ScriptedProvider([])
+    manager = SubagentManager(
+        provider=provider,
+        workspace=workspace,
+        bus=MessageBus(),
+        plan_cache=PlanCache(tmp_path / "plans"),
+    )
+    origin = {"channel": "cli", "chat_id": "direct"}
+
+    await manager._run_subagent("t1", "summarize notes", "notes", origin, silent=True)
+    await manager._run_subagent("t2", "summarize notes", "notes", origin, silent=True)
+    assert provider.calls == 1
+
+    (workspace / "new.txt").write_text("changed")
+    await manager._run_subagent("t3", "summarize notes", "notes", origin, silent=True)
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_subagent_does_not_cache_runs_with_shell_commands(tmp_path: Path) -> None:
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    exec_call = ToolCallRequest(id="c1", name="exec", arguments={"command": "date"})
+    provider = ScriptedProvider(
+        [
+            LLMResponse(content=None, tool_calls=[exec_call]),
+            LLMResponse(content="it is today"),
+            LLMResponse(content=None, tool_calls=[exec_call]),
+        ]
+    )
+    manager = SubagentManager(
+        provider=provider,
+        workspace=workspace,
+        bus=MessageBus(),
+        plan_cache=PlanCache(tmp_path / "plans"),
+    )
+    origin = {"channel": "cli", "chat_id": "direct"}
+
+    await manager._run_subagent("t1", "what time is it", "time", origin, silent=True)
+    await manager._run_subagent("t2", "what time is it", "time", origin, silent=True)
+    assert provider.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_can_be_resized_live(tmp_path: Path) -> None:
+    manager = SubagentManager(
+        provider=ScriptedProvider([]), workspace=tmp_path, bus=MessageBus(), max_concurrent=1
+    )
+    release = asyncio.Event()
+    peak = 0
+
+    async def _hold() -> None:
+        nonlocal peak
+        async with manager._slot():
+            peak = max(peak, manager._active)
+            await release.wait()
+
+    holders = [asyncio.create_task(_hold()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert manager._active == 1
+
+    await manager.set_concurrency(3)
+    await asyncio.sleep(0)
+    assert manager._active == 3
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert peak == 3
+    assert manager._active == 0
+
+    with pytest.raises(ValueError):
+        await manager.set_concurrency(0)
+
+
+def test_concurrency_limit_comes_from_config(tmp_path: Path) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.config.schema import AgentDefaults
+
+    defaults = AgentDefaults.model_validate({"subagents": {"maxConcurrent": 2}})
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=ScriptedProvider([]),
+        workspace=tmp_path,
+        subagent_config=defaults.subagents,
+    )
+    assert loop.subagents._max_concurrent == 2
+    assert AgentDefaults().subagents.max_concurrent is None
+
+
+class HangingProvider(ScriptedProvider):
+    """Never answers, so the subagent runs until cancelled."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_subagents(tmp_path: Path) -> None:
+    provider = HangingProvider([])
+    manager = SubagentManager(
+        provider=provider, workspace=tmp_path, bus=MessageBus(), max_concurrent=1
+    )
+    assert "queued" not in await manager.spawn("first task")
+    assert "queued" in await manager.spawn("second task")
+    await asyncio.sleep(0.01)
+    assert manager.get_running_count() == 2
+    assert provider.calls == 1
+
+    assert {t.get_name() for t in manager._strong_refs} == set(manager._running_tasks)
+
+    await manager.stop()
+    await asyncio.sleep(0)
+    assert manager.get_running_count() == 0
+    assert manager._active == 0
+
+
+def test_subagent_prompt_fills_task_and_workspace(tmp_path: Path) -> None:
+    manager = SubagentManager(provider=ScriptedProvider([]), workspace=tmp_path, bus=MessageBus())
+    prompt = manager._build_subagent_prompt("render {braces} as-is")
+    assert "render {braces} as-is" in prompt
+    assert f"Your workspace is at: {tmp_path}" in prompt
+    assert "submit_proof" not in prompt
+    assert "submit_proof" in manager._build_subagent_prompt("task", has_registry=True)
+
+
+class SlowReadTool(CountingReadTool):
+    """Parallel-safe read that tracks how many calls overlap."""
+
+    parallel_safe = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute(self, **kwargs: Any) -> str:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().execute(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_subagent_runs_read_only_calls_concurrently(tmp_path: Path) -> None:
+    both = LLMResponse(
+        content=None,
+        tool_calls=[
+            ToolCallRequest(id="c1", name="read_file", arguments={"path": "a.txt"}),
+            ToolCallRequest(id="c2", name="read_file", arguments={"path": "b.txt"}),
+        ],
+    )
+    provider = ScriptedProvider([both])
+    manager = SubagentManager(provider=provider, workspace=tmp_path, bus=MessageBus())
+    reader = SlowReadTool()
+    manager._base_tools.register(reader)
+
+    await manager._run_subagent(
+        "t1", "compare files", "compare", {"channel": "cli", "chat_id": "direct"}, silent=True
+    )
+
+    assert reader.runs == 2
+    assert reader.peak == 2
+
+
+def _event(n: int) -> ProgressEvent:
+    return ProgressEvent(channel="cli", chat_id="direct", kind=ProgressKind.TOOL_START, iteration=n)
+
+
+@pytest.mark.asyncio
+async def test_progress_batcher_coalesces_and_flushes() -> None:
+    delivered: list[int] = []
+    batches = 0
+
+    async def _callback(events: list[ProgressEvent]) -> None:
+        nonlocal batches
+        batches += 1
+        delivered.extend(event.iteration for event in events)
+
+    batcher = _ProgressBatcher(_callback, max_events=3, interval_ms=10_000)
+    batcher.emit(_event(1))
+    batcher.emit(_event(2))
+    await asyncio.sleep(0)
+    assert delivered == []
+
+    batcher.emit(_event(3))
+    await asyncio.sleep(0.01)
+    assert delivered == [1, 2, 3]
+    assert batches == 1
+
+    batcher.emit(_event(4))
+    await batcher.flush()
+    await batcher.flush()
+    assert delivered == [1, 2, 3, 4]
+    assert batches == 2
+
+
+@pytest.mark.asyncio
+async def test_subagent_delivers_progress_before_finishing(tmp_path: Path) -> None:
+    kinds: list[ProgressKind] = []
+
+    async def _callback(events: list[ProgressEvent]) -> None:
+        kinds.extend(event.kind for event in events)
+
+    manager = SubagentManager(
+        provider=ScriptedProvider([_read("c1", "notes.txt")]),
+        workspace=tmp_path,
+        bus=MessageBus(),
+        progress_batch_callback=_callback,
+    )
+    manager._base_tools.register(CountingReadTool())
+
+    await manager._run_subagent(
+        "t1", "summarize notes", "notes", {"channel": "cli", "chat_id": "direct"}
+    )
+
+    assert kinds == [ProgressKind.TOOL_START, ProgressKind.TOOL_COMPLETE]
+
+
+def _turn(call_id: str, result: str) -> list[dict[str, Any]]:
+    call = {"id": call_id, "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [call]},
+        {"role": "tool", "tool_call_id": call_id, "name": "read_file", "content": result},
+    ]
+
+
+def test_trim_history_drops_oldest_whole_turns() -> None:
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "task"}]
+    for i in range(3):
+        messages += _turn(f"c{i}", "x" * 400)
+
+    assert _trim_history(messages, 10_000) == 0
+    assert len(messages) == 8
+
+    assert _trim_history(messages, 150) == 4
+    assert [m["role"] for m in messages] == ["system", "user", "assistant", "tool"]
+    assert messages[3]["tool_call_id"] == "c2"
+
+    # The in-flight turn is never dropped, even when over budget
+    assert _trim_history(messages, 1) == 0
+    assert len(messages) == 4
@@ -1,7 +1,11 @@
+from pathlib import Path
 from typing import Any
 
+import pytest
+
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.shell import ExecTool
 
 
 class SampleTool(Tool):
@@ -86,3 +90,65 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_registry_copy_shares_tools_but_not_registrations() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    defs = reg.get_definitions()
+
+    clone = reg.copy()
+    assert clone.get("sample") is reg.get("sample")
+    assert clone.get_definitions() is defs
+
+    reg.unregister("sample")
+    assert clone.has("sample")
+    assert not reg.has("sample")
+
+
+def test_registry_register_extends_cached_definitions() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    defs = reg.get_definitions()
+
+    clone = reg.copy()
+    clone.register(OtherTool())
+    assert [d["function"]["name"] for d in clone.get_definitions()] == ["sample", "other"]
+    assert reg.get_definitions() is defs
+    assert len(defs) == 1
+
+    clone.register(SampleTool())  # replacing a tool rebuilds the definitions
+    assert [d["function"]["name"] for d in clone.get_definitions()] == ["sample", "other"]
+
+
+class OtherTool(SampleTool):
+    @property
+    def name(self) -> str:
+        return "other"
+
+
+def test_exec_guard_uses_deny_allow_and_workspace_rules(tmp_path: Path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path), restrict_to_workspace=True)
+    cwd = str(tmp_path)
+    assert "dangerous pattern" in tool._guard_command("RM -rf build", cwd)
+    assert "dangerous pattern" in tool._guard_command("sudo shutdown now", cwd)
+    assert "outside working dir" in tool._guard_command("cat /etc/passwd", cwd)
+    assert tool._guard_command(f"ls {tmp_path}/sub", cwd) is None
+    assert tool._guard_command("echo hi", cwd) is None
+    assert "path traversal" in tool._guard_command("cat ..\\secret", cwd)
+
+    allow_only_ls = ExecTool(allow_patterns=[r"^ls\b", r"^pwd$"])
+    assert "not in allowlist" in allow_only_ls._guard_command("echo hi", cwd)
+    assert allow_only_ls._guard_command("ls -la", cwd) is None
+    assert allow_only_ls._guard_command("pwd", cwd) is None
+
+
+@pytest.mark.asyncio
+async def test_exec_caps_long_output_without_stopping_the_command(tmp_path: Path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path))
+    result = await tool.execute("head -c 50000 /dev/zero | tr '\\0' 'a'; touch done")
+    assert result.startswith("a" * 100)
+    assert result.endswith("(truncated, 40000 more chars)")
+    assert (tmp_path / "done").exists()
+
+    assert await tool.execute("echo hi") == "hi\n"
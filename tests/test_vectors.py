@@ -0,0 +1,90 @@
+"""Tests for the SQLite vector store's int8 scan path."""
+
+import hashlib
+import sqlite3
+import struct
+from pathlib import Path
+
+import pytest
+
+from nanobot.memory.vectors import CURRENT_SCHEMA_VERSION, VectorStore, _quantize_int8
+
+
+class FakeEmbeddingService:
+    """Word-hash embeddings: texts sharing words are similar."""
+
+    async def embed_single(self, text: str) -> list[float]:
+        vec = [0.0] * 64
+        for word in text.lower().split():
+            idx = int(hashlib.md5(word.encode()).hexdigest(), 16) % 64
+            vec[idx] += 1.0
+        return vec
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [await self.embed_single(t) for t in texts]
+
+
+def test_quantize_int8_preserves_direction() -> None:
+    vec = [0.5, -0.25, 0.0, 1.0]
+    codes = struct.unpack("4b", _quantize_int8(vec))
+    assert codes == (64, -32, 0, 127)
+    assert _quantize_int8([0.0, 0.0]) == b"\x00\x00"
+
+
+@pytest.mark.asyncio
+async def test_search_uses_quantized_embeddings(tmp_path: Path) -> None:
+    store = VectorStore(tmp_path / "vectors.db", FakeEmbeddingService())
+    await store.add("the cat sat on the mat", skip_dedup=True)
+    await store.add("stock prices fell sharply today", skip_dedup=True)
+
+    with sqlite3.connect(store.db_path) as conn:
+        blobs = [r[0] for r in conn.execute("SELECT embedding_q8 FROM vectors")]
+    assert all(b is not None and len(b) == 64 for b in blobs)
+
+    results = await store.search("where the cat sat", top_k=1)
+    assert results[0]["text"] == "the cat sat on the mat"
+
+
+@pytest.mark.asyncio
+async def test_v1_database_is_backfilled(tmp_path: Path) -> None:
+    db_path = tmp_path / "vectors.db"
+    embedding = await FakeEmbeddingService().embed_single("remember the milk")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE schema_version (version INTEGER NOT NULL)")
+        conn.execute("INSERT INTO schema_version (version) VALUES (1)")
+        conn.execute(
+            "CREATE TABLE vectors (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " content_hash TEXT UNIQUE NOT NULL, text TEXT NOT NULL,"
+            " embedding BLOB NOT NULL, metadata TEXT, created_at TEXT NOT NULL,"
+            " access_count INTEGER DEFAULT 0, last_accessed_at TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO vectors (content_hash, text, embedding, created_at)"
+            " VALUES ('h1', 'remember the milk', ?, '2026-01-01T00:00:00')",
+            (struct.pack(f"{len(embedding)}f", *embedding),),
+        )
+
+    store = VectorStore(db_path, FakeEmbeddingService())
+
+    with sqlite3.connect(db_path) as conn:
+        version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
+        q8 = conn.execute("SELECT embedding_q8 FROM vectors").fetchone()[0]
+    assert version == CURRENT_SCHEMA_VERSION
+    assert q8 == _quantize_int8(embedding)
+
+    results = await store.search("remember the milk", top_k=1)
+    assert results[0]["text"] == "remember the milk"
+
+
+@pytest.mark.asyncio
+async def test_search_metadata_filter_applies_before_top_k(tmp_path: Path) -> None:
+    store = VectorStore(tmp_path / "vectors.db", FakeEmbeddingService())
+    await store.add("the cat sat on the mat", {"type": "conversation"}, skip_dedup=True)
+    await store.add("the cat sat on a hat", {"type": "fact"}, skip_dedup=True)
+    await store.add("the cat sat", skip_dedup=True)
+
+    results = await store.search("the cat sat", top_k=1, metadata_filter={"type": "fact"})
+    assert [r["text"] for r in results] == ["the cat sat on a hat"]
+
+    results = await store.search("the cat sat", metadata_filter={"type": "conversation"})
+    assert [r["text"] for r in results] == ["the cat sat on the mat"]
@@ -67,3 +67,19 @@ class TestAuthManager:
         request = MagicMock()
         request.cookies = {}
         assert auth.require_auth(request) is None
+
+    def test_verified_session_is_cached_until_expiry(self):
+        auth = AuthManager(secret_key="test-secret")
+        token = auth.create_session("admin")
+        request = MagicMock()
+        request.cookies = {AuthManager.COOKIE_NAME: token}
+        assert auth.get_current_user(request) == "admin"
+
+        auth._serializer = MagicMock()
+        auth._serializer.loads.side_effect = AssertionError("re-verified")
+        assert auth.get_current_user(request) == "admin"
+
+        auth._verified[token] = ("admin", 0.0)
+        auth._serializer.loads.side_effect = Exception("expired")
+        assert auth.get_current_user(request) is None
+        assert token not in auth._verified
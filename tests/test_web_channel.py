@@ -0,0 +1,56 @@
+"""Tests for the web chat channel's outbound writer."""
+
+import asyncio
+import json
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.progress import ProgressEvent, ProgressKind
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.web import WebChannel
+
+
+class FakeWebSocket:
+    """Records text frames; the first send blocks until released."""
+
+    def __init__(self) -> None:
+        self.frames: list[str] = []
+        self.release = asyncio.Event()
+
+    async def send_text(self, data: str) -> None:
+        await self.release.wait()
+        self.frames.append(data)
+
+
+def _streaming(text: str) -> ProgressEvent:
+    return ProgressEvent(
+        channel="web", chat_id="s1", kind=ProgressKind.STREAMING, iteration=1, detail=text
+    )
+
+
+@pytest.mark.asyncio
+async def test_web_channel_coalesces_queued_frames() -> None:
+    channel = WebChannel(config=None, bus=MessageBus())
+    ws = FakeWebSocket()
+    channel.register("s1", ws)
+
+    await channel.on_progress(_streaming("He"))
+    await asyncio.sleep(0)
+    for text in ("Hel", "Hell", "Hello"):
+        await channel.on_progress(_streaming(text))
+    await channel.send(OutboundMessage(channel="web", chat_id="s1", content="Hello!"))
+
+    ws.release.set()
+    await asyncio.sleep(0.01)
+    first, batch = (json.loads(frame) for frame in ws.frames)
+    assert first["detail"] == "He"
+    assert [(f["type"], f.get("detail") or f.get("content")) for f in batch] == [
+        ("progress", "Hello"),
+        ("message", "Hello!"),
+    ]
+    assert batch[0]["kind"] == "streaming"
+
+    channel.unregister("s1")
+    await channel.send(OutboundMessage(channel="web", chat_id="s1", content="gone"))
+    assert len(ws.frames) == 2